@@ -0,0 +1,59 @@
+# coding: utf-8
+
+"""
+    Benchmarks of the photovoltaic panels
+"""
+import numpy as np
+from datetime import datetime
+from solarpy import solar_panel
+from .common import require
+
+
+class Panel(object):
+    """
+    Single panel, one date at a time (original object interface)
+    """
+    def setup(self):
+        self.panel = solar_panel(2.1, 0.2)
+        self.panel.set_orientation(np.array([0, 0, -1]))
+        self.panel.set_position(40.73, -73.93, 0)
+        self.panel.set_datetime(datetime(2019, 12, 25, 16, 15))
+
+    def time_power(self):
+        self.panel.power()
+
+    def time_daily_energy(self):
+        self.panel.energy(datetime(2019, 12, 25), datetime(2019, 12, 26))
+
+
+class Fleet(object):
+    """
+    Fleet of panels over a day at 1 minute steps
+    """
+    params = [1, 100, 1000]
+    param_names = ['n_panels']
+
+    def setup(self, n):
+        PanelFleet = require('PanelFleet')
+        rng = np.random.RandomState(0)
+        self.fleet = PanelFleet(2.1, 0.2, rng.uniform(-60, 60, n),
+                                rng.uniform(-180, 180, n),
+                                rng.uniform(0, 3000, n), [0, 0, -1])
+        self.dates = np.arange('2019-06-21', '2019-06-22',
+                               dtype='datetime64[m]')
+
+    def time_power(self, n):
+        self.fleet.power(self.dates)
+
+
+class Site(object):
+    """
+    Site irradiance over a year at 1 minute steps
+    """
+    def setup(self):
+        self.site = require('SolarSite')(40.4, -3.7, 650)
+        self.dates = np.arange('2019-01-01', '2020-01-01',
+                               dtype='datetime64[m]')
+
+    def time_irradiance_on_plane(self):
+        self.site.irradiance_on_plane([0, 0, -1], self.dates)
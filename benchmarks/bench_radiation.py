@@ -0,0 +1,87 @@
+# coding: utf-8
+
+"""
+    Benchmarks of the solar radiation model
+"""
+import numpy as np
+from solarpy import declination, theta_z, solar_azimuth, solar_vector_ned,\
+                    beam_irradiance, irradiance_on_plane
+from .common import SIZES, dates_lats, altitudes, longitudes, require
+
+
+class Geometry(object):
+    """
+    Solar geometry functions, scalar and batch paths
+    """
+    params = SIZES
+    param_names = ['n']
+
+    def setup(self, n):
+        self.date, self.lat = dates_lats(n)
+
+    def time_declination(self, n):
+        declination(self.date)
+
+    def time_theta_z(self, n):
+        theta_z(self.date, self.lat)
+
+    def time_solar_azimuth(self, n):
+        solar_azimuth(self.date, self.lat)
+
+    def time_solar_vector_ned(self, n):
+        solar_vector_ned(self.date, self.lat)
+
+
+class Position(object):
+    """
+    Whole solar position in a single pass
+    """
+    params = SIZES
+    param_names = ['n']
+
+    def setup(self, n):
+        self.solar_position = require('solar_position')
+        self.date, self.lat = dates_lats(n)
+
+    def time_solar_position(self, n):
+        self.solar_position(self.date, self.lat)
+
+
+class PositionModels(object):
+    """
+    Solar position from UTC times with every model (precision tier)
+    """
+    params = (SIZES, ['spencer', 'psa'])
+    param_names = ['n', 'model']
+
+    def setup(self, n, model):
+        self.solar_position_utc = require('solar_position_utc')
+        if model not in require('SOLAR_POSITION_MODELS'):
+            raise NotImplementedError('no %s model' % model)
+        self.date, self.lat = dates_lats(n)
+        self.lng = longitudes(n)
+
+    def time_solar_position_utc(self, n, model):
+        self.solar_position_utc(self.date, self.lat, self.lng, model=model)
+
+
+class Irradiance(object):
+    """
+    Beam irradiance functions, scalar and batch paths
+    """
+    params = SIZES
+    param_names = ['n']
+
+    def setup(self, n):
+        self.date, self.lat = dates_lats(n)
+        self.h = altitudes(n)
+        self.vnorm = np.array([0.3, -0.2, -1])
+
+    def time_beam_irradiance(self, n):
+        beam_irradiance(self.h, self.date, self.lat)
+
+    def time_irradiance_on_plane(self, n):
+        irradiance_on_plane(self.vnorm, self.h, self.date, self.lat)
+
+    def peakmem_irradiance_on_plane(self, n):
+        irradiance_on_plane(self.vnorm, self.h, self.date, self.lat)
@@ -0,0 +1,32 @@
+# coding: utf-8
+
+"""
+    Benchmarks of the utilities
+"""
+from solarpy import pressure, check_lat, lla2ecef, ned2ecef
+from .common import SIZES, dates_lats, altitudes
+
+
+class Utils(object):
+    """
+    Pressure, checks and coordinates transformations, scalar and batch
+    paths
+    """
+    params = SIZES
+    param_names = ['n']
+
+    def setup(self, n):
+        self.date, self.lat = dates_lats(n)
+        self.h = altitudes(n)
+
+    def time_pressure(self, n):
+        pressure(self.h)
+
+    def time_check_lat(self, n):
+        check_lat(self.lat)
+
+    def time_lla2ecef(self, n):
+        lla2ecef(self.lat, 0., self.h)
+
+    def time_ned2ecef(self, n):
+        ned2ecef([0, 0, -1], self.lat, 0.)
@@ -0,0 +1,59 @@
+# coding: utf-8
+
+"""
+    Inputs shared by the benchmarks: a scalar case (datetime object and
+    float latitude) and arrays of increasing size
+"""
+import numpy as np
+import solarpy
+from datetime import datetime
+
+
+# 'scalar' times the original single-point path
+SIZES = ['scalar', 100, 10000, 1000000]
+
+
+def dates_lats(n):
+    """
+    Dates (*solar* time) and latitudes for a benchmark of size n
+    """
+    if n == 'scalar':
+        return datetime(2019, 6, 21, 10, 30), 40.4
+
+    rng = np.random.RandomState(0)
+    dates = np.datetime64('2019-01-01', 'us') + \
+        rng.randint(0, 365 * 24 * 60, n).astype('timedelta64[m]')
+
+    return dates, rng.uniform(-89, 89, n)
+
+
+def altitudes(n):
+    """
+    Altitudes above sea level in meters for a benchmark of size n
+    """
+    if n == 'scalar':
+        return 650.
+
+    return np.random.RandomState(1).uniform(0, 20000, n)
+
+
+def longitudes(n):
+    """
+    Longitudes (east-positive) in degrees for a benchmark of size n
+    """
+    if n == 'scalar':
+        return -3.7
+
+    return np.random.RandomState(2).uniform(-180, 180, n)
+
+
+def require(name):
+    """
+    Function or class of solarpy by name, to be looked up in the setup of
+    the benchmarks of APIs that older commits do not have: asv skips the
+    benchmark (NotImplementedError) instead of failing to import the module
+    """
+    try:
+        return getattr(solarpy, name)
+    except AttributeError:
+        raise NotImplementedError('solarpy has no %s' % name)
@@ -1,2 +1,15 @@
 from .pvpanel import *
 from .radiation import *
+from .site import *
+from .maps import *
+from .streaming import *
+from .tracking import *
+from .optimal import *
+from .horizon import *
+from .diffuse import *
+from .trajectory import *
+
+import os as _os
+if _os.environ.get('SOLARPY_INSTRUMENT', '0') not in ('', '0'):
+    from . import instrumentation as _instrumentation
+    _instrumentation.enable()
@@ -0,0 +1,109 @@
+# coding: utf-8
+
+"""
+    Standard atmosphere model, based on the U.S. Standard Atmosphere 1976
+"""
+
+import numpy as np
+from numpy import array, exp
+
+
+class Atmosphere(object):
+    """
+    U.S. Standard Atmosphere 1976 pressure, from sea level to 86 km of
+    geometric altitude. The pressure table is built once, when the object
+    is created, and then interpolated for any array of altitudes.
+
+    Notes
+    -----
+    U.S. Standard Atmosphere, 1976, NOAA-S/T 76-1562
+    http://www.pdas.com/atmosTable2SI.html until 20km
+    http://www.pdas.com/atmosTable1SI.html until 24km
+    """
+    r0 = 6356766  # [m] Earth radius for geopotential altitude
+    g0_M_R = 0.034163195  # [K/m] g0 * M0 / R*
+
+    # layers base geopotential altitude [m] and temperature gradient [K/m]
+    H_b = array([0, 11000, 20000, 32000, 47000, 51000, 71000, 84852])
+    L_b = array([-6.5e-3, 0, 1e-3, 2.8e-3, 0, -2.8e-3, -2e-3, 0])
+
+    def __init__(self):
+        # tabulated values until 24km
+        alt_ = np.append(np.linspace(0, 20e3, 21),
+                         np.linspace(22e3, 24e3, 2))
+
+        p_ = array([101325, 89876, 79501, 70121, 61660, 54048, 47217, 41105,
+                    35651, 30800, 26499, 22699, 19399, 16579, 14170, 12111,
+                    10352, 8849, 7565, 6467, 5529, 4047, 2972])
+
+        # and computed with the layers model every km until 86km
+        alt_1976 = np.linspace(25e3, 86e3, 62)
+
+        self.alt_ = np.append(alt_, alt_1976)
+        self.p_ = np.append(p_, self._layers_pressure(alt_1976))
+        self.p0 = self.p_[0]
+        self.h_max = self.alt_[-1]
+
+    def _layers_pressure(self, h):
+        """
+        Pressure (Pa) at geometric altitudes h (m) from the hydrostatic
+        equation on every layer
+        """
+        H = self.r0 * h / (self.r0 + h)  # geopotential altitude
+
+        # temperature and pressure at the base of every layer
+        T_b = 288.15 + np.append(0, np.cumsum(self.L_b[:-1] *
+                                              np.diff(self.H_b)))
+        p_b = [101325.]
+        for i in range(len(self.H_b) - 1):
+            p_b.append(self._layer(p_b[i], T_b[i], self.L_b[i],
+                                   self.H_b[i + 1] - self.H_b[i]))
+
+        i = np.searchsorted(self.H_b, H, side='right') - 1
+        return self._layer(array(p_b)[i], T_b[i], self.L_b[i],
+                           H - self.H_b[i])
+
+    def _layer(self, p_b, T_b, L_b, dH):
+        """
+        Pressure at dH over the base of a layer, either isothermal (L_b = 0)
+        or with constant temperature gradient
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p = p_b * (T_b / (T_b + L_b * dH)) ** (self.g0_M_R / L_b)
+
+        return np.where(L_b == 0, p_b * exp(-self.g0_M_R * dH / T_b), p)
+
+    def pressure(self, h):
+        """
+        Pressure at a desired altitude
+
+        Parameters
+        ----------
+        h : float or array-like
+            geometric altitude above sea level in meters (0 to 86k)
+
+        Returns
+        -------
+        p : float or array-like
+            pressure in Pa
+        """
+        return np.interp(h, self.alt_, self.p_)
+
+    def pressure_ratio(self, h):
+        """
+        Pressure at a desired altitude relative to sea level pressure
+
+        Parameters
+        ----------
+        h : float or array-like
+            geometric altitude above sea level in meters (0 to 86k)
+
+        Returns
+        -------
+        p / p0 : float or array-like
+            pressure relation
+        """
+        return self.pressure(h) / self.p0
+
+
+standard_atmosphere = Atmosphere()
@@ -0,0 +1,296 @@
+# coding: utf-8
+
+"""
+    Diffuse sky and ground reflected irradiance on tilted planes, and global
+    irradiance (beam + diffuse + reflected) on a plane, based on Duffie,
+    J.A., and Beckman, W. A., "Solar energy thermal processes"
+"""
+import numpy as np
+from numpy import sin, cos, deg2rad, rad2deg, arccos
+from collections import namedtuple
+from .radiation import solar_position, gon, air_mass_kastenyoung1989,\
+                       _solar_vector_ned, _beam_constants, _beam_irradiance
+from .utils import check_alt
+
+
+PlaneIrradiance = namedtuple('PlaneIrradiance',
+                             ['total', 'beam', 'sky_diffuse', 'ground'])
+
+# Perez et al. (1990) coefficients ("allsitescomposite1990"), one row per
+# sky clearness bin
+_PEREZ_EPSILON = np.array([1.065, 1.23, 1.5, 1.95, 2.8, 4.5, 6.2])
+_PEREZ_F = np.array([
+    # F11,      F12,        F13,        F21,        F22,        F23
+    [-0.0083117, 0.5877285, -0.0620636, -0.0596012, 0.0721249, -0.0220216],
+    [0.1299457, 0.6825954, -0.1513752, -0.0189325, 0.065965, -0.0288748],
+    [0.3296958, 0.4868735, -0.2210958, 0.055414, -0.0639588, -0.0260542],
+    [0.5682053, 0.1874525, -0.295129, 0.1088631, -0.1519229, -0.0139754],
+    [0.873028, -0.3920403, -0.3616149, 0.2255647, -0.4620442, 0.0012448],
+    [1.1326077, -1.2367284, -0.4118494, 0.2877813, -0.8230357, 0.0558651],
+    [1.0601591, -1.5999137, -0.3589221, 0.2642124, -1.127234, 0.1310694],
+    [0.677747, -0.3272588, -0.2504286, 0.1561313, -1.3765031, 0.2506212]])
+
+
+def clear_sky_diffuse_liujordan(dni, g_on, theta_z):
+    """
+    Clear sky diffuse irradiance on a horizontal plane, from the beam
+    transmittance of the atmosphere
+
+    Parameters
+    ----------
+    dni : float or array-like
+        beam (direct normal) irradiance in W/m2
+    g_on : float or array-like
+        extraterrestrial radiation on a plane normal to the radiation in W/m2
+    theta_z : float or array-like
+        zenith angle in radians
+
+    Returns
+    -------
+    dhi : float or array-like
+        diffuse horizontal irradiance in W/m2
+
+    Notes
+    -----
+    Liu, B.Y.H., and Jordan, R.C., (1960) "The interrelationship and
+    characteristic distribution of direct, diffuse and total solar
+    radiation", Solar Energy 4(3):1-19. Duffie and Beckman eq. 2.8.6
+    """
+    tau_d = 0.271 - 0.294 * np.asarray(dni) / g_on
+
+    return np.maximum(g_on * tau_d * cos(theta_z), 0)[()]
+
+
+def sky_diffuse_isotropic(dhi, beta):
+    """
+    Sky diffuse irradiance on a tilted plane, isotropic sky model
+
+    Parameters
+    ----------
+    dhi : float or array-like
+        diffuse horizontal irradiance in W/m2
+    beta : float or array-like
+        slope angle of the surface wrt the local horizon
+        in degrees (0 to 180)
+
+    Returns
+    -------
+    I_d : float or array-like
+        sky diffuse irradiance on the plane in W/m2
+
+    Notes
+    -----
+    Liu, B.Y.H., and Jordan, R.C., (1963). Duffie and Beckman eq. 2.15.1
+    """
+    return (np.asarray(dhi) * (1 + cos(deg2rad(beta))) / 2)[()]
+
+
+def sky_diffuse_haydavies(dhi, dni, g_on, theta, theta_z, beta):
+    """
+    Sky diffuse irradiance on a tilted plane, Hay and Davies model
+    (isotropic and circumsolar diffuse)
+
+    Parameters
+    ----------
+    dhi : float or array-like
+        diffuse horizontal irradiance in W/m2
+    dni : float or array-like
+        beam (direct normal) irradiance in W/m2
+    g_on : float or array-like
+        extraterrestrial radiation on a plane normal to the radiation in W/m2
+    theta : float or array-like
+        angle of incidence of the sun beam on the plane in radians
+    theta_z : float or array-like
+        zenith angle in radians
+    beta : float or array-like
+        slope angle of the surface wrt the local horizon
+        in degrees (0 to 180)
+
+    Returns
+    -------
+    I_d : float or array-like
+        sky diffuse irradiance on the plane in W/m2
+
+    Notes
+    -----
+    Hay, J.E., and Davies, J.A., (1980). Duffie and Beckman eq. 2.16.4
+    """
+    A_i = np.asarray(dni) / g_on  # anisotropy index
+    R_b = np.maximum(cos(theta), 0) / np.maximum(cos(theta_z),
+                                                 cos(deg2rad(85)))
+
+    return (dhi * (A_i * R_b +
+                   (1 - A_i) * (1 + cos(deg2rad(beta))) / 2))[()]
+
+
+def sky_diffuse_perez(dhi, dni, g_on, theta, theta_z, beta, h=0):
+    """
+    Sky diffuse irradiance on a tilted plane, Perez et al. model
+    (isotropic, circumsolar and horizon brightening diffuse)
+
+    Parameters
+    ----------
+    dhi : float or array-like
+        diffuse horizontal irradiance in W/m2
+    dni : float or array-like
+        beam (direct normal) irradiance in W/m2
+    g_on : float or array-like
+        extraterrestrial radiation on a plane normal to the radiation in W/m2
+    theta : float or array-like
+        angle of incidence of the sun beam on the plane in radians
+    theta_z : float or array-like
+        zenith angle in radians
+    beta : float or array-like
+        slope angle of the surface wrt the local horizon
+        in degrees (0 to 180)
+    h : float or array-like, optional
+        altitude above sea level in meters, for the air mass
+
+    Returns
+    -------
+    I_d : float or array-like
+        sky diffuse irradiance on the plane in W/m2
+
+    Notes
+    -----
+    Perez, R., Ineichen, P., Seals, R., Michalsky, J., Stewart, R., (1990)
+    "Modeling daylight availability and irradiance components from direct
+    and global irradiance", Solar Energy 44(5):271-289. Duffie and Beckman
+    eq. 2.16.14
+    """
+    dhi, dni, theta_z = np.broadcast_arrays(*[np.asarray(x, dtype=float)
+                                              for x in (dhi, dni, theta_z)])
+    beta = deg2rad(beta)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # sky clearness and brightness
+        k = 1.041 * theta_z ** 3
+        epsilon = ((dhi + dni) / dhi + k) / (1 + k)
+        m = air_mass_kastenyoung1989(rad2deg(theta_z), h)
+        delta = dhi * m / g_on
+
+        # bins closed on the left: 1 <= e < 1.065, 1.065 <= e < 1.23...
+        F = _PEREZ_F[np.searchsorted(_PEREZ_EPSILON,
+                                     np.nan_to_num(epsilon, nan=1.0),
+                                     side='right')]
+        F1 = np.maximum(F[..., 0] + F[..., 1] * delta + F[..., 2] * theta_z,
+                        0)
+        F2 = F[..., 3] + F[..., 4] * delta + F[..., 5] * theta_z
+
+        a = np.maximum(cos(theta), 0)
+        b = np.maximum(cos(theta_z), cos(deg2rad(85)))
+
+        I_d = dhi * ((1 - F1) * (1 + cos(beta)) / 2 + F1 * a / b +
+                     F2 * sin(beta))
+
+    return np.where(dhi > 0, np.maximum(I_d, 0), 0)[()]
+
+
+def ground_reflected(ghi, beta, albedo=0.2):
+    """
+    Ground reflected irradiance on a tilted plane, isotropic reflection
+
+    Parameters
+    ----------
+    ghi : float or array-like
+        global horizontal irradiance in W/m2
+    beta : float or array-like
+        slope angle of the surface wrt the local horizon
+        in degrees (0 to 180)
+    albedo : float or array-like, optional
+        ground reflectance
+
+    Returns
+    -------
+    I_r : float or array-like
+        ground reflected irradiance on the plane in W/m2
+
+    Notes
+    -----
+    Duffie and Beckman eq. 2.15.1
+    """
+    return (np.asarray(ghi) * albedo * (1 - cos(deg2rad(beta))) / 2)[()]
+
+
+_SKY_MODELS = ('isotropic', 'haydavies', 'perez')
+
+
+def global_irradiance_on_plane(vnorm, h, date, lat, model='isotropic',
+                               albedo=0.2):
+    """
+    Returns the global (beam, sky diffuse and ground reflected) clear sky
+    irradiance on a plane defined by its unit normal vector in NED frame at
+    a certain altitude, date, *solar* time and latitude. The solar geometry
+    is evaluated only once for the three components, and the diffuse
+    horizontal irradiance follows the Liu and Jordan clear sky model.
+
+    Parameters
+    ----------
+    vnorm : array-like
+        unit vector normal to plane, (3,) or (..., 3)
+    h : float or array-like
+        altitude above sea level in meters
+    date : datetime object, array-like of datetime objects or datetime64
+        date and *solar* time
+    lat : float or array-like
+        latitude (-90 to 90) in degrees
+    model : str, optional
+        sky diffuse model: 'isotropic', 'haydavies' or 'perez'
+    albedo : float or array-like, optional
+        ground reflectance
+
+    Returns
+    -------
+    PlaneIrradiance : namedtuple
+        total, beam, sky diffuse and ground reflected irradiance on the
+        plane in W/m2
+    """
+    check_alt(h)
+
+    pos = solar_position(date, lat)
+    g_on = gon(date)
+    G = _beam_irradiance(pos.zenith, g_on, h, *_beam_constants(h))
+
+    return _plane_irradiance(vnorm, pos, g_on, G, _clear_sky_dhi(pos, g_on, G),
+                             h, model, albedo)
+
+
+def _clear_sky_dhi(pos, g_on, G):
+    """
+    Liu and Jordan diffuse horizontal irradiance from an already computed
+    solar position, extraterrestrial radiation and beam irradiance
+    """
+    return np.where(pos.daylight,
+                    clear_sky_diffuse_liujordan(G, g_on, pos.zenith), 0)
+
+
+def _plane_irradiance(vnorm, pos, g_on, G, dhi, h, model, albedo):
+    """
+    Irradiance components on a plane from an already computed solar
+    position, extraterrestrial radiation, beam and diffuse horizontal
+    irradiance
+    """
+    if model not in _SKY_MODELS:
+        raise ValueError('model must be one of %s' % (_SKY_MODELS,))
+
+    vnorm = np.asarray(vnorm, dtype=float)
+    vnorm = vnorm / np.linalg.norm(vnorm, axis=-1, keepdims=True)
+    beta = rad2deg(arccos(np.clip(-vnorm[..., 2], -1, 1)))
+
+    # the solar vector is null at night
+    cos_theta = (vnorm * _solar_vector_ned(pos)).sum(axis=-1)
+    theta = arccos(np.clip(cos_theta, -1, 1))
+    cos_theta_z = np.where(pos.daylight, cos(pos.zenith), 0)
+    ghi = G * cos_theta_z + dhi
+
+    beam = G * np.maximum(cos_theta, 0)
+    if model == 'isotropic':
+        sky = sky_diffuse_isotropic(dhi, beta)
+    elif model == 'haydavies':
+        sky = sky_diffuse_haydavies(dhi, G, g_on, theta, pos.zenith, beta)
+    else:
+        sky = sky_diffuse_perez(dhi, G, g_on, theta, pos.zenith, beta, h)
+    ground = ground_reflected(ghi, beta, albedo)
+
+    return PlaneIrradiance((beam + sky + ground)[()], beam[()],
+                           np.asarray(sky)[()], np.asarray(ground)[()])
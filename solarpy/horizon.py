@@ -0,0 +1,85 @@
+# coding: utf-8
+
+"""
+    Horizon profiles (terrain and nearby obstructions) of a site
+"""
+import numpy as np
+from numpy import deg2rad
+
+
+class HorizonProfile(object):
+    """
+    Elevation of the horizon vs. azimuth, compiled once into a lookup table
+    of evenly spaced azimuths (linearly interpolated between the given
+    points, periodically over the whole circle), so that masking the sun
+    beam for any number of solar positions costs a single indexing
+
+    Parameters
+    ----------
+    azimuth : array-like
+        azimuths of the profile points in degrees wrt the local meridian
+        (-180 to 180). 0-> south, east negative (as solar azimuth)
+    elevation : array-like
+        elevation of the horizon over the local horizontal plane at every
+        azimuth in degrees (-90 to 90)
+    resolution : float, optional
+        azimuth spacing of the lookup table in degrees
+    """
+    def __init__(self, azimuth, elevation, resolution=0.1):
+        azimuth = np.ravel(np.asarray(azimuth, dtype=float))
+        elevation = np.ravel(np.asarray(elevation, dtype=float))
+
+        if azimuth.shape != elevation.shape or azimuth.size == 0:
+            raise ValueError('one elevation per azimuth is needed')
+
+        if ((elevation < -90) | (elevation > 90)).any():
+            raise ValueError('elevation should be -90 <= elevation <= 90')
+
+        if resolution <= 0:
+            raise ValueError('resolution should be positive')
+
+        self.azimuth = azimuth
+        self.elevation = elevation
+
+        # lookup table of elevations (radians) from -180º, bin centers
+        self.n = int(np.ceil(360 / resolution))
+        self._scale = self.n / (2 * np.pi)
+        az_table = -180 + (np.arange(self.n) + 0.5) * 360 / self.n
+        self.table = deg2rad(np.interp(az_table, azimuth, elevation,
+                                       period=360))
+
+    def horizon_elevation(self, azimuth):
+        """
+        Elevation of the horizon
+
+        Parameters
+        ----------
+        azimuth : float or array-like
+            azimuth in radians (as solar_azimuth). 0-> south, east negative
+
+        Returns
+        -------
+        elevation : float or array-like
+            elevation of the horizon in radians
+        """
+        i = np.floor((np.asarray(azimuth) + np.pi) * self._scale)
+
+        return self.table[i.astype(int) % self.n][()]
+
+    def visible(self, azimuth, altitude):
+        """
+        Whether the sun is over the horizon profile
+
+        Parameters
+        ----------
+        azimuth : float or array-like
+            solar azimuth in radians (as solar_azimuth)
+        altitude : float or array-like
+            solar altitude in radians (as solar_altitude)
+
+        Returns
+        -------
+        visible : bool or array-like
+            True if the sun is not hidden by the horizon
+        """
+        return (np.asarray(altitude) > self.horizon_elevation(azimuth))[()]
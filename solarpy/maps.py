@@ -0,0 +1,163 @@
+# coding: utf-8
+
+"""
+    Gridded solar beam irradiance (latitude x longitude x time), computed
+    in tiles so that the memory needed is bounded
+"""
+import numpy as np
+from numpy import sin, cos, deg2rad
+from .radiation import gon, _utc_declination_greenwich, _local_hour_angle,\
+                       _parallax, _solar_position, _solar_vector_ned,\
+                       _beam_constants, _beam_irradiance,\
+                       _irradiance_on_plane, _check_model
+from . import radiation
+from .utils import check_lat, check_long, check_alt, to_datetime64
+
+
+# approximate peak memory of the irradiance model per grid cell (bytes)
+_BYTES_PER_CELL = 128
+
+
+def _tile_shape(n_lat, n_lng, n_time, max_memory):
+    """
+    Tile shape within the memory budget: whole time series first, then
+    longitudes and latitudes
+    """
+    cells = max(max_memory // _BYTES_PER_CELL, 1)
+    n_time = max(min(n_time, cells), 1)
+    n_lng = max(min(n_lng, cells // n_time), 1)
+    n_lat = max(min(n_lat, cells // (n_time * n_lng)), 1)
+
+    return n_lat, n_lng, n_time
+
+
+def irradiance_tiles(lat, lng, date, vnorm=(0, 0, -1), h=0,
+                     max_memory=2**28, model=None):
+    """
+    Generator of the solar beam irradiance on a plane over a latitude x
+    longitude x time grid, tile by tile. Every tile is computed in a single
+    vectorized pass and its size is chosen so that the model does not need
+    more than (approximately) max_memory bytes.
+
+    Note: it does not take into account the diffuse irradiance
+
+    Parameters
+    ----------
+    lat : float or array-like
+        (n_lat,) latitudes (-90 to 90) in degrees
+    lng : float or array-like
+        (n_lng,) longitudes (-180 to 180) in degrees, *east-positive*
+    date : array-like of datetime objects or datetime64
+        (n_time,) *UTC* dates and times
+    vnorm : array-like, optional
+        unit vector normal to plane in the local NED frame, (3,) or
+        (n_lat, n_lng, 3). Horizontal plane (pointing zenith) by default
+    h : float or array-like, optional
+        altitude above sea level in meters, scalar or (n_lat, n_lng)
+    max_memory : int, optional
+        memory budget of every tile in bytes
+    model : str, optional
+        solar position model, 'spencer' or 'psa' (see solar_position_utc)
+
+    Yields
+    ------
+    index : tuple of slices
+        position of the tile in the (n_lat, n_lng, n_time) map
+    G : array-like
+        beam irradiance of the tile in W/m2
+
+    Example
+    -------
+    >>> out = np.lib.format.open_memmap('map.npy', mode='w+',
+    ...                                 dtype=np.float32, shape=shape)
+    >>> for index, G in irradiance_tiles(lat, lng, dates):
+    ...     out[index] = G
+    """
+    if model is None:
+        model = radiation._solar_position_model
+    _check_model(model)
+
+    # a scalar is a grid of a single latitude or longitude
+    lat = np.ravel(np.asarray(lat, dtype=float))
+    lng = np.ravel(np.asarray(lng, dtype=float))
+    date = np.ravel(to_datetime64(date))
+    check_lat(lat)
+    check_long(lng)
+
+    shape = (lat.size, lng.size)
+    h = np.broadcast_to(np.asarray(h, dtype=float), shape)
+    vnorm = np.broadcast_to(np.asarray(vnorm, dtype=float), shape + (3,))
+    check_alt(h)
+
+    n_lat, n_lng, n_time = _tile_shape(lat.size, lng.size, date.size,
+                                       max_memory)
+
+    for t in range(0, date.size, n_time):
+        t_slice = slice(t, t + n_time)
+        dates = date[t_slice]
+        g_on = gon(dates)
+        # (n_time,): the longitudes are added tile by tile
+        dec, w0 = _utc_declination_greenwich(dates, model)
+
+        for i in range(0, lat.size, n_lat):
+            i_slice = slice(i, i + n_lat)
+            sin_lat = sin(deg2rad(lat[i_slice]))[:, np.newaxis, np.newaxis]
+            cos_lat = cos(deg2rad(lat[i_slice]))[:, np.newaxis, np.newaxis]
+
+            for j in range(0, lng.size, n_lng):
+                j_slice = slice(j, j + n_lng)
+                h_ = h[i_slice, j_slice, np.newaxis]
+                w = _local_hour_angle(w0, lng[j_slice, np.newaxis])
+
+                pos = _parallax(_solar_position(dec, w, sin_lat, cos_lat),
+                                model)
+                G = _beam_irradiance(pos.zenith, g_on, h_,
+                                     *_beam_constants(h_))
+                G = _irradiance_on_plane(
+                    vnorm[i_slice, j_slice, np.newaxis],
+                    _solar_vector_ned(pos), G)
+
+                yield (i_slice, j_slice, t_slice), G
+
+
+def irradiance_map(lat, lng, date, vnorm=(0, 0, -1), h=0, out=None,
+                   max_memory=2**28, model=None):
+    """
+    Solar beam irradiance on a plane over a latitude x longitude x time
+    grid (see irradiance_tiles), written tile by tile into an array
+
+    Parameters
+    ----------
+    lat : float or array-like
+        (n_lat,) latitudes (-90 to 90) in degrees
+    lng : float or array-like
+        (n_lng,) longitudes (-180 to 180) in degrees, *east-positive*
+    date : array-like of datetime objects or datetime64
+        (n_time,) *UTC* dates and times
+    vnorm : array-like, optional
+        unit vector normal to plane in the local NED frame, (3,) or
+        (n_lat, n_lng, 3). Horizontal plane (pointing zenith) by default
+    h : float or array-like, optional
+        altitude above sea level in meters, scalar or (n_lat, n_lng)
+    out : array-like, optional
+        (n_lat, n_lng, n_time) array (i.e. a numpy memmap) where the map is
+        written. A float64 array is allocated if not given
+    max_memory : int, optional
+        memory budget of every tile in bytes
+    model : str, optional
+        solar position model, 'spencer' or 'psa' (see solar_position_utc)
+
+    Returns
+    -------
+    G : array-like
+        (n_lat, n_lng, n_time) beam irradiance in W/m2
+    """
+    if out is None:
+        out = np.empty((np.size(lat), np.size(lng),
+                        np.size(to_datetime64(date))))
+
+    for index, G in irradiance_tiles(lat, lng, date, vnorm, h, max_memory,
+                                      model):
+        out[index] = G
+
+    return out
@@ -0,0 +1,96 @@
+# coding: utf-8
+
+"""
+    Orientation (slope and azimuth) of a fixed plane that maximizes its
+    beam irradiation at a site
+"""
+import numpy as np
+from collections import namedtuple
+from .radiation import surface_normal_ned
+
+
+OptimalOrientation = namedtuple('OptimalOrientation',
+                                ['beta', 'surf_az', 'irradiation'])
+
+
+def optimal_orientation(site, date=None, beta_bounds=(0, 90),
+                        surf_az_bounds=(-180, 180), n=13, tol=0.05):
+    """
+    Slope and azimuth of the plane with the maximum beam irradiation at a
+    site, searched on a coarse grid of orientations that is refined around
+    the best one until its spacing is below tol. Every grid is evaluated at
+    once on the sun table of the site (see SunTable).
+
+    Note: it does not take into account the diffuse irradiance
+
+    Parameters
+    ----------
+    site : SolarSite object
+        location
+    date : array-like of datetime objects or datetime64, optional
+        (n_times,) dates and *solar* times of the period to optimize. A
+        typical year (2019) at hourly steps by default
+    beta_bounds : tuple, optional
+        minimum and maximum slope of the plane in degrees (0 to 180)
+    surf_az_bounds : tuple, optional
+        minimum and maximum azimuth of the plane in degrees wrt the local
+        meridian (-180 to 180). 0-> south, east negative
+    n : int, optional
+        number of slopes and azimuths of every grid
+    tol : float, optional
+        angular resolution of the result in degrees
+
+    Returns
+    -------
+    OptimalOrientation : namedtuple
+        slope and azimuth in degrees, and beam irradiation of the plane over
+        the period in Wh/m2
+    """
+    if date is None:
+        date = np.arange('2019-01-01T00:30', '2020-01-01T00:30',
+                         np.timedelta64(1, 'h'), dtype='datetime64[m]')
+
+    if not 0 <= beta_bounds[0] <= beta_bounds[1] <= 180:
+        raise ValueError('slope bounds should be 0 <= min <= max <= 180')
+
+    if not -180 <= surf_az_bounds[0] <= surf_az_bounds[1] <= 180:
+        raise ValueError('azimuth bounds should be -180 <= min <= max <= 180')
+
+    if n < 3:
+        raise ValueError('the grid needs at least n = 3 points')
+
+    table = site.sun_table(date)
+
+    # the azimuth is periodic if unbounded
+    periodic = (surf_az_bounds[1] - surf_az_bounds[0] >= 360)
+    beta_lo, beta_hi = beta_bounds
+    az_lo, az_hi = surf_az_bounds
+
+    while True:
+        beta, surf_az = np.meshgrid(np.linspace(beta_lo, beta_hi, n),
+                                    np.linspace(az_lo, az_hi, n),
+                                    indexing='ij')
+        H = table.irradiation(surface_normal_ned(beta, surf_az).reshape(-1,
+                                                                        3))
+
+        k = np.argmax(H)
+        best_beta, best_az = beta.flat[k], surf_az.flat[k]
+
+        step_beta = (beta_hi - beta_lo) / (n - 1)
+        step_az = (az_hi - az_lo) / (n - 1)
+        if max(step_beta, step_az) <= tol:
+            break
+
+        # next grid: one step around the best orientation
+        beta_lo = max(best_beta - step_beta, beta_bounds[0])
+        beta_hi = min(best_beta + step_beta, beta_bounds[1])
+        if periodic:
+            az_lo, az_hi = best_az - step_az, best_az + step_az
+        else:
+            az_lo = max(best_az - step_az, surf_az_bounds[0])
+            az_hi = min(best_az + step_az, surf_az_bounds[1])
+
+    if periodic:
+        best_az = 180 - (180 - best_az) % 360
+
+    return OptimalOrientation(float(best_beta), float(best_az), float(H[k]))
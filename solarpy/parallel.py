@@ -0,0 +1,254 @@
+# coding: utf-8
+
+"""
+    Process-pool versions of the batch calculations (irradiance maps and
+    fleet power). Inputs and outputs are shared with the workers through
+    shared memory, so that large arrays are never pickled.
+
+    This module needs python >= 3.8 (multiprocessing.shared_memory) and
+    is not imported by default:
+
+    >>> from solarpy import parallel
+    >>> G = parallel.irradiance_map(lat, lng, dates, n_jobs=8)
+"""
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from . import radiation
+from .maps import irradiance_tiles, _tile_shape
+from .pvpanel import PanelFleet
+from .radiation import _check_model
+from .utils import check_lat, check_long, check_alt, to_datetime64,\
+                   trusted_inputs
+
+
+# arrays attached by every worker process (see _attach)
+_worker_arrays = {}
+_worker_blocks = []
+
+
+def _n_workers(n_jobs):
+    """
+    Number of worker processes: all the cpus if n_jobs is None or negative
+    """
+    if n_jobs is None or n_jobs < 0:
+        return os.cpu_count() or 1
+    elif n_jobs == 0:
+        raise ValueError('n_jobs must be a positive integer, -1 or None')
+    else:
+        return n_jobs
+
+
+def _attach(specs):
+    """
+    Worker initializer: maps the shared memory blocks as numpy arrays
+    """
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _worker_blocks.append(shm)
+        _worker_arrays[key] = np.ndarray(shape, dtype, buffer=shm.buf)
+
+
+def _run(block_func, arrays, outputs, blocks, n_jobs):
+    """
+    Evaluates block_func(arrays, block) for every block, serially if a
+    single job is requested or in a process pool otherwise. The blocks
+    only depend on the problem size (not on n_jobs), so that the results
+    are the same however many workers are used. The outputs are the arrays
+    where the results are written (directly, or copied once from shared
+    memory).
+    """
+    n_jobs = min(_n_workers(n_jobs), len(blocks))
+
+    if n_jobs <= 1:
+        arrays = dict(arrays, **outputs)
+        for block in blocks:
+            block_func(arrays, block)
+        return {key: arrays[key] for key in outputs}
+
+    shms, specs, views = [], {}, {}
+    try:
+        for key, array in list(arrays.items()) + list(outputs.items()):
+            if key in arrays:
+                array = np.ascontiguousarray(array)
+            dtype = np.dtype(array.dtype)
+            shm = shared_memory.SharedMemory(
+                create=True, size=max(array.size * dtype.itemsize, 1))
+            shms.append(shm)
+            views[key] = np.ndarray(array.shape, dtype, buffer=shm.buf)
+            if key in arrays:
+                views[key][...] = array
+            specs[key] = (shm.name, array.shape, dtype.str)
+
+        with ProcessPoolExecutor(n_jobs, initializer=_attach,
+                                 initargs=(specs,)) as executor:
+            chunksize = max(len(blocks) // (4 * n_jobs), 1)
+            list(executor.map(_worker, [block_func] * len(blocks), blocks,
+                              chunksize=chunksize))
+
+        for key, array in outputs.items():
+            array[...] = views[key]
+        return outputs
+
+    finally:
+        views.clear()
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+
+def _worker(block_func, block):
+    """
+    Evaluates a block on the arrays attached by the worker process
+    """
+    block_func(_worker_arrays, block)
+
+
+def _map_block(arrays, block):
+    """
+    Irradiance map of a single tile, written into the shared output
+    """
+    i, j, t, max_memory, model = block
+    shape = (arrays['lat'].size, arrays['lng'].size)
+    h = np.broadcast_to(arrays['h'], shape)
+    vnorm = np.broadcast_to(arrays['vnorm'], shape + (3,))
+
+    with trusted_inputs():
+        for index, G in irradiance_tiles(arrays['lat'][i], arrays['lng'][j],
+                                         arrays['date'][t], vnorm[i, j],
+                                         h[i, j], max_memory, model):
+            arrays['out'][i, j, t] = G
+
+
+def irradiance_map(lat, lng, date, vnorm=(0, 0, -1), h=0, out=None,
+                   max_memory=2**26, n_jobs=None, model=None):
+    """
+    Solar beam irradiance on a plane over a latitude x longitude x time
+    grid (see maps.irradiance_map), whose tiles are computed by a pool of
+    processes
+
+    Parameters
+    ----------
+    lat : float or array-like
+        (n_lat,) latitudes (-90 to 90) in degrees
+    lng : float or array-like
+        (n_lng,) longitudes (-180 to 180) in degrees, *east-positive*
+    date : array-like of datetime objects or datetime64
+        (n_time,) *UTC* dates and times
+    vnorm : array-like, optional
+        unit vector normal to plane in the local NED frame, (3,) or
+        (n_lat, n_lng, 3). Horizontal plane (pointing zenith) by default
+    h : float or array-like, optional
+        altitude above sea level in meters, scalar or (n_lat, n_lng)
+    out : array-like, optional
+        (n_lat, n_lng, n_time) array (i.e. a numpy memmap) where the map is
+        written. A float64 array is allocated if not given
+    max_memory : int, optional
+        memory budget of every tile (and worker) in bytes
+    n_jobs : int, optional
+        number of processes, all the cpus by default (None or -1)
+    model : str, optional
+        solar position model, 'spencer' or 'psa' (see solar_position_utc)
+
+    Returns
+    -------
+    G : array-like
+        (n_lat, n_lng, n_time) beam irradiance in W/m2
+    """
+    lat = np.ravel(np.asarray(lat, dtype=float))
+    lng = np.ravel(np.asarray(lng, dtype=float))
+    date = np.ravel(to_datetime64(date)).astype('datetime64[us]')
+    h = np.asarray(h, dtype=float)
+    vnorm = np.asarray(vnorm, dtype=float)
+    check_lat(lat)
+    check_long(lng)
+    check_alt(h)
+
+    # the default model of this process, for every worker
+    if model is None:
+        model = radiation._solar_position_model
+    _check_model(model)
+
+    n_lat, n_lng, n_time = _tile_shape(lat.size, lng.size, date.size,
+                                       max_memory)
+    blocks = [(slice(i, i + n_lat), slice(j, j + n_lng),
+               slice(t, t + n_time), max_memory, model)
+              for t in range(0, date.size, n_time)
+              for i in range(0, lat.size, n_lat)
+              for j in range(0, lng.size, n_lng)]
+
+    if out is None:
+        out = np.empty((lat.size, lng.size, date.size))
+
+    arrays = {'lat': lat, 'lng': lng, 'date': date, 'h': h, 'vnorm': vnorm}
+    return _run(_map_block, arrays, {'out': out}, blocks, n_jobs)['out']
+
+
+_FLEET_ARRAYS = ('s', 'eff', 'lat', 'lng', 'h', 'vnorm',
+                 '_sin_lat', '_cos_lat', '_prel', '_theta_lim')
+
+
+def _fleet_block(arrays, block):
+    """
+    Power of a block of panels and times, written into the shared output
+    """
+    j, t, max_block_size, utc, model = block
+    fleet = PanelFleet._from_arrays(**{key: arrays[key][j]
+                                       for key in _FLEET_ARRAYS})
+
+    arrays['out'][j, t] = fleet.power(arrays['date'][t], max_block_size,
+                                      utc, model)
+
+
+def fleet_power(fleet, date, max_block_size=2**18, n_jobs=None, utc=False,
+                model=None):
+    """
+    Output power of every panel of a fleet (see pvpanel.PanelFleet.power),
+    whose panel x time blocks are computed by a pool of processes
+
+    Parameters
+    ----------
+    fleet : PanelFleet object
+        fleet of panels
+    date : datetime object, array-like of datetime objects or datetime64
+        date and *solar* time, or *UTC* date and time if utc is True
+    max_block_size : int, optional
+        maximum number of panel-time elements of every block
+    n_jobs : int, optional
+        number of processes, all the cpus by default (None or -1)
+    utc : bool, optional
+        whether the dates are UTC (see PanelFleet.power)
+    model : str, optional
+        solar position model of the UTC times, 'spencer' or 'psa' (see
+        solar_position_utc)
+
+    Returns
+    -------
+    P : array-like
+        (n_panels, n_times) output power in W, (n_panels,) if a single
+        date is given
+    """
+    date = to_datetime64(date)
+    scalar = (np.ndim(date) == 0)
+    date = np.atleast_1d(date).ravel().astype('datetime64[us]')
+
+    n_time = max(min(date.size, max_block_size), 1)
+    n_panels = max(max_block_size // n_time, 1)
+    # the default model of this process, for every worker
+    if model is None:
+        model = radiation._solar_position_model
+    _check_model(model)
+
+    blocks = [(slice(j, j + n_panels), slice(t, t + n_time), max_block_size,
+               utc, model)
+              for j in range(0, len(fleet), n_panels)
+              for t in range(0, date.size, n_time)]
+
+    arrays = {key: getattr(fleet, key) for key in _FLEET_ARRAYS}
+    arrays['date'] = date
+    P = _run(_fleet_block, arrays,
+             {'out': np.empty((len(fleet), date.size))},
+             blocks, n_jobs)['out']
+
+    return P[:, 0] if scalar else P
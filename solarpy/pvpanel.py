@@ -3,7 +3,17 @@
 """
     Photovoltaic panel class
 """
-from .radiation import irradiance_on_plane
+import numpy as np
+from numpy import sin, cos, deg2rad
+from datetime import datetime, timedelta
+from .radiation import irradiance_on_plane, irradiation_on_plane,\
+                       declination, hour_angle, gon,\
+                       _solar_position, _solar_vector_ned, _beam_constants,\
+                       _beam_irradiance, _irradiance_on_plane,\
+                       _utc_declination_greenwich, _local_hour_angle,\
+                       _parallax, _check_model
+from . import radiation
+from .utils import check_lat, check_long, check_alt, to_datetime64
 
 
 class solar_panel(object):
@@ -80,3 +90,222 @@ class solar_panel(object):
         """
         return irradiance_on_plane(self.vnorm, self.h,
                                    self.date, self.lat) * self.s * self.eff
+
+    def energy(self, start, end, order=16):
+        """
+        Returns the output energy of a solar panel between two dates,
+        integrating its power with Gauss-Legendre quadrature (see
+        radiation.irradiation_on_plane)
+
+        Parameters
+        ----------
+        start : datetime object
+            initial date and *solar* time
+        end : datetime object
+            final date and *solar* time
+        order : int
+            number of Gauss-Legendre nodes per interval
+
+        Returns
+        -------
+        E : float
+            output energy in Wh
+        """
+        return irradiation_on_plane(self.vnorm, self.h, start, end,
+                                    self.lat, order) * self.s * self.eff
+
+
+def daily_yield(panel, date):
+    """
+    Returns the output energy of a solar panel on a day
+
+    Parameters
+    ----------
+    panel : solar_panel object
+        panel with position and orientation already set
+    date : datetime object
+        date (indifferent time)
+
+    Returns
+    -------
+    E : float
+        output energy in Wh
+    """
+    start = datetime(date.year, date.month, date.day)
+
+    return panel.energy(start, start + timedelta(days=1))
+
+
+def annual_yield(panel, year):
+    """
+    Returns the output energy of a solar panel on a year
+
+    Parameters
+    ----------
+    panel : solar_panel object
+        panel with position and orientation already set
+    year : int
+        year of interest
+
+    Returns
+    -------
+    E : float
+        output energy in Wh
+    """
+    return panel.energy(datetime(year, 1, 1), datetime(year + 1, 1, 1))
+
+
+class PanelFleet(object):
+    """
+    Fleet of photovoltaic solar panels, stored as contiguous arrays (one
+    element per panel) so that the power of every panel is evaluated at
+    once
+
+    Parameters
+    ----------
+    s : array-like
+        panels surface in m2
+    eff : array-like
+        panels efficiency
+    lat : array-like
+        latitude (-90 to 90) in degrees
+    lng : array-like
+        longitude, (-180 to 180) in degrees, *east-positive*. Only used
+        with UTC times (see power)
+    h : array-like
+        altitude above sea level in meters
+    vnorm : array-like
+        (n_panels, 3) unit vectors normal to the panels in NED frame
+    id_name : list of str, optional
+        panels names
+    """
+    def __init__(self, s, eff, lat, lng, h, vnorm, id_name=None):
+        s, eff, lat, lng, h = np.broadcast_arrays(
+            *[np.array(x, dtype=float, ndmin=1)
+              for x in (s, eff, lat, lng, h)])
+        vnorm = np.array(vnorm, dtype=float, ndmin=2)
+
+        if (s < 0).any():
+            raise ValueError('surface must be s >= 0')
+
+        if ((eff < 0) | (eff > 1)).any():
+            raise ValueError('efficiency must be 0 <= eff <= 1')
+
+        check_lat(lat)
+        check_long(lng)
+        check_alt(h)
+
+        if (s.ndim != 1) or (vnorm.shape[-1] != 3):
+            raise ValueError('panels must be 1-d and normal vectors (n, 3)')
+        vnorm = np.broadcast_to(vnorm, s.shape + (3,))
+
+        if id_name is not None and len(id_name) != s.size:
+            raise ValueError('there must be one id name per panel')
+
+        self.s = np.ascontiguousarray(s)
+        self.eff = np.ascontiguousarray(eff)
+        self.lat = np.ascontiguousarray(lat)
+        self.lng = np.ascontiguousarray(lng)
+        self.h = np.ascontiguousarray(h)
+        self.vnorm = np.ascontiguousarray(
+            vnorm / np.linalg.norm(vnorm, axis=-1)[:, np.newaxis])
+        self.id_name = id_name
+
+        # location constants, computed once
+        self._sin_lat = sin(deg2rad(self.lat))
+        self._cos_lat = cos(deg2rad(self.lat))
+        self._prel, self._theta_lim = _beam_constants(self.h)
+
+    @classmethod
+    def from_panels(cls, panels):
+        """
+        Builds a fleet from solar_panel objects with position and
+        orientation already set
+
+        Parameters
+        ----------
+        panels : iterable of solar_panel objects
+            panels of the fleet
+        """
+        panels = list(panels)
+        names = [getattr(p, 'id_name', None) for p in panels]
+
+        return cls([p.s for p in panels], [p.eff for p in panels],
+                   [p.lat for p in panels], [p.lng for p in panels],
+                   [p.h for p in panels], [p.vnorm for p in panels],
+                   id_name=None if all(n is None for n in names) else names)
+
+    def __len__(self):
+        return self.s.size
+
+    @classmethod
+    def _from_arrays(cls, **arrays):
+        """
+        Builds a fleet from already validated and normalized arrays (i.e.
+        views of shared memory), without copying them
+        """
+        fleet = object.__new__(cls)
+        fleet.__dict__.update(arrays)
+        fleet.__dict__.setdefault('id_name', None)
+
+        return fleet
+
+    def power(self, date, max_block_size=2**18, utc=False, model=None):
+        """
+        Returns the output power of every solar panel
+
+        Parameters
+        ----------
+        date : datetime object, array-like of datetime objects or datetime64
+            date and *solar* time, shared by every panel, or *UTC* date and
+            time if utc is True
+        max_block_size : int
+            maximum number of panel-time elements evaluated at once, that
+            bounds the size of the temporary arrays
+        utc : bool, optional
+            whether the dates are UTC, so that every panel gets the hour
+            angle of its own longitude
+        model : str, optional
+            solar position model of the UTC times, 'spencer' or 'psa' (see
+            solar_position_utc)
+
+        Returns
+        -------
+        P : array-like
+            (n_panels, n_times) output power in W, (n_panels,) if a single
+            date is given
+        """
+        date = to_datetime64(date)
+        scalar = (np.ndim(date) == 0)
+        date = np.atleast_1d(date).ravel()
+
+        # time-dependent terms, shared by every panel (the hour angle at
+        # Greenwich for UTC times)
+        if utc:
+            if model is None:
+                model = radiation._solar_position_model
+            _check_model(model)
+            dec, w = _utc_declination_greenwich(date, model)
+        else:
+            dec, w = declination(date), hour_angle(date)
+        g_on = gon(date)
+
+        P = np.empty((len(self), date.size))
+        step = max(1, max_block_size // max(date.size, 1))
+
+        for i in range(0, len(self), step):
+            j = slice(i, i + step)
+            w_j = _local_hour_angle(w, self.lng[j, np.newaxis]) if utc else w
+            pos = _solar_position(dec, w_j, self._sin_lat[j, np.newaxis],
+                                  self._cos_lat[j, np.newaxis])
+            if utc:
+                pos = _parallax(pos, model)
+            G = _beam_irradiance(pos.zenith, g_on, self.h[j, np.newaxis],
+                                 self._prel[j, np.newaxis],
+                                 self._theta_lim[j, np.newaxis])
+            G = _irradiance_on_plane(self.vnorm[j, np.newaxis, :],
+                                     _solar_vector_ned(pos), G)
+
+            P[j] = G * (self.s[j] * self.eff[j])[:, np.newaxis]
+
+        return P[:, 0] if scalar else P
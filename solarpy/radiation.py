@@ -8,22 +8,39 @@
 import numpy as np
 from numpy import sin, cos, tan, deg2rad, rad2deg,\
                   array, arccos, exp
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from collections import namedtuple
+from functools import lru_cache
 from .utils import *
 
 
+SolarPosition = namedtuple('SolarPosition',
+                           ['declination', 'hour_angle', 'zenith', 'azimuth',
+                            'altitude', 'sunset_hour_angle', 'daylight'])
+
+SunriseSunset = namedtuple('SunriseSunset',
+                           ['sunrise_hour_angle', 'sunset_hour_angle',
+                            'sunrise_time', 'sunset_time', 'daylight_hours',
+                            'status'])
+
+# sunrise/sunset status codes
+NORMAL_DAY = 0
+POLAR_DAY = 1
+POLAR_NIGHT = 2
+
+
 def b_nday(date):
     """
     Day-of-the-year angle on a desired date and time.
 
     Parameters
     ----------
-    date : datetime object
-        date of interest
+    date : datetime object, array-like of datetime objects or datetime64
+        date(s) of interest
 
     Returns
     -------
-    B : float
+    B : float or array-like
         angle of the day of the year in radians
     """
     n = day_of_the_year(date)
@@ -37,12 +54,12 @@ def gon(date):
 
     Parameters
     ----------
-    date : datetime object
-        date of interest
+    date : datetime object, array-like of datetime objects or datetime64
+        date(s) of interest
 
     Returns
     -------
-    gon : float
+    gon : float or array-like
         extraterrestrial radiation in W/m2
     """
     B = b_nday(date)
@@ -57,12 +74,12 @@ def eq_time(date):
 
     Parameters
     ----------
-    date : datetime
-        date of interest
+    date : datetime object, array-like of datetime objects or datetime64
+        date(s) of interest
 
     Returns
     -------
-    E : float
+    E : float or array-like
         equation of time in minutes
     """
     B = b_nday(date)
@@ -78,12 +95,12 @@ def declination(date):
 
     Parameters
     ----------
-    date : datetime object
-        date of interest
+    date : datetime object, array-like of datetime objects or datetime64
+        date(s) of interest
 
     Returns
     -------
-    declination : float
+    declination : float or array-like
         declination in radians
     """
     B = b_nday(date)
@@ -101,7 +118,10 @@ def standard2solar_time(date, lng):
     date : datetime object
         standard (or local) time
     lng : float
-        longitude, east-west position wrt the Prime Meridian in degrees
+        longitude, east-west position wrt the Prime Meridian in degrees,
+        *west positive* as in Duffie and Beckman (i.e. 89.4 for Madison).
+        Note that civil2solar_time, and the functions that take UTC times,
+        use *east positive* longitudes (-89.4 for Madison)
 
     Returns
     -------
@@ -124,6 +144,124 @@ def standard2solar_time(date, lng):
     return t_solar
 
 
+def civil2solar_time(date, lng, tz=None):
+    """
+    Solar time for arrays of UTC or *civil* (local clock, including
+    daylight saving time) times of a time zone, and longitudes. The offsets
+    of the zone are looked up in a table of its transitions, built once per
+    zone and year, instead of converting every timestamp.
+
+    Parameters
+    ----------
+    date : datetime object, array-like of datetime objects or datetime64
+        UTC time if tz is None, civil time of zone tz otherwise. Aware
+        datetime objects are converted to UTC (and tz is ignored)
+    lng : float or array-like
+        longitude (-180 to 180) in degrees, *east positive* (the opposite
+        sign of standard2solar_time, that follows Duffie and Beckman)
+    tz : str or tzinfo object, optional
+        IANA time zone (i.e. 'Europe/Madrid') of the civil times
+
+    Returns
+    -------
+    solar time : datetime64 or array of datetime64
+        solar time, in microseconds
+
+    Notes
+    -----
+    The standard meridian is not needed, as the times are referred to UTC:
+    solar time = UTC + 4 min/deg * lng + E. Civil times that are skipped or
+    repeated by a transition take the offset in use before it (as fold=0
+    in the datetime module).
+    """
+    check_long(lng)
+
+    if isinstance(date, datetime) and date.utcoffset() is not None:
+        date, tz = date.astimezone(timezone.utc).replace(tzinfo=None), None
+    elif isinstance(date, (list, tuple)) and any(
+            isinstance(d, datetime) and d.utcoffset() is not None
+            for d in date):
+        date, tz = [d.astimezone(timezone.utc).replace(tzinfo=None)
+                    for d in date], None
+
+    date = to_datetime64(date).astype('datetime64[us]')
+
+    if tz is not None:
+        date = date - _civil_offset(date, tz)
+
+    minutes = 4 * np.asarray(lng) + eq_time(date)
+
+    return (date + np.round(minutes * 6e7).astype('timedelta64[us]'))[()]
+
+
+def _civil_offset(date, tz):
+    """
+    UTC offsets (timedelta64) of civil datetime64 times of a time zone,
+    NaT for NaT times
+    """
+    date = np.asarray(date)
+    valid = ~np.isnat(date)
+    if not valid.any():
+        return np.full(date.shape, np.timedelta64('NaT'),
+                       dtype='timedelta64[us]')
+
+    if isinstance(tz, str):
+        from zoneinfo import ZoneInfo  # python >= 3.9
+        tz = ZoneInfo(tz)
+
+    first = date[valid].min().item().year
+    last = date[valid].max().item().year
+    tables = [_zone_transitions(tz, year) for year in range(first, last + 1)]
+
+    # civil time where every offset starts
+    start = np.concatenate([t[0] for t in tables])
+    offset = np.concatenate([tables[0][2]] + [t[1] for t in tables])
+
+    # NaT sorts last: its index is replaced
+    offset = offset[np.searchsorted(start, date, side='right')]
+
+    return np.where(valid, offset, np.timedelta64('NaT'))
+
+
+@lru_cache(maxsize=None)
+def _zone_transitions(tz, year):
+    """
+    Transitions of a time zone during a year: civil time from which every
+    new offset is used, new offsets and offset at the start of the year
+    (datetime64[us] and timedelta64[us] arrays)
+    """
+    def offset(t):
+        return t.astimezone(tz).utcoffset()
+
+    # hourly scan, then bisection to the second
+    t0 = datetime(year, 1, 1, tzinfo=timezone.utc)
+    hours = (datetime(year + 1, 1, 1, tzinfo=timezone.utc) - t0) // \
+        timedelta(hours=1)
+    start, new = [], []
+    before = offset(t0)
+    previous = before
+    for k in range(1, hours + 1):
+        t = t0 + timedelta(hours=k)
+        current = offset(t)
+        if current != previous:
+            lo, hi = -3600, 0  # seconds wrt t
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if offset(t + timedelta(seconds=mid)) == previous:
+                    lo = mid
+                else:
+                    hi = mid
+            # skipped and repeated civil times keep the previous offset
+            start.append(t.replace(tzinfo=None) + timedelta(seconds=hi) +
+                         max(previous, current))
+            new.append(current)
+            previous = current
+
+    return (np.array(start, dtype='datetime64[us]'),
+            np.array(new, dtype='timedelta64[us]'),
+            np.array([before], dtype='timedelta64[us]'))
+
+
 def hour_angle(date):
     """
     Angular displacement of the sun east-west of the local meridian for a
@@ -132,19 +270,180 @@ def hour_angle(date):
 
     Parameters
     ----------
-    date : datetime object
+    date : datetime object, array-like of datetime objects or datetime64
         date and *solar* time
 
     Returns
     -------
-    hour angle : float
+    hour angle : float or array-like
         local hour angle in radians
     """
     if isinstance(date, datetime):
         w = (date.hour + (date.minute / 60) - 12) * 15
         return deg2rad(w)
     else:
-        raise TypeError('date must be a datetime object')
+        date = to_datetime64(date)
+        day_start = date.astype('datetime64[D]')
+        minutes = (date - day_start) // np.timedelta64(1, 'm')
+        hour, minute = np.divmod(minutes, 60)
+        w = (hour + (minute / 60) - 12) * 15
+        return deg2rad(w)
+
+
+# solar position models of the UTC functions
+SOLAR_POSITION_MODELS = ('spencer', 'psa')
+_solar_position_model = 'spencer'
+
+# earth mean radius over astronomical unit (PSA parallax)
+_PSA_PARALLAX = 6371.01 / 149597890
+
+
+def set_solar_position_model(model):
+    """
+    Sets the default solar position model of the functions that take UTC
+    times and longitudes (solar_position_utc, maps), process-wide
+
+    Parameters
+    ----------
+    model : str
+        'spencer' (Spencer series, as the *solar* time functions) or 'psa'
+        (Blanco-Muriel et al., 0.01º accuracy)
+
+    Returns
+    -------
+    previous : str
+        previous default model
+    """
+    global _solar_position_model
+
+    _check_model(model)
+    previous, _solar_position_model = _solar_position_model, model
+
+    return previous
+
+
+def _check_model(model):
+    if model not in SOLAR_POSITION_MODELS:
+        raise ValueError('model must be one of %s' % (SOLAR_POSITION_MODELS,))
+
+
+def _psa(date):
+    """
+    Declination and Greenwich hour angle (radians) of the sun from UTC
+    date(s) with the PSA algorithm
+    """
+    date = to_datetime64(date)
+    n = (date - np.datetime64('2000-01-01T12:00')) / np.timedelta64(1, 'D')
+    hours = (date - date.astype('datetime64[D]')) / np.timedelta64(1, 'h')
+
+    # ecliptic coordinates
+    omega = 2.1429 - 0.0010394594 * n
+    L = 4.8950630 + 0.017202791698 * n  # mean longitude
+    g = 6.2400600 + 0.0172019699 * n  # mean anomaly
+    ecl_lng = (L + 0.03341607 * sin(g) + 0.00034894 * sin(2 * g) -
+               0.0001134 - 0.0000203 * sin(omega))
+    ecl_obl = 0.4090928 - 6.2140e-9 * n + 0.0000396 * cos(omega)
+
+    # celestial coordinates
+    sin_ecl_lng = sin(ecl_lng)
+    ra = np.arctan2(cos(ecl_obl) * sin_ecl_lng, cos(ecl_lng))
+    dec = np.arcsin(sin(ecl_obl) * sin_ecl_lng)
+
+    # greenwich mean sidereal time (hours)
+    gmst = 6.6974243242 + 0.0657098283 * n + hours
+
+    return dec, deg2rad(gmst * 15) - ra
+
+
+def _utc_declination_hour_angle(date, lng, model):
+    """
+    Declination and hour angle (radians, -pi to pi) from UTC date(s) and
+    *east-positive* longitude(s) in degrees with a solar position model
+    """
+    dec, w0 = _utc_declination_greenwich(date, model)
+
+    return dec, _local_hour_angle(w0, lng)
+
+
+def _utc_declination_greenwich(date, model):
+    """
+    Declination and Greenwich hour angle (radians) from UTC date(s) with a
+    solar position model: the terms that do not depend on the longitude
+    """
+    if model == 'spencer':
+        date = to_datetime64(date)
+        hours = (date - date.astype('datetime64[D]')) / np.timedelta64(1, 'h')
+        return declination(date), deg2rad(15 * (hours - 12) +
+                                          eq_time(date) / 4)
+
+    return _psa(date)
+
+
+def _local_hour_angle(w0, lng):
+    """
+    Hour angle (radians, -pi to pi) from the Greenwich hour angle (radians)
+    and the *east-positive* longitude in degrees
+    """
+    w = w0 + deg2rad(lng)
+
+    return (w + np.pi) % (2 * np.pi) - np.pi
+
+
+def _parallax(pos, model):
+    """
+    Solar position corrected for the parallax (PSA model)
+    """
+    if model == 'spencer':
+        return pos
+
+    parallax = _PSA_PARALLAX * sin(pos.zenith)
+    return pos._replace(zenith=pos.zenith + parallax,
+                        altitude=pos.altitude - parallax)
+
+
+def solar_position_utc(date, lat, lng, model=None):
+    """
+    Position of the sun for a *UTC* date and time, latitude and longitude,
+    with a selectable solar position model: the Spencer series of the
+    *solar* time functions (with the continuous hour angle), or the PSA
+    algorithm for applications that need high accuracy (tracker control,
+    performance audits), about 0.01º between 1999 and 2015 and slowly
+    degrading outside.
+
+    Parameters
+    ----------
+    date : datetime object, array-like of datetime objects or datetime64
+        *UTC* date and time
+    lat : float or array-like
+        latitude (-90 to 90) in degrees
+    lng : float or array-like
+        longitude (-180 to 180) in degrees, *east-positive*
+    model : str, optional
+        'spencer' or 'psa'. Default set with set_solar_position_model
+        ('spencer' if not set)
+
+    Returns
+    -------
+    SolarPosition : namedtuple
+        as solar_position. The PSA zenith and altitude include the parallax
+        correction, but not the atmospheric refraction
+
+    Notes
+    -----
+    Blanco-Muriel, M., Alarcón-Padilla, D.C., López-Moratalla, T.,
+    Lara-Coira, M. (2001) "Computing the solar vector", Solar Energy
+    70(5):431-441
+    """
+    if model is None:
+        model = _solar_position_model
+    _check_model(model)
+    check_lat(lat)
+    check_long(lng)
+
+    dec, w = _utc_declination_hour_angle(date, lng, model)
+    lat = deg2rad(lat)
+
+    return _parallax(_solar_position(dec, w, sin(lat), cos(lat)), model)
 
 
 def theta(date, lat, beta, surf_az):
@@ -155,9 +454,9 @@ def theta(date, lat, beta, surf_az):
 
     Parameters
     ----------
-    date : datetime object
+    date : datetime object, array-like of datetime objects or datetime64
         date and *solar* time
-    lat : float
+    lat : float or array-like
         latitude (-90 to 90) in degrees
     beta : float
         slope angle of the surface wrt the local horizon
@@ -168,7 +467,7 @@ def theta(date, lat, beta, surf_az):
 
     Returns
     -------
-    theta : float
+    theta : float or array-like
             angle of incidence in radians
     """
     check_lat(lat)
@@ -197,14 +496,14 @@ def theta_z(date, lat):
 
     Parameters
     ----------
-    date : datetime object
+    date : datetime object, array-like of datetime objects or datetime64
         date and *solar* time
-    lat : float
+    lat : float or array-like
         latitude (-90 to 90) in degrees
 
     Returns
     -------
-    theta_z : float
+    theta_z : float or array-like
         zenith angle of incidence in radians
     """
     check_lat(lat)
@@ -227,39 +526,17 @@ def solar_azimuth(date, lat):
 
     Parameters
     ----------
-    date : datetime object
+    date : datetime object, array-like of datetime objects or datetime64
         date and *solar* time
-    lat : float
+    lat : float or array-like
         latitude (-90 to 90) in degrees
 
     Returns
     -------
-    solar_az : float
+    solar_az : float or array-like
         azimuth angle in radians
     """
-    # to avoid undefined values at lat = 90º or lat = -90º
-    # the error incurred is acceptable
-    if abs(lat) == 90:
-        lat = np.sign(lat) * 89.999
-
-    w = hour_angle(date)
-    dec = declination(date)
-    th_z = theta_z(date, lat)
-    lat = deg2rad(lat)
-
-    tmp = (cos(th_z) * sin(lat) - sin(dec)) / (sin(th_z) * cos(lat))
-
-    # herculean fight against floating-point errors
-    if (abs(tmp) > 1):
-        tmp = int(tmp)  # TODO: improve
-
-    # to avoid undefined values at noon (12:00)
-    if w == 0:
-        s = 1
-    else:
-        s = np.sign(w)
-
-    return s * arccos(tmp)
+    return solar_position(date, lat).azimuth
 
 
 def solar_altitude(date, lat):
@@ -271,14 +548,14 @@ def solar_altitude(date, lat):
 
     Parameters
     ----------
-    date : datetime object
+    date : datetime object, array-like of datetime objects or datetime64
         date and *solar* time
-    lat : float
+    lat : float or array-like
         latitude (-90 to 90) in degrees
 
     Returns
     -------
-    solar_altitude : float
+    solar_altitude : float or array-like
         altitude angle in radians
     """
     th_z = theta_z(date, lat)
@@ -405,33 +682,138 @@ def daylight_hours(date, lat):
 
     Parameters
     ----------
-    date : datetime object
+    date : datetime object, array-like of datetime objects or datetime64
         date (indifferent time)
-    lat : float
+    lat : float or array-like
         latitude (-90 to 90) in degrees
 
     Returns
     -------
-    day_hours : float
+    day_hours : float or array-like
         number of hours of light within the day
 
     Note
     ----
         http://mathforum.org/library/drmath/view/56478.html
     """
+    return sunrise_sunset(date, lat).daylight_hours
+
+
+def sunrise_sunset(date, lat):
+    """
+    Sunrise and sunset for arrays of dates and latitudes, without raising
+    NoSunsetNoSunrise: in permanent day or night the hour angles are NaN,
+    the times are NaT and the status code tells which case applies. Dates
+    and latitudes broadcast together, so a whole sunrise/sunset atlas is
+    obtained in a single call.
+
+    Parameters
+    ----------
+    date : datetime object, array-like of datetime objects or datetime64
+        date(s) (indifferent time)
+    lat : float or array-like
+        latitude (-90 to 90) in degrees
+
+    Returns
+    -------
+    SunriseSunset : namedtuple
+        sunrise and sunset hour angles in radians, sunrise and sunset
+        *solar* times as datetime64 (truncated to the minute, as in
+        sunrise_time and sunset_time), number of hours of light and status
+        (NORMAL_DAY, POLAR_DAY or POLAR_NIGHT)
+
+    Example
+    -------
+    >>> lats = np.linspace(-90, 90, 181)
+    >>> days = np.arange('2019-01-01', '2020-01-01', dtype='datetime64[D]')
+    >>> atlas = sunrise_sunset(days[np.newaxis, :], lats[:, np.newaxis])
+    >>> atlas.sunset_time.shape
+    (181, 365)
+    """
     check_lat(lat)
 
+    date = to_datetime64(date)
     dec = declination(date)
     lat = deg2rad(lat)
 
-    tmp = -tan(lat) * tan(dec)
+    cos_ws = (-1) * tan(lat) * tan(dec)
+    status = np.where(cos_ws < -1, POLAR_DAY,
+                      np.where(cos_ws > 1, POLAR_NIGHT, NORMAL_DAY))
+    normal = status == NORMAL_DAY
+
+    # clipped, 0 in permanent night and pi in permanent day
+    ws = arccos(np.clip(cos_ws, -1, 1))
+    hours = 24 * ws / np.pi
+
+    # 4 minutes of time per degree of hour angle, truncated to the minute
+    noon = date.astype('datetime64[D]') + np.timedelta64(12, 'h')
+    rise = np.floor(-rad2deg(ws) * 4).astype(int).astype('timedelta64[m]')
+    set_ = np.floor(rad2deg(ws) * 4).astype(int).astype('timedelta64[m]')
+    nat = np.datetime64('NaT')
+    sunrise = np.where(normal, noon + rise, nat)
+    sunset = np.where(normal, noon + set_, nat)
+    ws = np.where(normal, ws, np.nan)
+
+    return SunriseSunset(-ws[()], ws[()],
+                         sunrise.astype('datetime64[us]')[()],
+                         sunset.astype('datetime64[us]')[()],
+                         hours[()], status[()])
+
+
+def solar_position(date, lat):
+    """
+    Position of the sun for a date, *solar* time and latitude. All the
+    angles are computed together, sharing the declination, hour angle and
+    latitude trigonometry, so that functions needing several of them
+    evaluate the solar geometry only once.
 
-    if (tmp < -1.0):
-        return 24
-    elif (tmp > 1.0):
-        return 0
-    else:
-        return 24 * (2 * arccos(tmp) / (2 * np.pi))
+    Parameters
+    ----------
+    date : datetime object, array-like of datetime objects or datetime64
+        date and *solar* time
+    lat : float or array-like
+        latitude (-90 to 90) in degrees
+
+    Returns
+    -------
+    SolarPosition : namedtuple
+        declination, hour angle, zenith, azimuth (positive to the West),
+        altitude and sunset hour angle, all in radians, and daylight
+        (True when the sun is between sunrise and sunset). The sunset
+        hour angle is 0 in permanent darkness and pi in permanent light.
+    """
+    check_lat(lat)
+
+    dec = declination(date)
+    w = hour_angle(date)
+    lat = deg2rad(lat)
+
+    return _solar_position(dec, w, sin(lat), cos(lat))
+
+
+def _solar_position(dec, w, sin_lat, cos_lat):
+    """
+    Solar position from declination, hour angle (radians) and the sine and
+    cosine of the latitude
+    """
+    sin_dec, cos_dec = sin(dec), cos(dec)
+    cos_w = cos(w)
+
+    cos_theta_z = np.clip(sin_dec * sin_lat + cos_dec * cos_lat * cos_w, -1, 1)
+    th_z = arccos(cos_theta_z)
+    altitude = np.arcsin(cos_theta_z)
+
+    # atan2 form of the azimuth, well defined at noon and at the poles
+    azimuth = np.arctan2(sin(w), cos_w * sin_lat - tan(dec) * cos_lat)
+
+    # the point on the earth surface is at night if the hour angle is out
+    # of the sunrise-sunset range or, in permanent darkness, if cos_ws > 1.
+    # In permanent light (cos_ws < -1) the clipped range spans the whole day
+    cos_ws = (-1) * (sin_lat / cos_lat) * tan(dec)
+    ws = arccos(np.clip(cos_ws, -1, 1))
+    daylight = (abs(w) <= ws) & (cos_ws <= 1)
+
+    return SolarPosition(dec, w, th_z, azimuth, altitude, ws, daylight)
 
 
 def solar_vector_ned(date, lat):
@@ -442,43 +824,56 @@ def solar_vector_ned(date, lat):
 
     Parameters
     ----------
-    date : datetime object
+    date : datetime object, array-like of datetime objects or datetime64
         date and *solar* time
-    lat : float
+    lat : float or array-like
         latitude (-90 to 90) in degrees
 
     Returns
     -------
     array-like
-        vector of the solar beam
+        vector of the solar beam, (..., 3) for array inputs. Zero at night
     """
-    solar_az = solar_azimuth(date, lat)
-    solar_alt = solar_altitude(date, lat)
+    return _solar_vector_ned(solar_position(date, lat))
 
-    w = hour_angle(date)
-    lh = daylight_hours(date, lat)
 
-    try:
-        w_sr = sunrise_hour_angle(date, lat)
-        w_ss = sunset_hour_angle(date, lat)
-
-        if (w > w_ss) or (w < w_sr):
-            # the point on the earth surface is at night
-            return array([0, 0, 0])
-        else:
-            return array([-cos(solar_az) * cos(solar_alt),
-                          -sin(solar_az) * cos(solar_alt),
-                          -sin(solar_alt)])
-
-    except NoSunsetNoSunrise:
-        if (lh == 0):
-            # the point on the earth surface is in permanent darkness
-            return array([0, 0, 0])
-        else:
-            # the point on the earth surface is in permanent light
-            return array([-cos(solar_az) * cos(solar_alt),
-                          -sin(solar_az) * cos(solar_alt),
-                          -sin(solar_alt)])
+def _solar_vector_ned(pos):
+    """
+    Solar vector in NED frame from an already computed solar position,
+    null when the point on the earth surface is at night
+    """
+    cos_alt = cos(pos.altitude)
+    vsol = np.stack([-cos(pos.azimuth) * cos_alt,
+                     -sin(pos.azimuth) * cos_alt,
+                     -sin(pos.altitude)], axis=-1)
+
+    return np.where(np.asarray(pos.daylight)[..., np.newaxis], vsol, 0)
+
+
+def surface_normal_ned(beta, surf_az):
+    """
+    Unit vector normal to a surface (pointing to the sky side) in local
+    geodetic horizon reference frame (NED - North, East, Down)
+
+    Parameters
+    ----------
+    beta : float or array-like
+        slope angle of the surface wrt the local horizon
+        in degrees (0 to 180)
+    surf_az : float or array-like
+        azimuth angle of the surface in degrees wrt the local
+        meridian (-180 to 180). 0-> south, east negative
+
+    Returns
+    -------
+    array-like
+        normal vector, (3,) or (..., 3) for array inputs
+    """
+    beta, surf_az = np.broadcast_arrays(deg2rad(beta), deg2rad(surf_az))
+
+    return np.stack([-sin(beta) * cos(surf_az),
+                     -sin(beta) * sin(surf_az),
+                     -cos(beta)], axis=-1)
 
 
 def air_mass_kastenyoung1989(theta_z, h, limit=True):
@@ -488,16 +883,16 @@ def air_mass_kastenyoung1989(theta_z, h, limit=True):
 
     Parameters
     ----------
-    theta_z : float
+    theta_z : float or array-like
         zenith angle of incidence in degrees
-    h : float
+    h : float or array-like
         altitude above sea level in meters
     limit : boolean
         activates or deaactivates altitude limit
 
     Returns
     -------
-    m : float
+    m : float or array-like
         ratio
 
     Notes
@@ -505,7 +900,7 @@ def air_mass_kastenyoung1989(theta_z, h, limit=True):
     Kasten, F.H., Young, A.T. (1989) "Revised optical air mass tables and
     approximation formula"
     """
-    # needed until the atmosphere (pressure) model is extended beyond 24km
+    # the atmosphere (pressure) model is valid until 86km
     if limit:
         check_alt(h)
     else:
@@ -513,14 +908,10 @@ def air_mass_kastenyoung1989(theta_z, h, limit=True):
 
     # this saturation is an interim solution needed to avoid KY1989 model
     # limitations beyond 90º. TODO: improve
-    if theta_z < 91.5:
-        theta_z_rad = deg2rad(theta_z)
-        m = exp(-0.0001184 * h) / (cos(theta_z_rad) +
-                                   0.50572 * (96.07995 - theta_z) ** (-1.634))
-    else:
-        theta_z_rad = deg2rad(91.5)
-        m = exp(-0.0001184 * h) / (cos(theta_z_rad) +
-                                   0.50572 * (96.07995 - 91.5) ** (-1.634))
+    theta_z = np.minimum(theta_z, 91.5)
+    theta_z_rad = deg2rad(theta_z)
+    m = exp(-0.0001184 * np.asarray(h)) / (cos(theta_z_rad) +
+                               0.50572 * (96.07995 - theta_z) ** (-1.634))
 
     return m
 
@@ -562,16 +953,16 @@ def beam_irradiance(h, date, lat):
 
     Parameters
     ----------
-    h : float
+    h : float or array-like
         altitude above sea level in meters
-    date : datetime object
+    date : datetime object, array-like of datetime objects or datetime64
         date and *solar* time
-    lat : float
+    lat : float or array-like
         latitude (-90 to 90) in degrees
 
     Returns
     -------
-    G : float
+    G : float or array-like
         beam irradiance in W/m2
 
     Notes
@@ -579,23 +970,42 @@ def beam_irradiance(h, date, lat):
     Aglietti, G.S., Redi, S., Tatnall,A.R., Markvart, T., (2009) "Harnessing
     High-Altitude Solar Power"
     """
-    alpha_int = 0.32  # atmospheric extinction. TODO: improve, as it changes
-                      # throughout the year. Visible light? 4000-7000A
-    prel = pressure(h) / pressure(0)  # pressure relation
+    check_alt(h)
+
+    theta_zenith = solar_position(date, lat).zenith  # radians
+
+    return _beam_irradiance(theta_zenith, gon(date), h, *_beam_constants(h))
+
+
+def _beam_constants(h):
+    """
+    Pressure relation and maximum zenith angle (radians) of the beam
+    irradiance model, that only depend on the altitude
+    """
+    h = np.asarray(h)
+    prel = standard_atmosphere.pressure_ratio(h)  # pressure relation
 
     # the maximum zenith angle is the one that points to the horizon
     a = 6378137  # [m] Earth equatorial axis
     theta_lim = (1 / 2) * np.pi + arccos(a / (a + h))  # radians
 
-    theta_zenith = theta_z(date, lat)  # radians
+    return prel, theta_lim
 
-    if theta_zenith < theta_lim:
-        m = air_mass_kastenyoung1989(rad2deg(theta_zenith), h)
-        G = gon(date) * exp(-prel * m * alpha_int)
-    else:
-        G = 0
 
-    return G
+def _beam_irradiance(theta_zenith, g_on, h, prel, theta_lim):
+    """
+    Beam irradiance from an already computed zenith angle (radians),
+    extraterrestrial radiation on a plane normal to the radiation (W/m2)
+    and altitude constants (see _beam_constants)
+    """
+    alpha_int = 0.32  # atmospheric extinction. TODO: improve, as it changes
+                      # throughout the year. Visible light? 4000-7000A
+
+    m = air_mass_kastenyoung1989(rad2deg(theta_zenith), h, limit=False)
+    G = g_on * exp(-prel * m * alpha_int)
+
+    # no beam irradiance with the sun below the horizon
+    return np.where(theta_zenith < theta_lim, G, 0)[()]
 
 
 def irradiance_on_plane(vnorm, h, date, lat):
@@ -606,38 +1016,237 @@ def irradiance_on_plane(vnorm, h, date, lat):
 
     Note: it does not take into account the diffuse irradiance
 
+    Parameters
+    ----------
+    vnorm : array-like
+        unit vector normal to plane, (3,) or (..., 3)
+    h : float or array-like
+        altitude above sea level in meters
+    date : datetime object, array-like of datetime objects or datetime64
+        date and *solar* time
+    lat : float or array-like
+        latitude (-90 to 90) in degrees
+
+    Returns
+    -------
+    G : float or array-like
+        beam irradiance in W/m2
+    """
+    vnorm = np.asarray(vnorm, dtype=float)
+    check_alt(h)
+
+    pos = solar_position(date, lat)
+    G = _beam_irradiance(pos.zenith, gon(date), h, *_beam_constants(h))
+
+    return _irradiance_on_plane(vnorm, _solar_vector_ned(pos), G)
+
+
+def _irradiance_on_plane(vnorm, vsol, G):
+    """
+    Irradiance on a plane from its normal vector, the solar vector (null
+    when there is no sun) and the beam irradiance
+    """
+    vnorm_abs = np.linalg.norm(vnorm, axis=-1)
+    cos_theta = (vnorm * vsol).sum(axis=-1) / vnorm_abs
+
+    # for future solar panel applications: only one side has cells
+    cos_theta = np.maximum(cos_theta, 0)
+
+    return G * cos_theta
+
+
+def irradiation_on_plane(vnorm, h, start, end, lat, order=16):
+    """
+    Returns the solar beam irradiation (irradiance integrated over time) on
+    a plane defined by its unit normal vector in NED frame, at a certain
+    altitude and latitude, between two *solar* times.
+
+    The irradiance is integrated over the hour angle, day by day, with
+    Gauss-Legendre quadrature. The integration limits are the sunrise and
+    sunset hour angles and the hour angles where the sun crosses the plane,
+    so that the integrand is smooth on every interval.
+
+    Note: it does not take into account the diffuse irradiance
+
     Parameters
     ----------
     vnorm : array-like
         unit vector normal to plane
     h : float
         altitude above sea level in meters
-    date : datetime object
-        date and *solar* time
+    start : datetime object or datetime64
+        initial date and *solar* time
+    end : datetime object or datetime64
+        final date and *solar* time
     lat : float
         latitude (-90 to 90) in degrees
+    order : int
+        number of Gauss-Legendre nodes per interval
 
     Returns
     -------
-    G : float
-        beam irradiance in W/m2
+    H : float
+        beam irradiation in Wh/m2
     """
-    vsol = solar_vector_ned(date, lat)
+    vnorm = np.asarray(vnorm, dtype=float)
+    vnorm = vnorm / np.linalg.norm(vnorm)
+    check_alt(h)
+    check_lat(lat)
 
-    if (vsol == array([0, 0, 0])).all():
-        # in case there is no sun (night or permanent darkness)
-        G = 0
-        theta = np.nan
-    else:
-        vnorm_abs = np.linalg.norm(vnorm)
-        vsol_abs = np.linalg.norm(vsol)
+    start, end = to_datetime64(start), to_datetime64(end)
+    if end < start:
+        raise ValueError('end must be later than start')
+
+    days = np.arange(start.astype('datetime64[D]'),
+                     end.astype('datetime64[D]') + np.timedelta64(1, 'D'))
+    dec = declination(days)
+    lat = deg2rad(lat)
+
+    # integration limits: whole days, except for the first and last ones
+    hour = np.timedelta64(1, 'h')
+    w_lo = np.full(days.shape, -np.pi)
+    w_hi = np.full(days.shape, np.pi)
+    w_lo[0] = deg2rad(((start - days[0]) / hour - 12) * 15)
+    w_hi[-1] = deg2rad(((end - days[-1]) / hour - 12) * 15)
+
+    # between sunrise and sunset
+    w_ss = solar_position(days, rad2deg(lat)).sunset_hour_angle  # 0 if dark
+    w_lo = np.maximum(w_lo, -w_ss)
+    w_hi = np.minimum(w_hi, w_ss)
+
+    # and while the sun is in front of the plane
+    A, B, C, a, b = _incidence_arcs(vnorm, dec, lat, w_lo, w_hi)
+    half = (b - a) / 2
+
+    x, weights = np.polynomial.legendre.leggauss(order)
+    w = ((a + b) / 2)[..., np.newaxis] + half[..., np.newaxis] * x
+
+    dec = dec[:, np.newaxis, np.newaxis]
+    pos = _solar_position(dec, w, sin(lat), cos(lat))
+    G = _beam_irradiance(pos.zenith, gon(days)[:, np.newaxis, np.newaxis],
+                         h, *_beam_constants(h))
+    cos_theta = np.maximum(A[:, np.newaxis, np.newaxis] +
+                           B[:, np.newaxis, np.newaxis] * cos(w) +
+                           C[:, np.newaxis, np.newaxis] * sin(w), 0)
+
+    # dw = 15 degrees per hour
+    return (half[..., np.newaxis] * weights * G * cos_theta).sum() * \
+        (12 / np.pi)
+
+
+def _incidence_arcs(vnorm, dec, lat, w_lo, w_hi):
+    """
+    Hour angle intervals, within [w_lo, w_hi], where the sun is in front of
+    a plane defined by its unit normal vector in NED frame, for a
+    declination and latitude (radians).
+
+    cos(theta) as a function of the hour angle is A + B cos(w) + C sin(w),
+    that is A + R cos(w - phi), positive on an arc of half-width d around
+    phi. That arc, shifted one turn each way, is intersected with the
+    limits, giving three (possibly empty) intervals [a, b].
+
+    Returns A, B, C and the (..., 3) interval limits a, b (b = a if empty)
+    """
+    n_N, n_E, n_D = vnorm[..., 0], vnorm[..., 1], vnorm[..., 2]
+    A = (n_N * cos(lat) - n_D * sin(lat)) * sin(dec)
+    B = -(n_N * sin(lat) + n_D * cos(lat)) * cos(dec)
+    C = -n_E * cos(dec)
+
+    R = np.hypot(B, C)
+    phi = np.arctan2(C, B)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d = arccos(np.clip(-A / R, -1, 1))
+    d = np.where(np.isnan(d), 0, d)
+
+    k = 2 * np.pi * array([-1, 0, 1])
+    a = np.maximum(np.asarray(w_lo)[..., np.newaxis],
+                   (phi - d)[..., np.newaxis] + k)
+    b = np.minimum(np.asarray(w_hi)[..., np.newaxis],
+                   (phi + d)[..., np.newaxis] + k)
+
+    return A, B, C, a, np.maximum(a, b)
+
+
+def daily_extraterrestrial_irradiation(date, lat, beta=0, surf_az=0):
+    """
+    Returns the daily extraterrestrial irradiation (H0) on a surface for a
+    date, latitude, surface slope and surface azimuth, integrating
+    analytically the extraterrestrial radiation between sunrise and sunset
+    (and while the sun is in front of the surface, if tilted).
+
+    Parameters
+    ----------
+    date : datetime object, array-like of datetime objects or datetime64
+        date (indifferent time)
+    lat : float or array-like
+        latitude (-90 to 90) in degrees
+    beta : float or array-like
+        slope angle of the surface wrt the local horizon
+        in degrees (0 to 180), 0 -> horizontal
+    surf_az : float or array-like
+        azimuth angle of the surface in degrees wrt the local
+        meridian (-180 to 180). 0-> south, east negative
+
+    Returns
+    -------
+    H0 : float or array-like
+        extraterrestrial irradiation in Wh/m2
+
+    Notes
+    -----
+    Duffie, J.A., and Beckman, W. A., "Solar energy thermal processes",
+    eq. 1.10.3 for horizontal surfaces
+    """
+    check_lat(lat)
+
+    dec = declination(date)
+    lat = deg2rad(lat)
+    w_ss = arccos(np.clip((-1) * tan(lat) * tan(dec), -1, 1))
+
+    vnorm = surface_normal_ned(beta, surf_az)
+
+    A, B, C, a, b = _incidence_arcs(vnorm, dec, lat, -w_ss, w_ss)
+    A, B, C = A[..., np.newaxis], B[..., np.newaxis], C[..., np.newaxis]
+    cos_theta_integral = (A * (b - a) + B * (sin(b) - sin(a)) -
+                          C * (cos(b) - cos(a))).sum(axis=-1)
+
+    # dw = 15 degrees per hour
+    return (gon(date) * cos_theta_integral * (12 / np.pi))[()]
+
+
+def monthly_extraterrestrial_irradiation(lat, beta=0, surf_az=0, year=2019):
+    """
+    Returns the monthly mean daily extraterrestrial irradiation (H0) on a
+    surface for a latitude, surface slope and surface azimuth, averaging
+    the daily values of every day of the month.
+
+    Parameters
+    ----------
+    lat : float or array-like
+        latitude (-90 to 90) in degrees
+    beta : float or array-like
+        slope angle of the surface wrt the local horizon
+        in degrees (0 to 180), 0 -> horizontal
+    surf_az : float or array-like
+        azimuth angle of the surface in degrees wrt the local
+        meridian (-180 to 180). 0-> south, east negative
+    year : int
+        year of the days averaged
+
+    Returns
+    -------
+    H0 : array-like
+        (..., 12) extraterrestrial irradiation in Wh/m2, one per month
+    """
+    days = np.arange(np.datetime64('%d-01-01' % year),
+                     np.datetime64('%d-01-01' % (year + 1)))
 
-        theta = arccos(np.dot(vnorm, vsol) / (vnorm_abs * vsol_abs))
+    lat, beta, surf_az = [np.asarray(x)[..., np.newaxis]
+                          for x in (lat, beta, surf_az)]
+    H0 = daily_extraterrestrial_irradiation(days, lat, beta, surf_az)
 
-        # for future solar panel applications: only one side has cells
-        if cos(theta) > 0:
-            G = beam_irradiance(h, date, lat) * cos(theta)
-        else:
-            G = 0
+    months = days.astype('datetime64[M]')
+    first = np.flatnonzero(np.append(True, months[1:] != months[:-1]))
 
-    return G
+    return np.add.reduceat(H0, first, axis=-1) / np.diff(np.append(first,
+                                                                   days.size))
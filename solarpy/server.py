@@ -0,0 +1,315 @@
+# coding: utf-8
+
+"""
+    Local asyncio server for irradiance queries. Concurrent requests are
+    gathered over a small time window and evaluated with a single
+    vectorized call, and the answers are sent back to every client.
+
+    The protocol is JSON lines over TCP. Every request is a JSON object in
+    a line:
+
+        {"id": 1, "date": "2019-06-21T12:30", "lat": 40.4, "h": 650,
+         "vnorm": [0, 0, -1]}
+
+    with the *solar* date and time, latitude in degrees, altitude in meters
+    (optional, 0 by default) and unit normal vector of the plane in NED
+    frame (optional, horizontal plane by default). Every answer is a line:
+
+        {"id": 1, "irradiance": 1003.25}
+
+    or {"id": 1, "error": "..."}. The request {"metrics": true} returns the
+    server metrics. This module is not imported by default:
+
+    $ python -m solarpy.server --port 8765
+"""
+import asyncio
+import json
+import time
+import numpy as np
+from collections import deque
+from .radiation import irradiance_on_plane
+from .utils import check_lat, check_alt
+
+
+class IrradianceServer(object):
+    """
+    Batching server of beam irradiance on a plane (see
+    radiation.irradiance_on_plane)
+
+    Parameters
+    ----------
+    host : str, optional
+        address to listen on, localhost by default
+    port : int, optional
+        port to listen on, any free port by default (see the port attribute
+        once started)
+    window : float, optional
+        time (in seconds) to wait for more requests once the first one of a
+        batch arrives
+    max_batch : int, optional
+        maximum number of requests evaluated at once (in a thread, while
+        the event loop keeps serving the clients)
+    """
+    def __init__(self, host='127.0.0.1', port=0, window=0.002,
+                 max_batch=4096):
+        self.host = host
+        self.port = port
+        self.window = window
+        self.max_batch = max_batch
+
+        self._queue = None
+        self._server = None
+        self._batcher = None
+
+        self._start_time = None
+        self._n_requests = 0
+        self._n_batches = 0
+        self._n_errors = 0
+        self._latencies = deque(maxlen=10000)
+
+    async def start(self):
+        """
+        Starts listening and batching requests
+        """
+        self._queue = asyncio.Queue()
+        self._server = await asyncio.start_server(self._handle, self.host,
+                                                  self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._batcher = asyncio.ensure_future(self._batch_loop())
+        self._start_time = time.perf_counter()
+
+    async def stop(self):
+        """
+        Stops listening and batching requests
+        """
+        self._server.close()
+        await self._server.wait_closed()
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+
+        # the batch being gathered is failed by the batcher, and the
+        # requests still queued here, so that no client waits forever
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            _fail([future], RuntimeError('the server is stopped'))
+
+    async def serve_forever(self):
+        """
+        Starts the server and runs it until cancelled
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    def metrics(self):
+        """
+        Returns the server metrics
+
+        Returns
+        -------
+        metrics : dict
+            number of requests, batches and errors, mean batch size,
+            throughput (requests per second since start) and mean, median
+            and 99th percentile of the latency (in milliseconds) of the
+            last requests
+        """
+        elapsed = time.perf_counter() - self._start_time
+        latency = 1e3 * np.array(self._latencies)
+
+        return {'requests': self._n_requests,
+                'batches': self._n_batches,
+                'errors': self._n_errors,
+                'mean_batch_size': (self._n_requests /
+                                    max(self._n_batches, 1)),
+                'throughput': self._n_requests / elapsed,
+                'latency_mean_ms': latency.mean() if latency.size else 0.,
+                'latency_p50_ms': (np.percentile(latency, 50)
+                                   if latency.size else 0.),
+                'latency_p99_ms': (np.percentile(latency, 99)
+                                   if latency.size else 0.)}
+
+    async def _handle(self, reader, writer):
+        """
+        Reads the requests of a client, one per line, and writes the
+        answers as they are ready (not necessarily in order). Every answer
+        waits for the socket buffer to drain, and no more than max_batch
+        answers are pending, so that a client that reads slowly stops the
+        reading of its requests instead of growing the buffers
+        """
+        pending = set()
+        lock = asyncio.Lock()
+
+        async def send(message):
+            # strict JSON: NaN and Infinity are not valid tokens
+            try:
+                line = json.dumps(message, allow_nan=False)
+            except ValueError:
+                line = json.dumps({'id': None,
+                                   'error': 'non-finite value in the answer'})
+            async with lock:
+                writer.write((line + '\n').encode())
+                await writer.drain()
+
+        async def answer(request_id, future, t0):
+            try:
+                G = await future
+                if not np.isfinite(G):
+                    raise ValueError('non-finite irradiance')
+                message = {'id': request_id, 'irradiance': G}
+            except Exception as e:
+                self._n_errors += 1
+                message = {'id': request_id, 'error': str(e)}
+            self._latencies.append(time.perf_counter() - t0)
+            await send(message)
+
+        try:
+            while True:
+                if len(pending) >= self.max_batch:
+                    await asyncio.wait(pending,
+                                       return_when=asyncio.FIRST_COMPLETED)
+
+                line = await reader.readline()
+                if not line:
+                    break
+                t0 = time.perf_counter()
+                request_id = None
+
+                try:
+                    request = json.loads(line)
+                    request_id = request.get('id')
+                    if request.get('metrics'):
+                        await send(self.metrics())
+                        continue
+                    if self._batcher.done():
+                        raise RuntimeError('the server is stopped')
+                    point = self._parse(request)
+                except Exception as e:
+                    self._n_errors += 1
+                    await send({'id': request_id, 'error': str(e)})
+                    continue
+
+                future = asyncio.get_running_loop().create_future()
+                await self._queue.put((point, future))
+                task = asyncio.ensure_future(answer(request_id, future, t0))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            writer.close()
+
+    def _parse(self, request):
+        """
+        Validates a request, so that a batch never fails because of a
+        single wrong input
+        """
+        date = np.datetime64(request['date'], 'us')
+        lat = float(request['lat'])
+        h = float(request.get('h', 0))
+        vnorm = np.array(request.get('vnorm', (0, 0, -1)), dtype=float)
+
+        if np.isnat(date):
+            raise ValueError('date must not be NaT')
+        if not (np.isfinite(lat) and np.isfinite(h)):
+            raise ValueError('lat and h must be finite')
+        check_lat(lat)
+        check_alt(h)
+        if vnorm.shape != (3,):
+            raise ValueError('vnorm must be a 3 elements vector')
+        norm = np.linalg.norm(vnorm)
+        if not (np.isfinite(norm) and norm > 0):
+            raise ValueError('vnorm must be finite and not null')
+
+        return date, lat, h, vnorm
+
+    async def _batch_loop(self):
+        """
+        Gathers the queued requests during the time window and evaluates
+        them at once
+        """
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.perf_counter() + self.window
+
+            try:
+                while len(batch) < self.max_batch:
+                    timeout = deadline - time.perf_counter()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(
+                            self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                # the vectorized call runs in a thread, so that the event
+                # loop keeps serving the sockets meanwhile
+                points, futures = zip(*batch)
+                G = await asyncio.get_running_loop().run_in_executor(
+                    None, _evaluate, points)
+            except asyncio.CancelledError:
+                _fail([future for _, future in batch],
+                      RuntimeError('the server is stopped'))
+                raise
+            except Exception as e:
+                _fail(futures, e)
+            else:
+                for future, value in zip(futures, G.tolist()):
+                    if not future.done():
+                        future.set_result(value)
+
+            self._n_requests += len(batch)
+            self._n_batches += 1
+
+
+def _evaluate(points):
+    """
+    Evaluates a batch of parsed requests with a single vectorized call. It
+    runs in a thread: the inputs are checked again (in a single reduction)
+    because trusted_inputs, process-wide, would also skip the checks of
+    the requests parsed by the event loop meanwhile
+    """
+    date, lat, h, vnorm = zip(*points)
+
+    return irradiance_on_plane(np.array(vnorm), np.array(h), np.array(date),
+                               np.array(lat))
+
+
+def _fail(futures, e):
+    """
+    Sets the exception of the futures not resolved yet
+    """
+    for future in futures:
+        if not future.done():
+            future.set_exception(e)
+
+
+def main(argv=None):
+    """
+    Runs the server from the command line
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='solarpy irradiance server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--window', type=float, default=0.002,
+                        help='batching window in seconds')
+    parser.add_argument('--max-batch', type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    server = IrradianceServer(args.host, args.port, args.window,
+                              args.max_batch)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+# coding: utf-8
+
+"""
+    Solar site class, that precomputes the constants of a location, and
+    sun table of a site over a time grid
+"""
+import numpy as np
+from numpy import sin, cos, deg2rad
+from .radiation import declination, hour_angle, gon, civil2solar_time,\
+                       _solar_position, _solar_vector_ned, _beam_constants,\
+                       _beam_irradiance, _irradiance_on_plane
+from .utils import check_lat, check_long, check_alt, lla2ecef,\
+                   to_datetime64
+from .horizon import HorizonProfile
+from .diffuse import _clear_sky_dhi, _plane_irradiance
+
+
+class SolarSite(object):
+    """
+    Location on the Earth surface. Everything that only depends on the
+    location (latitude trigonometry, pressure relation, horizon zenith
+    angle and ECEF position) is computed once, so that the methods only
+    evaluate the time-dependent part of the model.
+
+    Parameters
+    ----------
+    lat : float
+        latitude (-90 to 90) in degrees
+    lng : float
+        longitude (-180 to 180) in degrees
+    h : float
+        altitude above sea level in meters
+    horizon : HorizonProfile object, optional
+        horizon profile (terrain and obstructions) of the site, that blocks
+        the sun beam when the sun is below it
+    tz : str or tzinfo object, optional
+        IANA time zone (i.e. 'Europe/Madrid') of the civil times of the
+        site, for solar_time
+    """
+    def __init__(self, lat, lng, h, horizon=None, tz=None):
+        check_lat(lat)
+        check_long(lng)
+        check_alt(h)
+
+        if horizon is not None and not isinstance(horizon, HorizonProfile):
+            raise TypeError('horizon must be a "HorizonProfile" object')
+
+        self.lat = lat
+        self.lng = lng
+        self.h = h
+        self.horizon = horizon
+        if isinstance(tz, str):
+            from zoneinfo import ZoneInfo  # python >= 3.9
+            tz = ZoneInfo(tz)
+        self.tz = tz
+
+        self.sin_lat = sin(deg2rad(lat))
+        self.cos_lat = cos(deg2rad(lat))
+        self.prel, self.theta_lim = _beam_constants(h)
+        self.ecef = lla2ecef(lat, lng, h)
+
+    def solar_time(self, date):
+        """
+        Solar time of the site for civil times of its time zone, or UTC
+        times if it has none (see radiation.civil2solar_time)
+
+        Parameters
+        ----------
+        date : datetime object, array-like of datetime objects or datetime64
+            civil (or UTC) time
+
+        Returns
+        -------
+        solar time : datetime64 or array of datetime64
+            solar time, to be used in the rest of the methods
+        """
+        return civil2solar_time(date, self.lng, self.tz)
+
+    def position(self, date):
+        """
+        Solar position (see radiation.solar_position)
+
+        Parameters
+        ----------
+        date : datetime object, array-like of datetime objects or datetime64
+            date and *solar* time
+
+        Returns
+        -------
+        SolarPosition : namedtuple
+            declination, hour angle, zenith, azimuth, altitude, sunset hour
+            angle and daylight status
+        """
+        return _solar_position(declination(date), hour_angle(date),
+                               self.sin_lat, self.cos_lat)
+
+    def zenith(self, date):
+        """
+        Zenith angle
+
+        Parameters
+        ----------
+        date : datetime object, array-like of datetime objects or datetime64
+            date and *solar* time
+
+        Returns
+        -------
+        theta_z : float or array-like
+            zenith angle of incidence in radians
+        """
+        return self.position(date).zenith
+
+    def solar_vector_ned(self, date):
+        """
+        Solar vector (sun beam) in local geodetic horizon reference frame
+        (NED - North, East, Down)
+
+        Parameters
+        ----------
+        date : datetime object, array-like of datetime objects or datetime64
+            date and *solar* time
+
+        Returns
+        -------
+        array-like
+            vector of the solar beam, (..., 3) for array inputs. Zero at night
+        """
+        return _solar_vector_ned(self.position(date))
+
+    def beam_irradiance(self, date):
+        """
+        Solar beam irradiance on a plane normal to the sun vector
+
+        Parameters
+        ----------
+        date : datetime object, array-like of datetime objects or datetime64
+            date and *solar* time
+
+        Returns
+        -------
+        G : float or array-like
+            beam irradiance in W/m2
+        """
+        return self._beam(self.position(date), gon(date))
+
+    def irradiance_on_plane(self, vnorm, date):
+        """
+        Solar beam irradiance on a plane defined by its unit normal vector
+        in NED frame
+
+        Parameters
+        ----------
+        vnorm : array-like
+            unit vector normal to plane, (3,) or (..., 3)
+        date : datetime object, array-like of datetime objects or datetime64
+            date and *solar* time
+
+        Returns
+        -------
+        G : float or array-like
+            beam irradiance in W/m2
+        """
+        vnorm = np.asarray(vnorm, dtype=float)
+
+        pos = self.position(date)
+        G = self._beam(pos, gon(date))
+
+        return _irradiance_on_plane(vnorm, _solar_vector_ned(pos), G)
+
+    def global_irradiance_on_plane(self, vnorm, date, model='isotropic',
+                                   albedo=0.2):
+        """
+        Global (beam, sky diffuse and ground reflected) clear sky irradiance
+        on a plane defined by its unit normal vector in NED frame, from a
+        single evaluation of the solar geometry (see
+        diffuse.global_irradiance_on_plane)
+
+        Parameters
+        ----------
+        vnorm : array-like
+            unit vector normal to plane, (3,) or (..., 3)
+        date : datetime object, array-like of datetime objects or datetime64
+            date and *solar* time
+        model : str, optional
+            sky diffuse model: 'isotropic', 'haydavies' or 'perez'
+        albedo : float or array-like, optional
+            ground reflectance
+
+        Returns
+        -------
+        PlaneIrradiance : namedtuple
+            total, beam, sky diffuse and ground reflected irradiance on the
+            plane in W/m2
+        """
+        pos = self.position(date)
+        g_on = gon(date)
+        G = self._clear_beam(pos, g_on)
+
+        # the horizon profile only blocks the beam
+        return _plane_irradiance(vnorm, pos, g_on, self._mask(pos, G),
+                                 _clear_sky_dhi(pos, g_on, G), self.h,
+                                 model, albedo)
+
+    def _beam(self, pos, g_on):
+        """
+        Beam irradiance from an already computed solar position and
+        extraterrestrial radiation, null if the sun is behind the horizon
+        profile of the site
+        """
+        return self._mask(pos, self._clear_beam(pos, g_on))
+
+    def _clear_beam(self, pos, g_on):
+        return _beam_irradiance(pos.zenith, g_on, self.h,
+                                self.prel, self.theta_lim)
+
+    def _mask(self, pos, G):
+        if self.horizon is None:
+            return G
+
+        return np.where(self.horizon.visible(pos.azimuth, pos.altitude),
+                        G, 0)[()]
+
+    def sun_table(self, date):
+        """
+        Sun vectors and beam irradiance of the site over a time grid (see
+        SunTable), to evaluate many plane orientations at once
+
+        Parameters
+        ----------
+        date : array-like of datetime objects or datetime64
+            (n_times,) dates and *solar* times
+
+        Returns
+        -------
+        SunTable object
+        """
+        return SunTable(self, date)
+
+
+class SunTable(object):
+    """
+    Solar vectors and beam irradiance of a site over a time grid. As the
+    beam irradiance is not negative, the irradiance on a plane is the
+    positive part of the dot product of its unit normal with the solar
+    vector scaled by the beam irradiance, so that many orientations are
+    evaluated with a single matrix product (n_planes x 3) @ (3 x n_times)
+    followed by a clip.
+
+    Parameters
+    ----------
+    site : SolarSite object
+        location
+    date : array-like of datetime objects or datetime64
+        (n_times,) dates and *solar* times
+    """
+    def __init__(self, site, date):
+        self.date = np.ravel(to_datetime64(date))
+
+        pos = site.position(self.date)
+        self.vsol = _solar_vector_ned(pos)  # (n_times, 3)
+        self.G = site._beam(pos, gon(self.date))  # (n_times,)
+
+        # beam vectors, transposed for the matrix product
+        self.beam = np.ascontiguousarray((self.vsol * self.G[:, None]).T)
+
+        # hours represented by every sample (until the next one)
+        hours = np.diff(self.date) / np.timedelta64(1, 'h')
+        self.dt = np.append(hours, hours[-1:] if hours.size else 1.)
+
+        self._day = np.flatnonzero(self.G > 0)
+
+    def __len__(self):
+        return self.date.size
+
+    def irradiance(self, vnorm, out=None):
+        """
+        Solar beam irradiance on planes
+
+        Parameters
+        ----------
+        vnorm : array-like
+            (3,) or (n_planes, 3) vectors normal to the planes in NED frame
+        out : array-like, optional
+            (n_planes, n_times) array where the result is written
+
+        Returns
+        -------
+        G : array-like
+            (n_times,) or (n_planes, n_times) beam irradiance in W/m2
+        """
+        vnorm = _unit(vnorm)
+
+        G = np.matmul(vnorm, self.beam, out=out)
+        return np.maximum(G, 0, out=G)
+
+    def irradiation(self, vnorm, max_block_size=2**18):
+        """
+        Solar beam irradiation on planes over the whole time grid, every
+        sample lasting until the next one
+
+        Parameters
+        ----------
+        vnorm : array-like
+            (3,) or (n_planes, 3) vectors normal to the planes in NED frame
+        max_block_size : int, optional
+            maximum number of plane-time elements evaluated at once
+
+        Returns
+        -------
+        H : float or array-like
+            (n_planes,) beam irradiation in Wh/m2
+        """
+        scalar = (np.ndim(vnorm) == 1)
+        vnorm = np.atleast_2d(_unit(vnorm))
+
+        # night samples do not contribute
+        beam = self.beam[:, self._day]
+        dt = self.dt[self._day]
+
+        H = np.empty(vnorm.shape[0])
+        step = max(1, max_block_size // max(dt.size, 1))
+        buffer = np.empty((min(step, vnorm.shape[0]), dt.size))
+        for i in range(0, vnorm.shape[0], step):
+            j = slice(i, i + step)
+            G = np.matmul(vnorm[j], beam, out=buffer[:len(H[j])])
+            H[j] = np.maximum(G, 0, out=G) @ dt
+
+        return H[0] if scalar else H
+
+
+def _unit(vnorm):
+    """
+    Unit vectors from (..., 3) normal vectors
+    """
+    vnorm = np.asarray(vnorm, dtype=float)
+    return vnorm / np.linalg.norm(vnorm, axis=-1, keepdims=True)
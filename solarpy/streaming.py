@@ -0,0 +1,146 @@
+# coding: utf-8
+
+"""
+    Streaming (generator) interface, for real-time estimation of the
+    irradiance and power over a continuous flow of timestamps
+"""
+import time
+import numpy as np
+from datetime import datetime
+from .pvpanel import PanelFleet
+from .radiation import declination, hour_angle, gon, _solar_position,\
+                       _solar_vector_ned, _irradiance_on_plane
+from .site import SolarSite
+from .utils import to_datetime64
+
+
+def _chunks(dates, chunk_size, max_delay=None):
+    """
+    Groups a flow of timestamps into datetime64 arrays: arrays (or lists)
+    of timestamps are passed through as they come, while single timestamps
+    are buffered until chunk_size of them are gathered, the first of them
+    has waited max_delay seconds, a None item (nothing ready in the source)
+    or an array arrives, or the flow ends
+    """
+    buffer = []
+    for date in dates:
+        if isinstance(date, (datetime, np.datetime64)):
+            if not buffer:
+                t0 = time.monotonic()
+            buffer.append(date)
+            if len(buffer) >= chunk_size or (
+                    max_delay is not None and
+                    time.monotonic() - t0 >= max_delay):
+                yield to_datetime64(buffer)
+                buffer = []
+        else:
+            if buffer:
+                yield to_datetime64(buffer)
+                buffer = []
+            if date is not None:
+                yield np.ravel(to_datetime64(date))
+
+    if buffer:
+        yield to_datetime64(buffer)
+
+
+def irradiance_stream(site, vnorm, dates, chunk_size=1024, max_delay=None):
+    """
+    Generator of the solar beam irradiance on a plane at a site, for a flow
+    of timestamps. The site constants are computed once and the declination
+    and extraterrestrial radiation, that only depend on the day, are kept
+    while the chunks belong to the same day, so that every chunk only costs
+    a single vectorized evaluation of the time-dependent terms.
+
+    Single timestamps are buffered: larger chunks are cheaper per timestamp
+    but wait longer. For real-time feeds, max_delay bounds the time the
+    first buffered timestamp waits for the next ones, and the source can
+    yield None when it has nothing ready to flush the buffer at once.
+
+    Note: it does not take into account the diffuse irradiance
+
+    Parameters
+    ----------
+    site : SolarSite object
+        location of the plane
+    vnorm : array-like
+        unit vector normal to plane in NED frame, (3,)
+    dates : iterable
+        datetime objects, datetime64 or arrays of them (*solar* time), or
+        None to flush the buffered timestamps
+    chunk_size : int, optional
+        number of single timestamps gathered before evaluating them
+    max_delay : float, optional
+        maximum time (in seconds) a buffered timestamp waits for the next
+        ones, checked when they arrive. No limit by default
+
+    Yields
+    ------
+    date : array-like
+        datetime64 timestamps of the chunk
+    G : array-like
+        beam irradiance in W/m2 for every timestamp of the chunk
+
+    Example
+    -------
+    >>> site = SolarSite(40.4, -3.7, 650)
+    >>> for date, G in irradiance_stream(site, [0, 0, -1], messages):
+    ...     publish(date, G)
+    """
+    vnorm = np.asarray(vnorm, dtype=float)
+    day = None
+
+    for date in _chunks(dates, chunk_size, max_delay):
+        days = date.astype('datetime64[D]')
+
+        if days.size and (days == days[0]).all():
+            if days[0] != day:
+                day = days[0]
+                dec, g_on = declination(day), gon(day)
+            pos = _solar_position(dec, hour_angle(date),
+                                  site.sin_lat, site.cos_lat)
+            G = site._beam(pos, g_on)
+        else:
+            pos = _solar_position(declination(date), hour_angle(date),
+                                  site.sin_lat, site.cos_lat)
+            G = site._beam(pos, gon(date))
+
+        yield date, _irradiance_on_plane(vnorm, _solar_vector_ned(pos), G)
+
+
+def power_stream(panel, dates, chunk_size=1024, max_delay=None):
+    """
+    Generator of the output power of a solar panel (or of every panel of a
+    fleet) for a flow of timestamps (see irradiance_stream)
+
+    Parameters
+    ----------
+    panel : solar_panel or PanelFleet object
+        panel with position and orientation already set, or fleet
+    dates : iterable
+        datetime objects, datetime64 or arrays of them (*solar* time), or
+        None to flush the buffered timestamps
+    chunk_size : int, optional
+        number of single timestamps gathered before evaluating them
+    max_delay : float, optional
+        maximum time (in seconds) a buffered timestamp waits for the next
+        ones, checked when they arrive. No limit by default
+
+    Yields
+    ------
+    date : array-like
+        datetime64 timestamps of the chunk
+    P : array-like
+        output power in W, (n_times,) for a panel or (n_panels, n_times)
+        for a fleet
+    """
+    if isinstance(panel, PanelFleet):
+        for date in _chunks(dates, chunk_size, max_delay):
+            yield date, panel.power(date)
+    else:
+        site = SolarSite(panel.lat, panel.lng, panel.h)
+        factor = panel.s * panel.eff
+
+        for date, G in irradiance_stream(site, panel.vnorm, dates,
+                                         chunk_size, max_delay):
+            yield date, G * factor
@@ -0,0 +1,183 @@
+# coding: utf-8
+
+"""
+    Sun-tracking panels: orientation of single-axis (horizontal or tilted,
+    with rotation limits and backtracking) and dual-axis trackers for whole
+    time series of solar vectors
+"""
+import numpy as np
+from abc import ABC, abstractmethod
+from numpy import sin, cos, deg2rad
+from .radiation import gon, surface_normal_ned, _solar_vector_ned,\
+                       _irradiance_on_plane
+
+
+class _Tracker(ABC):
+    """
+    Tracker base class: subclasses define the normal vector of the panel
+    for an array of solar vectors
+    """
+    @abstractmethod
+    def normal(self, vsol):
+        pass
+
+    def irradiance(self, site, date):
+        """
+        Solar beam irradiance on the tracking panel
+
+        Note: it does not take into account the diffuse irradiance
+
+        Parameters
+        ----------
+        site : SolarSite object
+            location of the tracker
+        date : datetime object, array-like of datetime objects or datetime64
+            date and *solar* time
+
+        Returns
+        -------
+        G : float or array-like
+            beam irradiance in W/m2
+        """
+        pos = site.position(date)
+        vsol = _solar_vector_ned(pos)
+        G = site._beam(pos, gon(date))
+
+        return _irradiance_on_plane(self.normal(vsol), vsol, G)
+
+
+class SingleAxisTracker(_Tracker):
+    """
+    Single-axis tracker, that rotates the panel about an axis (horizontal
+    or tilted) to minimize the angle of incidence of the sun beam
+
+    Parameters
+    ----------
+    axis_tilt : float, optional
+        slope of the axis wrt the local horizon in degrees (0 to 90), the
+        end pointing to axis_azimuth being the lowest one
+    axis_azimuth : float, optional
+        azimuth of the (lowest end of the) axis in degrees wrt the local
+        meridian (-180 to 180). 0-> south, east negative. North-south
+        horizontal axis by default
+    max_angle : float, optional
+        maximum rotation angle in degrees (0 to 180)
+    backtrack : bool, optional
+        rotates the panels back (when the sun is low) so that the rows do
+        not shade each other
+    gcr : float, optional
+        ground coverage ratio (panel width / distance between rows), needed
+        for backtracking
+
+    Notes
+    -----
+    The rotation angle is 0 when the panel is normal to the plane that
+    contains the axis and the vertical, and positive towards the West.
+    Backtracking follows Lorenzo, E., Narvarte, L., Muñoz, J., (2011)
+    "Tracking and back-tracking", Prog. Photovolt: Res. Appl. 19:747-753,
+    exact for horizontal axes on flat ground.
+    """
+    def __init__(self, axis_tilt=0, axis_azimuth=0, max_angle=90,
+                 backtrack=False, gcr=None):
+        if not 0 <= axis_tilt <= 90:
+            raise ValueError('axis tilt should be 0 <= axis_tilt <= 90')
+
+        if not 0 <= max_angle <= 180:
+            raise ValueError('max angle should be 0 <= max_angle <= 180')
+
+        if backtrack and (gcr is None or not 0 < gcr <= 1):
+            raise ValueError('backtracking needs a 0 < gcr <= 1')
+
+        self.axis_tilt = axis_tilt
+        self.axis_azimuth = axis_azimuth
+        self.max_angle = max_angle
+        self.backtrack = backtrack
+        self.gcr = gcr
+
+        # axis, normal at 0 rotation and normal at 90º rotation (NED)
+        tilt, az = deg2rad(axis_tilt), deg2rad(axis_azimuth)
+        self.axis = np.array([-cos(az) * cos(tilt), -sin(az) * cos(tilt),
+                              sin(tilt)])
+        self.n0 = surface_normal_ned(axis_tilt, axis_azimuth)
+        self.n90 = np.cross(self.axis, self.n0)
+
+    def rotation(self, vsol):
+        """
+        Rotation angle of the tracker
+
+        Parameters
+        ----------
+        vsol : array-like
+            (..., 3) solar vectors in NED frame (null at night)
+
+        Returns
+        -------
+        R : float or array-like
+            rotation angle in radians, 0 at night
+        """
+        vsol = np.asarray(vsol, dtype=float)
+
+        # ideal rotation: sun vector projected on the rotation plane
+        R = np.arctan2(vsol @ self.n90, vsol @ self.n0)
+
+        if self.backtrack:
+            tmp = cos(R) / self.gcr
+            shade = tmp < 1
+            R = np.where(shade,
+                         R - np.sign(R) * np.arccos(np.minimum(tmp, 1)), R)
+
+        R_max = deg2rad(self.max_angle)
+        return np.clip(R, -R_max, R_max)[()]
+
+    def normal(self, vsol):
+        """
+        Unit vector normal to the panel
+
+        Parameters
+        ----------
+        vsol : array-like
+            (..., 3) solar vectors in NED frame (null at night)
+
+        Returns
+        -------
+        vnorm : array-like
+            (..., 3) normal vectors in NED frame
+        """
+        R = np.asarray(self.rotation(vsol))[..., np.newaxis]
+
+        return self.n0 * cos(R) + self.n90 * sin(R)
+
+
+class DualAxisTracker(_Tracker):
+    """
+    Dual-axis tracker, whose panel is always normal to the sun beam
+
+    Parameters
+    ----------
+    stow : array-like, optional
+        normal vector of the panel in NED frame at night, horizontal by
+        default
+    """
+    def __init__(self, stow=(0, 0, -1)):
+        stow = np.asarray(stow, dtype=float)
+        self.stow = stow / np.linalg.norm(stow)
+
+    def normal(self, vsol):
+        """
+        Unit vector normal to the panel
+
+        Parameters
+        ----------
+        vsol : array-like
+            (..., 3) solar vectors in NED frame (null at night)
+
+        Returns
+        -------
+        vnorm : array-like
+            (..., 3) normal vectors in NED frame
+        """
+        vsol = np.asarray(vsol, dtype=float)
+        norm = np.linalg.norm(vsol, axis=-1)[..., np.newaxis]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(norm > 0, vsol / norm, self.stow)
@@ -0,0 +1,169 @@
+# coding: utf-8
+
+"""
+    Solar irradiance along the trajectory of a vehicle (i.e. UAV, balloon)
+    with attitude: panels are defined in the body frame and rotated with
+    the vehicle
+"""
+import numpy as np
+from numpy import sin, cos, deg2rad
+from .radiation import gon, solar_position_utc, _solar_vector_ned,\
+                       _beam_constants, _beam_irradiance
+from .utils import check_alt
+
+
+def euler2dcm(yaw, pitch, roll):
+    """
+    Direction cosine matrices from the body frame to the NED frame, for
+    Euler angles in the aerospace (yaw-pitch-roll, z-y-x) sequence
+
+    Parameters
+    ----------
+    yaw : float or array-like
+        heading of the body x axis in degrees wrt the North, east positive
+    pitch : float or array-like
+        elevation of the body x axis over the horizontal plane in degrees
+    roll : float or array-like
+        rotation about the body x axis in degrees, right wing down positive
+
+    Returns
+    -------
+    Lbn : array-like
+        (..., 3, 3) rotation matrices, v_ned = Lbn @ v_body
+    """
+    psi, theta, phi = deg2rad(yaw), deg2rad(pitch), deg2rad(roll)
+    s_psi, c_psi = sin(psi), cos(psi)
+    s_theta, c_theta = sin(theta), cos(theta)
+    s_phi, c_phi = sin(phi), cos(phi)
+
+    Lbn = np.empty(np.broadcast(psi, theta, phi).shape + (3, 3))
+    Lbn[..., 0, 0] = c_theta * c_psi
+    Lbn[..., 0, 1] = s_phi * s_theta * c_psi - c_phi * s_psi
+    Lbn[..., 0, 2] = c_phi * s_theta * c_psi + s_phi * s_psi
+    Lbn[..., 1, 0] = c_theta * s_psi
+    Lbn[..., 1, 1] = s_phi * s_theta * s_psi + c_phi * c_psi
+    Lbn[..., 1, 2] = c_phi * s_theta * s_psi - s_phi * c_psi
+    Lbn[..., 2, 0] = -s_theta
+    Lbn[..., 2, 1] = s_phi * c_theta
+    Lbn[..., 2, 2] = c_phi * c_theta
+
+    return Lbn
+
+
+def quat2dcm(q):
+    """
+    Direction cosine matrices from the body frame to the NED frame, for
+    attitude quaternions
+
+    Parameters
+    ----------
+    q : array-like
+        (4,) or (..., 4) quaternions (scalar first) of the rotation from
+        the NED frame to the body frame. They are normalized
+
+    Returns
+    -------
+    Lbn : array-like
+        (..., 3, 3) rotation matrices, v_ned = Lbn @ v_body
+    """
+    q = np.asarray(q, dtype=float)
+    q = q / np.linalg.norm(q, axis=-1, keepdims=True)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+    Lbn = np.empty(q.shape[:-1] + (3, 3))
+    Lbn[..., 0, 0] = 1 - 2 * (y * y + z * z)
+    Lbn[..., 0, 1] = 2 * (x * y - w * z)
+    Lbn[..., 0, 2] = 2 * (x * z + w * y)
+    Lbn[..., 1, 0] = 2 * (x * y + w * z)
+    Lbn[..., 1, 1] = 1 - 2 * (x * x + z * z)
+    Lbn[..., 1, 2] = 2 * (y * z - w * x)
+    Lbn[..., 2, 0] = 2 * (x * z - w * y)
+    Lbn[..., 2, 1] = 2 * (y * z + w * x)
+    Lbn[..., 2, 2] = 1 - 2 * (x * x + y * y)
+
+    return Lbn
+
+
+def body2ned(v_body, Lbn):
+    """
+    Converts vectors from the body frame to the NED frame
+
+    Parameters
+    ----------
+    v_body : array-like
+        vectors expressed in the body frame, (3,) or (..., 3)
+    Lbn : array-like
+        (..., 3, 3) rotation matrices (see euler2dcm and quat2dcm)
+
+    Returns
+    -------
+    v_ned : array-like
+        vectors expressed in the NED frame, (..., 3)
+    """
+    return np.einsum('...ij,...j->...i', Lbn, v_body)
+
+
+def trajectory_irradiance(vnorm, date, lat, lng, h, euler=None,
+                          quaternion=None, model=None):
+    """
+    Solar beam irradiance on panels fixed to a vehicle along its trajectory.
+    The solar vector of every sample is rotated once into the body frame,
+    so that all the panels are evaluated with a single matrix product: the
+    cost does not grow with the rotation of every panel normal.
+
+    Note: it does not take into account the diffuse irradiance
+
+    Parameters
+    ----------
+    vnorm : array-like
+        unit vectors normal to the panels in the body frame, (3,) or
+        (n_panels, 3)
+    date : array-like of datetime objects or datetime64
+        *UTC* dates and times of the samples, (...) i.e. (n_times,) or
+        (n_runs, n_times) for Monte Carlo simulations
+    lat : float or array-like
+        latitude (-90 to 90) in degrees, broadcastable with date
+    lng : float or array-like
+        longitude (-180 to 180) in degrees, *east-positive*
+    h : float or array-like
+        altitude above sea level in meters
+    euler : array-like, optional
+        (..., 3) yaw, pitch and roll in degrees (see euler2dcm)
+    quaternion : array-like, optional
+        (..., 4) attitude quaternions, scalar first (see quat2dcm)
+    model : str, optional
+        solar position model, 'spencer' or 'psa' (see solar_position_utc)
+
+    Returns
+    -------
+    G : array-like
+        beam irradiance in W/m2, (...) or (n_panels, ...)
+
+    Example
+    -------
+    >>> wing = [[0, 0, -1], [0, 0.2, -0.98], [0, -0.2, -0.98]]
+    >>> G = trajectory_irradiance(wing, dates, lat, lng, h,
+    ...                           euler=np.stack([yaw, pitch, roll], -1))
+    """
+    if (euler is None) == (quaternion is None):
+        raise ValueError('the attitude needs either euler or quaternion')
+
+    if euler is None:
+        Lbn = quat2dcm(quaternion)
+    else:
+        euler = np.asarray(euler, dtype=float)
+        Lbn = euler2dcm(euler[..., 0], euler[..., 1], euler[..., 2])
+
+    check_alt(h)
+    vnorm = np.asarray(vnorm, dtype=float)
+    vnorm = vnorm / np.linalg.norm(vnorm, axis=-1, keepdims=True)
+
+    pos = solar_position_utc(date, lat, lng, model)
+    G = _beam_irradiance(pos.zenith, gon(date), h, *_beam_constants(h))
+
+    # beam vector in the body frame: Lbn transposed
+    beam = np.einsum('...ji,...j->...i', Lbn, _solar_vector_ned(pos)) * \
+        np.asarray(G)[..., np.newaxis]
+
+    G = np.tensordot(vnorm, beam, axes=([-1], [-1]))
+    return np.maximum(G, 0, out=G)[()]
@@ -6,8 +6,71 @@
 """
 
 import numpy as np
-from numpy import sin, cos, deg2rad, array
+from numpy import sin, cos, deg2rad
 from datetime import datetime
+from contextlib import contextmanager
+from .atmosphere import standard_atmosphere
+
+
+_trusted_inputs = False
+
+
+@contextmanager
+def trusted_inputs():
+    """
+    Context manager that skips the validation of latitudes, longitudes and
+    altitudes (check_lat, check_long and check_alt) within its block, for
+    bulk jobs whose inputs have already been checked once. The switch is
+    process-wide: it affects every thread while the block runs.
+
+    Example
+    -------
+    >>> check_lat(lats)  # a single vectorized check
+    >>> with trusted_inputs():
+    ...     for date in dates:
+    ...         irradiance_on_plane(vnorm, h, date, lats)
+    """
+    global _trusted_inputs
+
+    previous = _trusted_inputs
+    _trusted_inputs = True
+    try:
+        yield
+    finally:
+        _trusted_inputs = previous
+
+
+def _check_range(x, x_min, x_max, range_msg, type_msg):
+    """
+    Checks whether a number, or every element of a numeric array, list or
+    tuple, is within [x_min, x_max] (in a single reduction), reporting the
+    indices of the offending elements of arrays
+    """
+    if _trusted_inputs:
+        return None
+
+    real = (np.integer, np.floating)
+
+    if isinstance(x, (list, tuple)):
+        try:
+            x = np.asarray(x)
+        except ValueError:  # ragged sequences
+            raise TypeError(type_msg)
+
+    if isinstance(x, (int, float) + real):
+        if (x < x_min) or (x > x_max):
+            raise ValueError(range_msg)
+    elif isinstance(x, np.ndarray) and issubclass(x.dtype.type, real):
+        if x.size and ((x.min() < x_min) or (x.max() > x_max)):
+            wrong = np.argwhere((x < x_min) | (x > x_max))
+            wrong = [tuple(i) if len(i) > 1 else i[0] for i in wrong.tolist()]
+            raise ValueError('%s (offending indices: %s%s)' %
+                             (range_msg, wrong[:10],
+                              '...' if len(wrong) > 10 else ''))
+    else:
+        raise TypeError(type_msg)
+
+    return None
 
 
 def check_lat(lat):
@@ -16,20 +79,16 @@ def check_lat(lat):
 
     Parameters
     ----------
-    lat : float or int
+    lat : float, int or array-like
         latitude (-90 to 90) in degrees
 
     Returns
     -------
     None. Raises an exception in case
     """
-    if isinstance(lat, (int, float)):
-        if abs(lat) > 90:
-            raise ValueError('latitude should be -90 <= latitude <= 90')
-    else:
-        raise TypeError('latitude should be "float" or "int"')
-
-    return None
+    return _check_range(lat, -90, 90,
+                        'latitude should be -90 <= latitude <= 90',
+                        'latitude should be "float" or "int"')
 
 
 def check_long(lng):
@@ -38,20 +97,16 @@ def check_long(lng):
 
     Parameters
     ----------
-    lng : float or int
+    lng : float, int or array-like
         longitude (-179 to 180) in degrees
 
     Returns
     -------
     None. Raises an exception in case
     """
-    if isinstance(lng, (int, float)):
-        if abs(lng) > 180:
-            raise ValueError('longitude should be -180 <= longitude <= 180')
-    else:
-        raise TypeError('longitude should be "float" or "int"')
-
-    return None
+    return _check_range(lng, -180, 180,
+                        'longitude should be -180 <= longitude <= 180',
+                        'longitude should be "float" or "int"')
 
 
 def check_alt(h):
@@ -60,20 +115,47 @@ def check_alt(h):
 
     Parameters
     ----------
-    h : float or int
-        altitude (0 to 24k) in meters
+    h : float, int or array-like
+        altitude (0 to 86k) in meters
 
     Returns
     -------
     None. Raises an exception in case
     """
-    if isinstance(h, (int, float)):
-        if ((h < 0) or (h > 24000)):
-            raise ValueError('pressure model is only valid if 0 <= h <= 24000')
-    else:
-        raise TypeError('altitude should be "float" or "int"')
+    return _check_range(h, 0, 86000,
+                        'pressure model is only valid if 0 <= h <= 86000',
+                        'altitude should be "float" or "int"')
 
-    return None
+
+def to_datetime64(date):
+    """
+    Converts a datetime object, a sequence of datetime objects or a numpy
+    datetime64 array into a numpy datetime64 array
+
+    Parameters
+    ----------
+    date : datetime object, array-like of datetime objects or datetime64
+        date(s) of interest
+
+    Returns
+    -------
+    date : datetime64 or array of datetime64
+        date(s) of interest as numpy datetime64
+    """
+    if isinstance(date, datetime):
+        return np.datetime64(date, 'us')
+    elif isinstance(date, np.datetime64):
+        return date
+    elif isinstance(date, np.ndarray) and \
+            np.issubdtype(date.dtype, np.datetime64):
+        return date
+    elif isinstance(date, (list, tuple, np.ndarray)) and \
+            all(isinstance(d, (datetime, np.datetime64))
+                for d in np.ravel(np.asarray(date, dtype=object))):
+        return np.array(date, dtype='datetime64[us]')
+    else:
+        msg = "date must be a datetime object or array of datetime objects"
+        raise TypeError(msg)
 
 
 def day_of_the_year(date):
@@ -82,19 +164,19 @@ def day_of_the_year(date):
 
     Parameters
     ----------
-    date : datetime object
-        date of interest
+    date : datetime object, array-like of datetime objects or datetime64
+        date(s) of interest
 
     Returns
     -------
-    day : int
+    day : int or array of int
         day of the year (1 to 365)
     """
     if isinstance(date, datetime):
         return date.timetuple().tm_yday
     else:
-        msg = "date must be a datetime object or array of datetime objects"
-        raise TypeError(msg)
+        days = to_datetime64(date).astype('datetime64[D]')
+        return (days - days.astype('datetime64[Y]')).astype(int) + 1
 
 
 class NoSunsetNoSunrise(Exception):
@@ -105,24 +187,26 @@ class NoSunsetNoSunrise(Exception):
         self.msg = "Permanent night (or day) on this latitude on this day"
 
 
-def lla2ecef(lat, lng, h):
+def lla2ecef(lat, lng, h, out=None):
     """
     Calculates geocentric coordinates (ECEF - Earth Centered, Earth Fixed) for
     a given set of latitude, longitude and altitude inputs.
 
     Parameters
     ----------
-    lat : float
+    lat : float or array-like
         latitude in degrees
-    lng : float
+    lng : float or array-like
         longitude in degrees
-    h : float
+    h : float or array-like
         geometric altitude above sea level in meters
+    out : array-like, optional
+        (..., 3) array where the result is written, to avoid allocating it
 
     Returns
     -------
     array-like
-        ECEF coordinates in meters
+        ECEF coordinates in meters, (3,) or (..., 3) for array inputs
     """
     check_lat(lat)
     check_long(lng)
@@ -132,19 +216,38 @@ def lla2ecef(lat, lng, h):
     b = 6356752.3142  # [m] Earth polar axis
     e = 0.081819190842622  # Earth eccentricity
 
-    lat = deg2rad(lat)  # degrees to radians
-    lng = deg2rad(lng)  # degrees to radians
+    if out is None:
+        out = np.empty(np.broadcast(lat, lng, h).shape + (3,))
+    x, y, z = out[..., 0], out[..., 1], out[..., 2]
+
+    # the trigonometric terms are computed once, the latitude ones first
+    # and then the longitude ones, and the rest is written in place into
+    # the output components
+    sin_lat, cos_lat = sin(deg2rad(lat)), cos(deg2rad(lat))
+
+    # radius of curvature in the prime vertical, in x
+    np.multiply(e, sin_lat, out=x)
+    x *= x
+    np.subtract(1, x, out=x)
+    np.sqrt(x, out=x)
+    np.divide(a, x, out=x)
 
-    N = a / (1 - (e * sin(lat))**2)**(.5)
+    np.multiply((b/a)**2, x, out=z)
+    z += h
+    z *= sin_lat
 
-    x = (N + h) * cos(lat) * cos(lng)
-    y = (N + h) * cos(lat) * sin(lng)
-    z = (((b/a)**2) * N + h) * sin(lat)
+    x += h
+    x *= cos_lat
+    del sin_lat, cos_lat
 
-    return array([x, y, z])
+    lng = deg2rad(lng)
+    np.multiply(x, sin(lng), out=y)
+    x *= cos(lng)
+
+    return out
 
 
-def ned2ecef(v_ned, lat, lng):
+def ned2ecef(v_ned, lat, lng, out=None):
     """
     Converts vector from local geodetic horizon reference frame (NED - North,
     East, Down) at a given latitude and longitude to geocentric coordinates
@@ -153,62 +256,78 @@ def ned2ecef(v_ned, lat, lng):
     Parameters
     ----------
     v_ned: array-like
-        vector expressed in NED coordinates
-    lat : float
+        vector expressed in NED coordinates, (3,) or (..., 3)
+    lat : float or array-like
         latitude in degrees
-    lng : float
+    lng : float or array-like
         longitude in degrees
+    out : array-like, optional
+        (..., 3) array where the result is written, to avoid allocating it
 
     Returns
     -------
     v_ecef : array-like
-        vector expressed in ECEF coordinates
+        vector expressed in ECEF coordinates, (3,) or (..., 3)
     """
     check_lat(lat)
     check_long(lng)
 
-    lat = deg2rad(lat)
-    lng = deg2rad(lng)
+    v_ned = np.asarray(v_ned, dtype=float)
+    n, e, d = v_ned[..., 0], v_ned[..., 1], v_ned[..., 2]
 
-    Lne = array([[-sin(lat) * cos(lng), -sin(lat) * sin(lng), cos(lat)],
-                 [-sin(lng), cos(lng), 0],
-                 [-cos(lat) * cos(lng), -cos(lat) * sin(lng), -sin(lat)]])
+    if out is None:
+        out = np.empty(np.broadcast(n, lat, lng).shape + (3,))
+    x, y, z = out[..., 0], out[..., 1], out[..., 2]
 
-    Len = Lne.transpose()
-    v_ecef = Len.dot(v_ned)
+    # v_ecef = Len v_ned, component by component (no stack of rotation
+    # matrices): the north and down components give the axial one (z) and
+    # the equatorial one (in x), that is rotated with east by the longitude
+    sin_lat, cos_lat = sin(deg2rad(lat)), cos(deg2rad(lat))
 
-    return v_ecef
+    np.multiply(sin_lat, n, out=x)
+    np.multiply(cos_lat, d, out=y)
+    x += y
+    np.negative(x, out=x)
+
+    np.multiply(cos_lat, n, out=z)
+    np.multiply(sin_lat, d, out=y)
+    z -= y
+    del sin_lat, cos_lat
+
+    sin_lng, cos_lng = sin(deg2rad(lng)), cos(deg2rad(lng))
+
+    equatorial_y = sin_lng * x
+    x *= cos_lng
+    np.multiply(sin_lng, e, out=y)
+    x -= y
+    np.multiply(cos_lng, e, out=y)
+    y += equatorial_y
+
+    return out
 
 
 def pressure(h):
     """
-    Interim function that returns ISA standard day pressure at a desired
-    altitud. A new release of https://github.com/AeroPython/scikit-aero
-    that includes the COESA atmospheric model (which would allow its
-    installation with pip) will substitute this function.
+    Returns U.S. Standard Atmosphere 1976 pressure at a desired altitude,
+    interpolated on the table of the module-level atmosphere object (see
+    atmosphere.Atmosphere), that is built only once.
 
     Parameters
     ----------
-    h : float
+    h : float or array-like
         altitude above sea level in meters
 
     Returns
     -------
-    p : float
+    p : float or array-like
         pressure in Pa
 
     Notes
     -----
     http://www.pdas.com/atmosTable2SI.html until 20km
     http://www.pdas.com/atmosTable1SI.html until 24km
+    U.S. Standard Atmosphere, 1976, NOAA-S/T 76-1562 until 86km
     """
     check_alt(h)
 
-    alt_ = np.append(np.linspace(0, 20e3, 21),
-                     np.linspace(22e3, 24e3, 2))
-
-    p_ = array([101325, 89876, 79501, 70121, 61660, 54048, 47217, 41105,
-                35651, 30800, 26499, 22699, 19399, 16579, 14170, 12111,
-                10352, 8849, 7565, 6467, 5529, 4047, 2972])
-
-    return np.interp(h, alt_, p_)
+    return standard_atmosphere.pressure(h)
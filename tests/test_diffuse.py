@@ -0,0 +1,154 @@
+# coding: utf-8
+
+"""
+    Tests of the diffuse and ground reflected irradiance
+"""
+
+
+from solarpy import *
+import numpy as np
+from numpy import array, deg2rad, cos, sin
+from numpy.testing import assert_equal, assert_allclose
+from datetime import datetime
+import unittest as ut
+
+
+class Test_diffuse_models(ut.TestCase):
+    """
+    Tests the sky diffuse and ground reflected irradiance models
+    """
+    def test_isotropic(self):
+        self.assertAlmostEqual(sky_diffuse_isotropic(100, 0), 100)
+        self.assertAlmostEqual(sky_diffuse_isotropic(100, 90), 50)
+        self.assertAlmostEqual(sky_diffuse_isotropic(100, 180), 0)
+
+        self.assertAlmostEqual(ground_reflected(1000, 0), 0)
+        self.assertAlmostEqual(ground_reflected(1000, 90, 0.3), 150)
+
+    def test_haydavies(self):
+        # Duffie and Beckman eq. 2.16.4, by hand
+        dhi, dni, g_on = 100., 800., 1400.
+        theta, theta_z, beta = deg2rad(20), deg2rad(40), 30
+        A_i = dni / g_on
+        expected = dhi * (A_i * cos(theta) / cos(theta_z) +
+                          (1 - A_i) * (1 + cos(deg2rad(beta))) / 2)
+
+        self.assertAlmostEqual(sky_diffuse_haydavies(dhi, dni, g_on, theta,
+                                                     theta_z, beta), expected)
+
+        # isotropic without beam
+        self.assertAlmostEqual(sky_diffuse_haydavies(dhi, 0, g_on, theta,
+                                                     theta_z, beta),
+                               sky_diffuse_isotropic(dhi, beta))
+
+    def test_perez(self):
+        theta_z = deg2rad(np.linspace(0, 84, 15))
+
+        # horizontal plane: no circumsolar nor horizon brightening
+        assert_allclose(sky_diffuse_perez(100, 700, 1367, theta_z, theta_z,
+                                          0), 100)
+
+        # no diffuse
+        assert_equal(sky_diffuse_perez(0, 700, 1367, theta_z, theta_z, 30),
+                     0)
+
+        # circumsolar: facing the sun gets more than facing away
+        facing = sky_diffuse_perez(100, 700, 1367, 0, deg2rad(60), 60)
+        away = sky_diffuse_perez(100, 700, 1367, deg2rad(120), deg2rad(60),
+                                 60)
+        self.assertGreater(facing, away)
+
+    def test_perez_bins(self):
+        # clearness on a bin edge (1.065) belongs to the upper bin
+        dhi, dni, g_on, theta, beta = 1000., 65., 1367., deg2rad(30), 60
+        F11, F12, F13, F21, F22, F23 = (0.1299457, 0.6825954, -0.1513752,
+                                        -0.0189325, 0.065965, -0.0288748)
+        delta = dhi * air_mass_kastenyoung1989(0, 0) / g_on
+        F1, F2 = max(F11 + F12 * delta, 0), F21 + F22 * delta
+        expected = dhi * ((1 - F1) * (1 + cos(deg2rad(beta))) / 2 +
+                          F1 * cos(theta) + F2 * sin(deg2rad(beta)))
+
+        self.assertAlmostEqual(sky_diffuse_perez(dhi, dni, g_on, theta, 0,
+                                                 beta), expected)
+
+    def test_liujordan(self):
+        self.assertAlmostEqual(clear_sky_diffuse_liujordan(0, 1367, 0),
+                               0.271 * 1367)
+        self.assertAlmostEqual(clear_sky_diffuse_liujordan(
+            800, 1367, deg2rad(95)), 0)
+
+
+class Test_global_irradiance_on_plane(ut.TestCase):
+    """
+    Tests the global irradiance on a plane from a single geometry pass
+    """
+    def setUp(self):
+        self.dates = np.arange('2019-01-01', '2020-01-01', 97,
+                               dtype='datetime64[m]')
+        self.site = SolarSite(40.4, -3.7, 650)
+
+    def test_components(self):
+        vnorm = surface_normal_ned(35, 20)
+
+        for model in ('isotropic', 'haydavies', 'perez'):
+            I = global_irradiance_on_plane(vnorm, 650, self.dates, 40.4,
+                                           model=model)
+
+            assert_allclose(I.beam, irradiance_on_plane(vnorm, 650,
+                                                        self.dates, 40.4))
+            assert_allclose(I.total, I.beam + I.sky_diffuse + I.ground)
+            self.assertTrue((I.sky_diffuse >= 0).all())
+            self.assertTrue((I.total >= I.beam).all())
+
+        # horizontal plane: global horizontal irradiance for every model
+        # (except near the horizon, where the beam ratio is bounded)
+        G = global_irradiance_on_plane([0, 0, -1], 650, self.dates, 40.4)
+        high = theta_z(self.dates, 40.4) < deg2rad(85)
+        for model in ('haydavies', 'perez'):
+            I = global_irradiance_on_plane([0, 0, -1], 650, self.dates,
+                                           40.4, model=model)
+            assert_allclose(I.total[high], G.total[high], atol=1e-9)
+
+    def test_vectorized(self):
+        beta = array([0, 30, 60, 90, 120])
+        vnorm = surface_normal_ned(beta, 0)[:, np.newaxis]
+
+        I = global_irradiance_on_plane(vnorm, 0, self.dates, 40.4,
+                                       model='perez', albedo=0.25)
+        self.assertEqual(I.total.shape, (beta.size, self.dates.size))
+
+        for k in range(beta.size):
+            I_k = global_irradiance_on_plane(vnorm[k, 0], 0, self.dates,
+                                             40.4, model='perez',
+                                             albedo=0.25)
+            assert_allclose(I.total[k], I_k.total)
+
+        date = datetime(2019, 6, 21, 12)
+        I = global_irradiance_on_plane(vnorm[1, 0], 0, date, 40.4)
+        self.assertEqual(np.ndim(I.total), 0)
+
+    def test_site(self):
+        vnorm = surface_normal_ned(35, 20)
+        I = self.site.global_irradiance_on_plane(vnorm, self.dates, 'perez')
+        expected = global_irradiance_on_plane(vnorm, 650, self.dates, 40.4,
+                                              'perez')
+
+        for a, b in zip(I, expected):
+            assert_allclose(a, b)
+
+        # the horizon only blocks the beam
+        profile = HorizonProfile([-180, 0], [30, 30])
+        shaded = SolarSite(40.4, -3.7, 650, horizon=profile)
+        I_shaded = shaded.global_irradiance_on_plane(vnorm, self.dates)
+        I = self.site.global_irradiance_on_plane(vnorm, self.dates)
+
+        pos = self.site.position(self.dates)
+        hidden = ~profile.visible(pos.azimuth, pos.altitude)
+        self.assertTrue((I.beam[hidden] > 0).any())
+        assert_equal(I_shaded.beam[hidden], 0)
+        assert_equal(I_shaded.beam[~hidden], I.beam[~hidden])
+        assert_allclose(I_shaded.sky_diffuse, I.sky_diffuse)
+
+    def test_exception(self):
+        self.assertRaises(ValueError, global_irradiance_on_plane,
+                          [0, 0, -1], 0, self.dates, 40, 'klucher')
@@ -0,0 +1,69 @@
+# coding: utf-8
+
+"""
+    Tests of the horizon profiles
+"""
+
+
+from solarpy import *
+import numpy as np
+from numpy import array, deg2rad
+from numpy.testing import assert_equal, assert_allclose
+import unittest as ut
+
+
+class Test_HorizonProfile(ut.TestCase):
+    """
+    Tests the horizon lookup and the shading of the sun beam at a site
+    """
+    def setUp(self):
+        self.profile = HorizonProfile([-180, -90, -45, 0, 45, 90],
+                                      [5, 20, 10, 3, 30, 15])
+        self.dates = np.arange('2019-01-01', '2020-01-01', 31,
+                               dtype='datetime64[m]')
+
+    def test_lookup(self):
+        azimuth = np.linspace(-180, 180, 1001)
+        expected = np.interp(azimuth, [-180, -90, -45, 0, 45, 90, 180],
+                             [5, 20, 10, 3, 30, 15, 5])
+
+        # within the resolution of the table (0.1º)
+        assert_allclose(np.rad2deg(self.profile.horizon_elevation(
+            deg2rad(azimuth))), expected, atol=0.1)
+
+        self.assertTrue(self.profile.visible(deg2rad(-90), deg2rad(21)))
+        self.assertFalse(self.profile.visible(deg2rad(-90), deg2rad(19)))
+
+    def test_site(self):
+        site = SolarSite(40.4, -3.7, 0)
+        shaded = SolarSite(40.4, -3.7, 0, horizon=self.profile)
+        vnorm = array([0.2, 0, -1])
+
+        pos = site.position(self.dates)
+        visible = self.profile.visible(pos.azimuth, pos.altitude)
+        G = site.irradiance_on_plane(vnorm, self.dates)
+        G_shaded = shaded.irradiance_on_plane(vnorm, self.dates)
+
+        assert_equal(G_shaded[visible], G[visible])
+        assert_equal(G_shaded[~visible], 0)
+        self.assertTrue((G[~visible] > 0).any())
+
+        # every site calculation sees the horizon
+        assert_allclose(shaded.sun_table(self.dates).irradiance(vnorm),
+                        G_shaded, atol=1e-9)
+        assert_equal(shaded.beam_irradiance(self.dates)[~visible], 0)
+        assert_equal(DualAxisTracker().irradiance(shaded,
+                                                  self.dates)[~visible], 0)
+
+    def test_flat_horizon(self):
+        site = SolarSite(40.4, -3.7, 0)
+        flat = SolarSite(40.4, -3.7, 0, horizon=HorizonProfile([0], [0]))
+
+        assert_equal(flat.beam_irradiance(self.dates),
+                     site.beam_irradiance(self.dates))
+
+    def test_exception(self):
+        self.assertRaises(ValueError, HorizonProfile, [0, 90], [10])
+        self.assertRaises(ValueError, HorizonProfile, [0], [91])
+        self.assertRaises(ValueError, HorizonProfile, [0], [0], 0)
+        self.assertRaises(TypeError, SolarSite, 0, 0, 0, [0, 10])
@@ -0,0 +1,78 @@
+# coding: utf-8
+
+"""
+    Tests of the instrumentation layer
+"""
+
+
+import solarpy
+from solarpy import instrumentation
+from solarpy.radiation import NoSunsetNoSunrise
+import numpy as np
+from datetime import datetime
+import importlib
+import json
+import sys
+import unittest as ut
+
+
+class Test_instrumentation(ut.TestCase):
+    """
+    Tests the recorded calls, times and elements
+    """
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_records(self):
+        dates = np.arange('2019-06-21', '2019-06-22', dtype='datetime64[m]')
+        fleet = solarpy.PanelFleet(2, 0.2, [10, 20], 0, 0, [0, 0, -1])
+
+        with instrumentation.instrumented():
+            fleet.power(dates)
+            solarpy.irradiance_on_plane([0, 0, -1], 0,
+                                        datetime(2019, 6, 21, 12), 40)
+            self.assertRaises(NoSunsetNoSunrise, solarpy.sunset_hour_angle,
+                              datetime(2019, 6, 21), 89)
+
+        stats = instrumentation.stats()
+        self.assertEqual(stats['declination']['calls'], 3)
+        self.assertEqual(stats['declination']['elements'], 1440 + 2)
+        self.assertEqual(stats['_solar_position']['elements'], 2 * 1440 + 1)
+        self.assertEqual(stats['sunset_hour_angle']['errors'], 1)
+        self.assertGreaterEqual(stats['irradiance_on_plane']['time'],
+                                stats['solar_position']['time'])
+        self.assertEqual(json.loads(instrumentation.to_json()), stats)
+
+    def test_disabled(self):
+        declination = solarpy.radiation.declination
+
+        with instrumentation.instrumented():
+            self.assertTrue(instrumentation.is_enabled())
+            self.assertIsNot(solarpy.radiation.declination, declination)
+            self.assertIsNot(solarpy.declination, declination)
+
+        # the original functions are restored, nothing else is recorded
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertIs(solarpy.radiation.declination, declination)
+        self.assertIs(solarpy.pvpanel.declination, declination)
+
+        solarpy.declination(datetime(2019, 6, 21))
+        self.assertEqual(instrumentation.stats(), {})
+
+    def test_import(self):
+        # a module imported while enabled takes the wrappers, that must not
+        # outlive the instrumentation
+        irradiance_on_plane = solarpy.radiation.irradiance_on_plane
+        previous = sys.modules.pop('solarpy.server', None)
+        try:
+            with instrumentation.instrumented():
+                server = importlib.import_module('solarpy.server')
+                self.assertIsNot(server.irradiance_on_plane,
+                                 irradiance_on_plane)
+
+            self.assertIs(server.irradiance_on_plane, irradiance_on_plane)
+        finally:
+            if previous is not None:
+                sys.modules['solarpy.server'] = previous
+                solarpy.server = previous
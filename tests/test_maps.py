@@ -0,0 +1,114 @@
+# coding: utf-8
+
+"""
+    Tests of the gridded irradiance generator
+"""
+
+
+from solarpy import *
+import numpy as np
+from numpy import array
+from numpy.testing import assert_equal, assert_allclose
+import tracemalloc
+import unittest as ut
+
+
+class Test_irradiance_map(ut.TestCase):
+    """
+    Tests the irradiance map against the point-wise model
+    """
+    def setUp(self):
+        self.lat = np.linspace(-85, 85, 18)
+        self.lng = np.linspace(-175, 175, 15)
+        self.dates = np.arange('2019-06-20', '2019-06-22', 47,
+                               dtype='datetime64[m]')
+
+    def test_tiles(self):
+        # the result does not depend on the tile size
+        G = irradiance_map(self.lat, self.lng, self.dates)
+        G_tiles = irradiance_map(self.lat, self.lng, self.dates,
+                                 max_memory=10**5)
+        assert_equal(G_tiles, G)
+
+        tiles = list(irradiance_tiles(self.lat, self.lng, self.dates,
+                                      max_memory=10**5))
+        self.assertGreater(len(tiles), 1)
+
+        out = np.zeros(G.shape, dtype=np.float32)
+        self.assertIs(irradiance_map(self.lat, self.lng, self.dates,
+                                     out=out), out)
+        assert_allclose(out, G, rtol=1e-6)
+
+    def test_memory(self):
+        # many longitudes: the per-longitude terms are also tiled
+        lng = np.linspace(-180, 179.9, 3600)
+        dates = np.arange('2019-01-01', '2019-01-15', np.timedelta64(1, 'h'),
+                          dtype='datetime64[m]')
+        max_memory = 2**21
+
+        tracemalloc.start()
+        try:
+            for index, G in irradiance_tiles(self.lat[:4], lng, dates,
+                                             max_memory=max_memory):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(peak, max_memory)
+
+    def test_point_model(self):
+        vnorm = array([0.2, -0.4, -1])
+        h = 2000
+
+        G = irradiance_map(self.lat, self.lng, self.dates, vnorm, h)
+
+        for i in [0, 5, 11, 17]:
+            for j in [0, 7, 14]:
+                # solar time = UTC + 4 minutes per degree + equation of time
+                minutes = 4 * self.lng[j] + eq_time(self.dates)
+                solar = self.dates + np.round(minutes * 60e6).astype(
+                    'timedelta64[us]')
+                expected = irradiance_on_plane(vnorm, h, solar, self.lat[i])
+
+                # the point model truncates the solar time to the minute
+                assert_allclose(G[i, j], expected, atol=10)
+
+    def test_model(self):
+        G = irradiance_map(self.lat, self.lng, self.dates)
+        G_psa = irradiance_map(self.lat, self.lng, self.dates, model='psa')
+        self.assertFalse((G_psa == G).all())
+        assert_allclose(G_psa, G, atol=25)
+
+        previous = set_solar_position_model('psa')
+        try:
+            assert_equal(irradiance_map(self.lat, self.lng, self.dates),
+                         G_psa)
+        finally:
+            set_solar_position_model(previous)
+
+    def test_night(self):
+        # antimeridian at UTC noon: local midnight
+        dates = np.array(['2019-03-21T12:00'], dtype='datetime64[m]')
+        G = irradiance_map(self.lat, array([-180, 0, 180]), dates)
+        assert_equal(G[:, [0, 2]], 0)
+        self.assertGreater(G[:, 1].max(), 900)
+
+    def test_scalar(self):
+        # a single latitude or longitude
+        G = irradiance_map(self.lat, self.lng, self.dates)
+        assert_equal(irradiance_map(self.lat[3], self.lng, self.dates),
+                     G[3:4])
+        assert_equal(irradiance_map(self.lat, self.lng[7], self.dates),
+                     G[:, 7:8])
+        assert_equal(irradiance_map(self.lat[3], self.lng[7], self.dates[5]),
+                     G[3:4, 7:8, 5:6])
+
+    def test_exception(self):
+        self.assertRaises(ValueError, irradiance_map, array([91]),
+                          self.lng, self.dates)
+        self.assertRaises(ValueError, irradiance_map, self.lat,
+                          array([181]), self.dates)
+        self.assertRaises(ValueError, irradiance_map, self.lat, self.lng,
+                          self.dates, h=-1)
+        self.assertRaises(TypeError, irradiance_map, self.lat, self.lng, 1)
@@ -0,0 +1,59 @@
+# coding: utf-8
+
+"""
+    Tests of the optimal orientation search
+"""
+
+
+from solarpy import *
+import numpy as np
+import unittest as ut
+
+
+class Test_optimal_orientation(ut.TestCase):
+    """
+    Tests the optimal orientation against a fine brute-force grid
+    """
+    def setUp(self):
+        self.dates = np.arange('2019-01-01T00:30', '2020-01-01T00:30', 60,
+                               dtype='datetime64[m]')
+
+    def brute_force(self, site, beta, surf_az):
+        beta, surf_az = np.meshgrid(beta, surf_az, indexing='ij')
+        H = site.sun_table(self.dates).irradiation(
+            surface_normal_ned(beta, surf_az).reshape(-1, 3))
+        return H.max()
+
+    def test_hemispheres(self):
+        # equator-facing planes, tilted less than the latitude
+        for lat, surf_az in [(40.4, 0), (-33.9, 180)]:
+            site = SolarSite(lat, 0, 0)
+            best = optimal_orientation(site, self.dates)
+
+            self.assertAlmostEqual(abs(best.surf_az), surf_az, 0)
+            self.assertLess(best.beta, abs(lat))
+            self.assertGreater(best.beta, abs(lat) - 15)
+
+            H = self.brute_force(site, np.arange(0, 90.1, 0.5),
+                                 np.arange(-180, 180.1, 1))
+            self.assertGreaterEqual(best.irradiation, H * (1 - 1e-6))
+
+    def test_constraints(self):
+        site = SolarSite(40.4, 0, 0)
+
+        best = optimal_orientation(site, self.dates, beta_bounds=(0, 20))
+        self.assertEqual(best.beta, 20)
+
+        best = optimal_orientation(site, self.dates,
+                                   surf_az_bounds=(-90, -45))
+        self.assertEqual(best.surf_az, -45)
+        H = self.brute_force(site, np.arange(0, 90.1, 0.5), [-45])
+        self.assertGreaterEqual(best.irradiation, H * (1 - 1e-6))
+
+    def test_exception(self):
+        site = SolarSite(40.4, 0, 0)
+        self.assertRaises(ValueError, optimal_orientation, site,
+                          beta_bounds=(20, 10))
+        self.assertRaises(ValueError, optimal_orientation, site,
+                          surf_az_bounds=(-200, 0))
+        self.assertRaises(ValueError, optimal_orientation, site, n=2)
@@ -0,0 +1,116 @@
+# coding: utf-8
+
+"""
+    Tests of the process-pool backend
+"""
+
+
+from solarpy import *
+import numpy as np
+from numpy import array
+from numpy.testing import assert_equal, assert_allclose
+import tracemalloc
+import unittest as ut
+
+try:
+    from solarpy import parallel
+except ImportError:  # multiprocessing.shared_memory, python >= 3.8
+    parallel = None
+
+
+@ut.skipIf(parallel is None, 'shared memory needs python >= 3.8')
+class Test_parallel(ut.TestCase):
+    """
+    Tests that the parallel results do not depend on the number of jobs
+    and match the serial ones
+    """
+    def test_irradiance_map(self):
+        lat = np.linspace(-85, 85, 18)
+        lng = np.linspace(-175, 175, 15)
+        dates = np.arange('2019-06-20', '2019-06-22', 47,
+                          dtype='datetime64[m]')
+
+        G = irradiance_map(lat, lng, dates, h=1000)
+        G_1 = parallel.irradiance_map(lat, lng, dates, h=1000,
+                                      max_memory=10**5, n_jobs=1)
+        G_2 = parallel.irradiance_map(lat, lng, dates, h=1000,
+                                      max_memory=10**5, n_jobs=2)
+
+        assert_equal(G_2, G_1)
+        assert_allclose(G_1, G, rtol=1e-12, atol=1e-9)
+
+        out = np.zeros(G.shape, dtype=np.float32)
+        self.assertIs(parallel.irradiance_map(lat, lng, dates, h=1000,
+                                              out=out, n_jobs=2), out)
+
+        G_psa = parallel.irradiance_map(lat, lng, dates, h=1000,
+                                        max_memory=10**5, n_jobs=2,
+                                        model='psa')
+        assert_allclose(G_psa, irradiance_map(lat, lng, dates, h=1000,
+                                              model='psa'),
+                        rtol=1e-12, atol=1e-9)
+
+        # a single latitude
+        assert_allclose(parallel.irradiance_map(lat[3], lng, dates, h=1000,
+                                                n_jobs=2),
+                        G[3:4], rtol=1e-12, atol=1e-9)
+
+    def test_map_memory(self):
+        # the map is copied from shared memory straight into out
+        lat = np.linspace(-85, 85, 50)
+        lng = np.linspace(-175, 175, 100)
+        dates = np.arange('2019-06-20', '2019-06-21', 8,
+                          dtype='datetime64[m]')
+        out = np.empty((lat.size, lng.size, dates.size))
+
+        tracemalloc.start()
+        try:
+            parallel.irradiance_map(lat, lng, dates, out=out, n_jobs=2)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(peak, out.nbytes / 2)
+        assert_allclose(out, irradiance_map(lat, lng, dates), rtol=1e-12,
+                        atol=1e-9)
+
+    def test_fleet_power(self):
+        rng = np.random.RandomState(0)
+        n = 50
+        fleet = PanelFleet(rng.uniform(1, 2, n), 0.2,
+                           rng.uniform(-60, 60, n), rng.uniform(-180, 180, n),
+                           rng.uniform(0, 3000, n), rng.normal(size=(n, 3)))
+        dates = np.arange('2019-01-01', '2019-01-05', 17,
+                          dtype='datetime64[m]')
+
+        P = fleet.power(dates)
+        P_1 = parallel.fleet_power(fleet, dates, max_block_size=2**12,
+                                   n_jobs=1)
+        P_2 = parallel.fleet_power(fleet, dates, max_block_size=2**12,
+                                   n_jobs=2)
+
+        assert_equal(P_2, P_1)
+        assert_allclose(P_1, P, rtol=1e-12, atol=1e-9)
+        assert_allclose(parallel.fleet_power(fleet, dates[10], n_jobs=2),
+                        P[:, 10], rtol=1e-12, atol=1e-9)
+
+        # UTC times, with the hour angle of every panel
+        assert_allclose(parallel.fleet_power(fleet, dates, 2**12, n_jobs=2,
+                                             utc=True),
+                        fleet.power(dates, utc=True), rtol=1e-12, atol=1e-9)
+
+        # the default model of this process, not the one of the workers
+        previous = set_solar_position_model('psa')
+        try:
+            P_psa = parallel.fleet_power(fleet, dates, 2**12, n_jobs=2,
+                                         utc=True)
+        finally:
+            set_solar_position_model(previous)
+        assert_allclose(P_psa, fleet.power(dates, utc=True, model='psa'),
+                        rtol=1e-12, atol=1e-9)
+
+    def test_exception(self):
+        self.assertRaises(ValueError, parallel.irradiance_map, array([91]),
+                          array([0]), np.datetime64('2019-01-01'))
+        self.assertRaises(ValueError, parallel.irradiance_map, array([0]),
+                          array([0]), np.datetime64('2019-01-01'), n_jobs=0)
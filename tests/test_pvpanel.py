@@ -5,9 +5,14 @@
 """
 
 
-from solarpy import solar_panel
+from solarpy import solar_panel, PanelFleet, daily_yield, annual_yield,\
+                    solar_position_utc, gon, set_solar_position_model
+from solarpy.radiation import _solar_vector_ned, _beam_constants,\
+                              _beam_irradiance
+import numpy as np
 from numpy import array
-from datetime import datetime
+from numpy.testing import assert_array_almost_equal, assert_allclose
+from datetime import datetime, timedelta
 import unittest as ut
 
 
@@ -188,3 +193,150 @@ class Test_pvpanel(ut.TestCase):
         sp.set_orientation(v)
         sp.set_datetime(d)
         self.assertAlmostEqual(sp.power(), 0)
+
+
+class Test_energy(ut.TestCase):
+    """
+    Tests the output energy of a solar panel
+    """
+    def setUp(self):
+        self.panel = solar_panel(2.1, 0.2, id_name='NYC')
+        self.panel.set_orientation(array([0.5, 0, -0.8]))
+        self.panel.set_position(40.73, -73.93, 0)
+
+    def test_daily(self):
+        date = datetime(2019, 12, 25, 16, 15)
+
+        # power sampled every minute
+        P = []
+        for i in range(24 * 60):
+            self.panel.set_datetime(datetime(2019, 12, 25) +
+                                    timedelta(minutes=i))
+            P.append(self.panel.power())
+        expected_value = sum(P) / 60
+
+        self.assertAlmostEqual(daily_yield(self.panel, date),
+                               expected_value, delta=1e-3 * expected_value)
+
+    def test_annual(self):
+        start = datetime(2019, 1, 1)
+        expected_value = sum(daily_yield(self.panel,
+                                         start + timedelta(days=i))
+                             for i in range(365))
+        self.assertAlmostEqual(annual_yield(self.panel, 2019),
+                               expected_value, 6)
+
+    def test_energy(self):
+        start = datetime(2019, 6, 1, 9, 0)
+        end = datetime(2019, 6, 1, 10, 0)
+        self.panel.set_datetime(datetime(2019, 6, 1, 9, 30))
+        self.assertAlmostEqual(self.panel.energy(start, end),
+                               self.panel.power(), delta=5)
+
+
+class Test_PanelFleet(ut.TestCase):
+    """
+    Tests the fleet of panels against individual panels
+    """
+    def setUp(self):
+        self.panels = []
+        for k, (lat, lng, h) in enumerate([(40.73, -73.93, 0),
+                                           (-23.5, -46.6, 800),
+                                           (78, 15.6, 20),
+                                           (0, 0, 20000)]):
+            sp = solar_panel(1 + k, 0.1 * (k + 1), id_name='panel%d' % k)
+            sp.set_position(lat, lng, h)
+            sp.set_orientation(array([0.1 * k, -0.2, -1]))
+            self.panels.append(sp)
+
+        self.dates = np.arange('2019-01-01', '2020-01-01', 317,
+                               dtype='datetime64[m]')
+
+    def test_power(self):
+        fleet = PanelFleet.from_panels(self.panels)
+        self.assertEqual(len(fleet), 4)
+        self.assertEqual(fleet.id_name[3], 'panel3')
+
+        P = fleet.power(self.dates)
+        self.assertEqual(P.shape, (4, self.dates.size))
+
+        # small blocks give the same result
+        assert_array_almost_equal(fleet.power(self.dates, max_block_size=7),
+                                  P)
+
+        for i, sp in enumerate(self.panels):
+            for j in range(0, self.dates.size, 53):
+                sp.set_datetime(self.dates[j].astype(datetime))
+                self.assertAlmostEqual(P[i, j], sp.power())
+
+    def test_scalar_date(self):
+        fleet = PanelFleet.from_panels(self.panels)
+        date = datetime(2019, 12, 25, 16, 15)
+        P = fleet.power(date)
+        self.assertEqual(P.shape, (4,))
+
+        for i, sp in enumerate(self.panels):
+            sp.set_datetime(date)
+            self.assertAlmostEqual(P[i], sp.power())
+
+    def test_utc(self):
+        fleet = PanelFleet.from_panels(self.panels)
+        P = fleet.power(self.dates, utc=True)
+        self.assertEqual(P.shape, (4, self.dates.size))
+        assert_array_almost_equal(fleet.power(self.dates, max_block_size=7,
+                                              utc=True), P)
+
+        # every panel with the solar position of its own longitude
+        for i, sp in enumerate(self.panels):
+            pos = solar_position_utc(self.dates, sp.lat, sp.lng, 'spencer')
+            G = _beam_irradiance(pos.zenith, gon(self.dates), sp.h,
+                                 *_beam_constants(sp.h))
+            cos_theta = (_solar_vector_ned(pos) * fleet.vnorm[i]).sum(-1)
+            assert_array_almost_equal(
+                P[i], sp.s * sp.eff * G * np.maximum(cos_theta, 0), 9)
+
+        # the PSA model, given or as the default model
+        P_psa = fleet.power(self.dates, utc=True, model='psa')
+        self.assertGreater(np.abs(P_psa - P).max(), 1e-3)
+        previous = set_solar_position_model('psa')
+        try:
+            assert_array_almost_equal(fleet.power(self.dates, utc=True),
+                                      P_psa)
+        finally:
+            set_solar_position_model(previous)
+
+        for i, sp in enumerate(self.panels):
+            pos = solar_position_utc(self.dates, sp.lat, sp.lng, 'psa')
+            G = _beam_irradiance(pos.zenith, gon(self.dates), sp.h,
+                                 *_beam_constants(sp.h))
+            cos_theta = (_solar_vector_ned(pos) * fleet.vnorm[i]).sum(-1)
+            assert_array_almost_equal(
+                P_psa[i], sp.s * sp.eff * G * np.maximum(cos_theta, 0), 9)
+
+        self.assertRaises(ValueError, fleet.power, self.dates, utc=True,
+                          model='nrel')
+
+        # same panel at a longitude 90 degrees east: 6 hours earlier (but
+        # for the change of declination and equation of time)
+        fleet = PanelFleet(1, 0.2, [40, 40], [0, 90], 0, array([0, 0, -1]))
+        P = fleet.power(self.dates, utc=True)
+        assert_allclose(P[1], fleet.power(self.dates + np.timedelta64(6, 'h'),
+                                          utc=True)[0], atol=1)
+
+    def test_from_arrays(self):
+        fleet = PanelFleet([2.1, 1], 0.2, [40.73, 10], [-73.93, 0], 0,
+                           array([0, 0, -1]))
+        self.assertEqual(fleet.vnorm.shape, (2, 3))
+        self.assertIsNone(fleet.id_name)
+
+    def test_exceptions(self):
+        v = array([0, 0, -1])
+        self.assertRaises(ValueError, PanelFleet, -1, 0.2, 0, 0, 0, v)
+        self.assertRaises(ValueError, PanelFleet, 1, 1.2, 0, 0, 0, v)
+        self.assertRaises(ValueError, PanelFleet, 1, 0.2, 91, 0, 0, v)
+        self.assertRaises(ValueError, PanelFleet, 1, 0.2, 0, 181, 0, v)
+        self.assertRaises(ValueError, PanelFleet, 1, 0.2, 0, 0, -1, v)
+        self.assertRaises(ValueError, PanelFleet, [1, 2], 0.2, 0, 0, 0,
+                          [v, v, v])
+        self.assertRaises(ValueError, PanelFleet, [1, 2], 0.2, 0, 0, 0, v,
+                          id_name=['a'])
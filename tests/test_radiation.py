@@ -7,12 +7,19 @@
 
 
 from solarpy import *
+import numpy as np
 from numpy import sin, cos, deg2rad, rad2deg, array
 from numpy.testing import (assert_equal, assert_almost_equal,
-                           assert_array_almost_equal)
+                           assert_array_almost_equal, assert_array_equal)
 from datetime import datetime
+from solarpy.radiation import _utc_declination_greenwich, _local_hour_angle
 import unittest as ut
 
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # python < 3.9
+    ZoneInfo = None
+
 
 class Test_b_nday(ut.TestCase):
     """
@@ -27,6 +34,14 @@ class Test_b_nday(ut.TestCase):
         expected_value = 6.2659711
         assert_almost_equal(b_nday(date), expected_value, 6)
 
+    def test_arrays(self):
+        dates = [datetime(2019, 1, 1), datetime(2019, 12, 31)]
+        expected_value = array([0, 6.2659711])
+        assert_array_almost_equal(b_nday(dates), expected_value, 6)
+
+        dates = np.array(['2019-01-01', '2019-12-31'], dtype='datetime64[D]')
+        assert_array_almost_equal(b_nday(dates), expected_value, 6)
+
     def test_exception(self):
         self.assertRaises(TypeError, b_nday, 6)
 
@@ -127,6 +142,17 @@ class Test_declination(ut.TestCase):
         expected_value = deg2rad(-2.4)
         self.assertAlmostEqual(declination(date), expected_value, 1)
 
+    def test_arrays(self):
+        # a whole year at 1-minute resolution in one call
+        dates = np.arange('2019-01-01', '2020-01-01', dtype='datetime64[m]')
+        days = [datetime(2019, 1, 1) + timedelta(days=i) for i in range(365)]
+
+        for f in (gon, eq_time, declination):
+            values = f(dates)
+            self.assertEqual(values.shape, dates.shape)
+            expected_value = array([f(d) for d in days])
+            assert_array_almost_equal(values[::1440], expected_value, 12)
+
     def test_exception(self):
         self.assertRaises(TypeError, declination, 12)
 
@@ -152,6 +178,76 @@ class Test_solar_time(ut.TestCase):
         self.assertRaises(TypeError, standard2solar_time, date, '122')
 
 
+class Test_civil2solar_time(ut.TestCase):
+    """
+    Tests the vectorized solar time from UTC or civil times
+    """
+    @ut.skipIf(ZoneInfo is None, 'zoneinfo needs python >= 3.9')
+    def test_Feb3(self):
+        # Duffie and Beckman example 1.5.1 (Madison, longitude east positive)
+        expected = np.datetime64('2019-02-03T10:18:54')
+        date = datetime(2019, 2, 3, 10, 30)
+
+        for t in [civil2solar_time(date, -89.4, 'America/Chicago'),
+                  civil2solar_time(datetime(2019, 2, 3, 16, 30), -89.4),
+                  civil2solar_time(date.replace(
+                      tzinfo=ZoneInfo('America/Chicago')), -89.4)]:
+            self.assertEqual(t.astype('datetime64[s]'), expected)
+
+        # standard2solar_time takes the west positive longitude
+        self.assertEqual(np.datetime64(standard2solar_time(date, 89.4),
+                                       's'), expected)
+
+    @ut.skipIf(ZoneInfo is None, 'zoneinfo needs python >= 3.9')
+    def test_dst(self):
+        tz = ZoneInfo('Europe/Madrid')
+        date = np.arange('2018-12-01', '2020-02-01', 7,
+                         dtype='datetime64[m]')
+        solar = civil2solar_time(date, -3.7, tz)
+
+        # offsets of the datetime module, one by one
+        offset = np.array([d.replace(tzinfo=tz).utcoffset()
+                           for d in date.astype(object)],
+                          dtype='timedelta64[us]')
+        utc = date - offset
+        assert_array_equal(solar, civil2solar_time(utc, -3.7))
+
+        # summer time is two hours ahead of UTC in Madrid
+        self.assertEqual(offset.max(), np.timedelta64(2, 'h'))
+
+        # same hour angle as from UTC (to the minute of hour_angle)
+        w = _local_hour_angle(_utc_declination_greenwich(utc, 'spencer')[1],
+                              -3.7)
+        dw = (hour_angle(solar) - w + np.pi) % (2 * np.pi) - np.pi
+        self.assertLess(np.abs(dw).max(), deg2rad(0.25))
+
+    def test_vectorized(self):
+        lng = np.array([-120, 0, 135])[:, np.newaxis]
+        date = np.arange('2019-06-01', '2019-06-02', 60, dtype='datetime64[m]')
+        solar = civil2solar_time(date, lng)
+        self.assertEqual(solar.shape, (3, date.size))
+        self.assertEqual(civil2solar_time([], 0).size, 0)
+
+    @ut.skipIf(ZoneInfo is None, 'zoneinfo needs python >= 3.9')
+    def test_nat(self):
+        date = np.array(['2019-06-21T12:00', 'NaT', '2019-12-21T12:00'],
+                        dtype='datetime64[m]')
+
+        for tz in (None, 'Europe/Madrid'):
+            solar = civil2solar_time(date, -3.7, tz)
+            assert_array_equal(np.isnat(solar), [False, True, False])
+            assert_array_equal(solar[[0, 2]],
+                               civil2solar_time(date[[0, 2]], -3.7, tz))
+
+        self.assertTrue(np.isnat(civil2solar_time(date[1], -3.7,
+                                                  'Europe/Madrid')))
+
+    def test_exception(self):
+        self.assertRaises(TypeError, civil2solar_time, 12, 8.3)
+        self.assertRaises(ValueError, civil2solar_time,
+                          datetime(2019, 2, 13), -181)
+
+
 class Test_hour_angle(ut.TestCase):
     """
     Tests hour angle function. Values from Duffie and Beckman
@@ -187,6 +283,13 @@ class Test_hour_angle(ut.TestCase):
         expected_value = deg2rad(30)
         self.assertEqual(hour_angle(date), expected_value)
 
+    def test_arrays(self):
+        dates = np.array(['2019-01-01T12:00', '2019-01-01T10:30:59',
+                          '2019-01-01T18:30', '2019-01-01T00:00'],
+                         dtype='datetime64[s]')
+        expected_value = deg2rad([0, -22.5, 97.5, -180])
+        assert_array_almost_equal(hour_angle(dates), expected_value)
+
     def test_exception_date(self):
         self.assertRaises(TypeError, hour_angle, 121)
 
@@ -508,6 +611,170 @@ class Test_daylight_hours(ut.TestCase):
         self.assertRaises(TypeError, daylight_hours, date, '91')
 
 
+class Test_sunrise_sunset(ut.TestCase):
+    """
+    Tests the mask-based sunrise/sunset function against the scalar ones
+    """
+    def test_atlas(self):
+        lats = np.linspace(-90, 90, 37)
+        days = np.arange('2019-01-01', '2020-01-01', 7,
+                         dtype='datetime64[D]')
+        atlas = sunrise_sunset(days[np.newaxis, :], lats[:, np.newaxis])
+        self.assertEqual(atlas.status.shape, (37, 53))
+
+        for i, lat in enumerate(lats):
+            for j, day in enumerate(days.astype(datetime)):
+                date = datetime(day.year, day.month, day.day)
+                try:
+                    ws = sunset_hour_angle(date, float(lat))
+                except NoSunsetNoSunrise:
+                    self.assertNotEqual(atlas.status[i, j], NORMAL_DAY)
+                    self.assertTrue(np.isnan(atlas.sunset_hour_angle[i, j]))
+                    self.assertTrue(np.isnat(atlas.sunrise_time[i, j]))
+                    continue
+                self.assertEqual(atlas.status[i, j], NORMAL_DAY)
+                self.assertAlmostEqual(atlas.sunset_hour_angle[i, j], ws)
+                self.assertAlmostEqual(atlas.sunrise_hour_angle[i, j], -ws)
+                self.assertEqual(atlas.sunset_time[i, j],
+                                 np.datetime64(sunset_time(date, lat)))
+                self.assertEqual(atlas.sunrise_time[i, j],
+                                 np.datetime64(sunrise_time(date, lat)))
+                self.assertAlmostEqual(atlas.daylight_hours[i, j],
+                                       daylight_hours(date, float(lat)))
+
+    def test_polar(self):
+        res = sunrise_sunset(datetime(2019, 6, 21), array([80, -80]))
+        assert_equal(res.status, [POLAR_DAY, POLAR_NIGHT])
+        assert_equal(res.daylight_hours, [24, 0])
+        self.assertTrue(np.isnan(res.sunset_hour_angle).all())
+        self.assertTrue(np.isnat(res.sunset_time).all())
+
+        res = sunrise_sunset(datetime(2019, 6, 21), [80.0])
+        assert_equal(res.status, [POLAR_DAY])
+
+    def test_exception(self):
+        self.assertRaises(TypeError, sunrise_sunset, 121, 1)
+        self.assertRaises(ValueError, sunrise_sunset, datetime(2019, 1, 1),
+                          array([0, 91]))
+
+
+class Test_solar_position(ut.TestCase):
+    """
+    Tests the solar position function against the individual angles
+    """
+    def test_consistency(self):
+        dates = np.arange('2019-01-01', '2020-01-01', 113,
+                          dtype='datetime64[m]')
+        lat = array([[-90], [-60], [-23.45], [0], [43], [75], [90]])
+        pos = solar_position(dates, lat)
+
+        assert_array_almost_equal(pos.declination, declination(dates))
+        assert_array_almost_equal(pos.hour_angle, hour_angle(dates))
+        assert_array_almost_equal(pos.zenith, theta_z(dates, lat))
+        assert_array_almost_equal(pos.altitude, solar_altitude(dates, lat))
+        assert_array_almost_equal(pos.azimuth, solar_azimuth(dates, lat))
+
+        for i in [1, 2, 3, 4]:  # latitudes with sunset every day
+            for j in range(0, dates.size, 97):
+                date = dates[j].astype(datetime)
+                lat_ = float(lat[i, 0])
+                self.assertAlmostEqual(pos.sunset_hour_angle[i, j],
+                                       sunset_hour_angle(date, lat_))
+                self.assertEqual(pos.daylight[i, j],
+                                 pos.zenith[i, j] <= np.pi / 2)
+
+    def test_examples(self):
+        # Example 1.6.3
+        date = datetime(2019, 3, 16, 16, 0)  # Mar 16, 16:00am
+        lat = 43
+        pos = solar_position(date, lat)
+        self.assertAlmostEqual(pos.zenith, deg2rad(70.3), 2)
+        self.assertAlmostEqual(pos.azimuth, deg2rad(66.8), 2)
+        self.assertAlmostEqual(pos.altitude, deg2rad(19.7), 2)
+        self.assertAlmostEqual(pos.sunset_hour_angle, deg2rad(87.8), 1)
+        self.assertTrue(pos.daylight)
+
+    def test_polar(self):
+        # permanent darkness and permanent light
+        date = datetime(2019, 12, 22, 12, 0)
+        pos = solar_position(date, 80)
+        self.assertEqual(pos.sunset_hour_angle, 0)
+        self.assertFalse(pos.daylight)
+
+        pos = solar_position(date, -80)
+        self.assertEqual(pos.sunset_hour_angle, np.pi)
+        self.assertTrue(pos.daylight)
+
+    def test_exception(self):
+        date = datetime(2019, 12, 13)
+        self.assertRaises(TypeError, solar_position, 121, 1)
+        self.assertRaises(ValueError, solar_position, date, 91)
+        self.assertRaises(TypeError, solar_position, date, '91')
+
+
+class Test_solar_position_utc(ut.TestCase):
+    """
+    Tests the solar position models of the UTC solar position
+    """
+    def setUp(self):
+        self.dates = np.arange('2019-01-01', '2020-01-01', 113,
+                               dtype='datetime64[m]')
+        self.lat = array([[-60], [0], [43], [75]])
+        self.lng = -105.2
+
+    def test_psa(self):
+        # NREL SPA example (Reda and Andreas, 2004), without refraction:
+        # zenith 90 - 39.872046, azimuth 194.34024 - 180, declination
+        # -9.31434 (degrees)
+        date = datetime(2003, 10, 17, 19, 30, 30)
+        pos = solar_position_utc(date, 39.742476, -105.1786, model='psa')
+        self.assertAlmostEqual(rad2deg(pos.zenith), 50.127954, delta=0.01)
+        self.assertAlmostEqual(rad2deg(pos.azimuth), 14.34024, delta=0.01)
+        self.assertAlmostEqual(rad2deg(pos.declination), -9.31434,
+                               delta=0.01)
+
+    def test_spencer(self):
+        # the fast model is the solar time one from UTC
+        pos = solar_position_utc(self.dates, self.lat, self.lng,
+                                 model='spencer')
+        assert_array_almost_equal(pos.declination, declination(self.dates))
+        w = _local_hour_angle(
+            _utc_declination_greenwich(self.dates, 'spencer')[1], self.lng)
+        assert_array_almost_equal(pos.hour_angle, w)
+
+        # that is the hour angle of the solar time (to its minute)
+        dw = (hour_angle(civil2solar_time(self.dates, self.lng)) - w +
+              np.pi) % (2 * np.pi) - np.pi
+        self.assertLess(np.abs(dw).max(), deg2rad(0.25))
+
+        # and both models agree within a degree
+        pos_psa = solar_position_utc(self.dates, self.lat, self.lng,
+                                     model='psa')
+        self.assertLess(np.abs(pos.zenith - pos_psa.zenith).max(),
+                        deg2rad(1))
+
+    def test_default_model(self):
+        previous = set_solar_position_model('psa')
+        try:
+            assert_equal(solar_position_utc(self.dates, 43, 0).zenith,
+                         solar_position_utc(self.dates, 43, 0,
+                                            model='psa').zenith)
+        finally:
+            set_solar_position_model(previous)
+
+        self.assertEqual(previous, 'spencer')
+        assert_equal(solar_position_utc(self.dates, 43, 0).zenith,
+                     solar_position_utc(self.dates, 43, 0,
+                                        model='spencer').zenith)
+
+    def test_exception(self):
+        date = datetime(2019, 12, 13)
+        self.assertRaises(ValueError, solar_position_utc, date, 0, 0, 'spa')
+        self.assertRaises(ValueError, set_solar_position_model, 'spa')
+        self.assertRaises(ValueError, solar_position_utc, date, 91, 0)
+        self.assertRaises(ValueError, solar_position_utc, date, 0, 181)
+
+
 class Test_solar_vector_ned(ut.TestCase):
     """
     Test function that calculates solar vector in ned frame
@@ -596,6 +863,19 @@ class Test_solar_vector_ned(ut.TestCase):
         assert_array_almost_equal(solar_vector_ned(date, lat),
                                   expected_value, 3)
 
+    def test_arrays(self):
+        dates = np.arange('2019-01-01', '2020-01-01', 97,
+                          dtype='datetime64[m]')
+        lat = array([[-90], [-75], [-10], [33], [83], [90]])
+        vsol = solar_vector_ned(dates, lat)
+        self.assertEqual(vsol.shape, lat.shape[:1] + dates.shape + (3,))
+
+        for i in range(lat.shape[0]):
+            for j in range(0, dates.size, 131):
+                date = dates[j].astype(datetime)
+                expected_value = solar_vector_ned(date, float(lat[i, 0]))
+                assert_array_almost_equal(vsol[i, j], expected_value)
+
     def test_exception_date(self):
         self.assertRaises(TypeError, solar_vector_ned, 121, 1)
 
@@ -692,8 +972,29 @@ class Test_beam_irradiance(ut.TestCase):
         expected_value = 0
         self.assertEqual(beam_irradiance(h, date, lat), expected_value)
 
+        # above the 24km of the former pressure model
+        date = datetime(2019, 6, 20, 12, 0)
+        lat = 40
+        self.assertTrue(beam_irradiance(20000, date, lat) <
+                        beam_irradiance(30000, date, lat) <
+                        beam_irradiance(86000, date, lat) < gon(date))
+
         # TODO: more test!
 
+    def test_arrays(self):
+        dates = np.arange('2019-12-22', '2019-12-23', 30,
+                          dtype='datetime64[m]')
+        h, lat = 1000, 40
+        G = beam_irradiance(h, dates, lat)
+        expected_value = [beam_irradiance(h, d, lat)
+                          for d in dates.astype(datetime)]
+        assert_array_almost_equal(G, expected_value)
+        self.assertTrue((G[:12] == 0).all())  # night
+
+        dates = np.arange('2019-12-22', '2019-12-23', dtype='datetime64[h]')
+        self.assertRaises(ValueError, beam_irradiance, array([0, -1]),
+                          dates[:2], lat)
+
     def test_exception_alt(self):
         date = datetime(2019, 12, 13)
         self.assertRaises(ValueError, beam_irradiance, -1, date, 0)
@@ -876,6 +1177,36 @@ class Test_irradiance_on_plane(ut.TestCase):
         self.assertAlmostEqual(irradiance_on_plane(vnorm, h, date, lat),
                                expected_value, 3)
 
+    def test_arrays(self):
+        # a whole day, every 10 minutes, over several latitudes and planes
+        dates = np.arange('2019-06-20', '2019-06-21', 10,
+                          dtype='datetime64[m]')
+        lat = array([[-70], [-23.45], [0], [43], [80]])
+        h = array([[0], [1000], [0], [20000], [500]])
+        vnorm = array([0.3, -0.2, -1])
+
+        G = irradiance_on_plane(vnorm, h, dates, lat)
+        self.assertEqual(G.shape, (5, 144))
+
+        for i in range(lat.shape[0]):
+            for j in range(0, dates.size, 7):
+                date = dates[j].astype(datetime)
+                expected_value = irradiance_on_plane(vnorm, int(h[i, 0]), date,
+                                                     float(lat[i, 0]))
+                self.assertAlmostEqual(G[i, j], expected_value, 9)
+
+        # one normal vector per sample
+        vnorm = np.tile(array([0, 0, -1]), (dates.size, 1))
+        G = irradiance_on_plane(vnorm, 0, dates, 43)
+        assert_array_almost_equal(G, beam_irradiance(0, dates, 43) *
+                                  cos(theta_z(dates, 43)).clip(0))
+
+        # lists, as arrays
+        h = [[0], [100]]
+        assert_array_almost_equal(irradiance_on_plane(vnorm, h, dates, 40),
+                                  irradiance_on_plane(vnorm, array(h), dates,
+                                                      40))
+
     def test_exception_vector(self):
         v = 'a'
         date = datetime(2019, 12, 13, 12, 0)
@@ -895,3 +1226,116 @@ class Test_irradiance_on_plane(ut.TestCase):
         date = datetime(2019, 12, 13)
         self.assertRaises(ValueError, irradiance_on_plane, v, 0, date, 1526)
         self.assertRaises(TypeError, irradiance_on_plane, v, 0, date, '91')
+
+
+class Test_irradiation_on_plane(ut.TestCase):
+    """
+    Test function that integrates the solar irradiance on a plane over time
+    """
+    def sampled(self, vnorm, h, start, end, lat):
+        # irradiance sampled every minute
+        dates = np.arange(start, end, dtype='datetime64[m]')
+        return irradiance_on_plane(vnorm, h, dates, lat).sum() / 60
+
+    def test_days(self):
+        for vnorm, h, lat in [(array([0, 0, -1]), 0, 43),
+                              (array([-0.5, 0.3, -0.8]), 1000, 43),
+                              (array([0.7, 0, -0.7]), 0, -70),
+                              (array([0, 1, 0]), 0, 80),
+                              (array([0.2, 0.1, 1]), 0, 10)]:
+            for start in [datetime(2019, 3, 16), datetime(2019, 6, 20),
+                          datetime(2019, 12, 22)]:
+                end = start + timedelta(days=1)
+                expected_value = self.sampled(vnorm, h, start, end, lat)
+                self.assertAlmostEqual(
+                    irradiation_on_plane(vnorm, h, start, end, lat),
+                    expected_value, delta=max(1e-3 * expected_value, 1e-6))
+
+    def test_partial_days(self):
+        vnorm = array([0, 0, -1])
+        start = datetime(2019, 3, 16, 10, 30)
+        end = datetime(2019, 3, 18, 14, 0)
+        expected_value = self.sampled(vnorm, 0, start, end, 43)
+        self.assertAlmostEqual(irradiation_on_plane(vnorm, 0, start, end, 43),
+                               expected_value, delta=1e-3 * expected_value)
+
+        # night
+        start = datetime(2019, 3, 16, 20, 0)
+        end = datetime(2019, 3, 17, 4, 0)
+        self.assertEqual(irradiation_on_plane(vnorm, 0, start, end, 43), 0)
+
+    def test_polar_night(self):
+        vnorm = array([0, 0, -1])
+        start = datetime(2019, 12, 1)
+        end = datetime(2019, 12, 31)
+        self.assertEqual(irradiation_on_plane(vnorm, 0, start, end, 85), 0)
+
+    def test_exception(self):
+        vnorm = array([0, 0, -1])
+        start = datetime(2019, 3, 16)
+        end = datetime(2019, 3, 17)
+        self.assertRaises(ValueError, irradiation_on_plane, vnorm, 0,
+                          end, start, 43)
+        self.assertRaises(ValueError, irradiation_on_plane, vnorm, -1,
+                          start, end, 43)
+        self.assertRaises(ValueError, irradiation_on_plane, vnorm, 0,
+                          start, end, 91)
+
+
+class Test_extraterrestrial_irradiation(ut.TestCase):
+    """
+    Tests daily and monthly extraterrestrial irradiation functions
+    """
+    def test_example(self):
+        # Example 1.10.1: 33.8 MJ/m2
+        date = datetime(2019, 4, 15)
+        lat = 43
+        expected_value = 33.8e6 / 3600
+        self.assertAlmostEqual(daily_extraterrestrial_irradiation(date, lat),
+                               expected_value, delta=0.005 * expected_value)
+
+    def test_horizontal(self):
+        # closed form of Duffie and Beckman, eq. 1.10.3
+        dates = np.arange('2019-01-01', '2020-01-01', dtype='datetime64[D]')
+        lat = array([[-90], [-66], [-30], [0], [43], [70], [90]])
+        dec = declination(dates)
+        ws = np.arccos(np.clip(-np.tan(deg2rad(lat)) * np.tan(dec), -1, 1))
+        expected_value = (24 / np.pi) * gon(dates) * \
+            (cos(deg2rad(lat)) * cos(dec) * sin(ws) +
+             ws * sin(deg2rad(lat)) * sin(dec))
+        assert_array_almost_equal(
+            daily_extraterrestrial_irradiation(dates, lat), expected_value, 6)
+        assert_array_almost_equal(
+            daily_extraterrestrial_irradiation(dates[0], [43, -66]),
+            expected_value[[4, 1], 0], 6)
+
+    def test_tilted(self):
+        # extraterrestrial irradiance on the surface sampled every minute
+        start = datetime(2019, 6, 20)
+        dates = [start + timedelta(minutes=i) for i in range(24 * 60)]
+        for lat, beta, surf_az in [(43, 30, 15), (-30, 60, -120),
+                                   (70, 90, 180), (10, 120, 45)]:
+            cos_theta = cos(theta(dates, lat, beta, surf_az))
+            daylight = solar_position(dates, lat).daylight
+            expected_value = (gon(dates) * cos_theta.clip(0) *
+                              daylight).sum() / 60
+            self.assertAlmostEqual(
+                daily_extraterrestrial_irradiation(start, lat, beta, surf_az),
+                expected_value, delta=0.002 * expected_value)
+
+    def test_monthly(self):
+        lat = np.arange(-90, 91, 15)
+        H0 = monthly_extraterrestrial_irradiation(lat, 30, 0)
+        self.assertEqual(H0.shape, (13, 12))
+
+        dates = np.arange('2019-07-01', '2019-08-01', dtype='datetime64[D]')
+        expected_value = daily_extraterrestrial_irradiation(dates, 43, 30,
+                                                            0).mean()
+        H0 = monthly_extraterrestrial_irradiation(43, 30, 0)
+        self.assertAlmostEqual(H0[6], expected_value)
+
+    def test_exception(self):
+        self.assertRaises(TypeError, daily_extraterrestrial_irradiation,
+                          121, 1)
+        self.assertRaises(ValueError, daily_extraterrestrial_irradiation,
+                          datetime(2019, 12, 13), 91)
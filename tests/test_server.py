@@ -0,0 +1,202 @@
+# coding: utf-8
+
+"""
+    Tests of the batching server
+"""
+
+
+from solarpy import *
+from solarpy import server
+from solarpy.server import IrradianceServer
+import asyncio
+import json
+import time
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+import unittest as ut
+import sys
+
+
+def reject(constant):
+    """
+    NaN and Infinity are not valid JSON
+    """
+    raise ValueError('%s is not valid JSON' % constant)
+
+
+@ut.skipIf(sys.version_info < (3, 7), 'asyncio.run needs python >= 3.7')
+class Test_IrradianceServer(ut.TestCase):
+    """
+    Tests that concurrent requests are batched and answered correctly
+    """
+    def query(self, requests, n_clients=4):
+        async def client(port, lines):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            for line in lines:
+                writer.write((json.dumps(line) + '\n').encode())
+            await writer.drain()
+            answers = [json.loads(await reader.readline(),
+                                  parse_constant=reject) for _ in lines]
+            writer.close()
+            return answers
+
+        async def run():
+            server = IrradianceServer(window=0.01)
+            await server.start()
+            try:
+                answers = await asyncio.gather(
+                    *[client(server.port, requests[i::n_clients])
+                      for i in range(n_clients)])
+                metrics = await client(server.port, [{'metrics': True}])
+            finally:
+                await server.stop()
+            return [a for answer in answers for a in answer], metrics[0]
+
+        return asyncio.run(run())
+
+    def test_batching(self):
+        dates = np.arange('2019-06-21T06:00', '2019-06-21T18:00', 7,
+                          dtype='datetime64[m]')
+        lats = np.linspace(-60, 60, dates.size)
+        requests = [{'id': i, 'date': str(date), 'lat': lat, 'h': 100,
+                     'vnorm': [0.2, 0, -1]}
+                    for i, (date, lat) in enumerate(zip(dates, lats))]
+
+        answers, metrics = self.query(requests)
+        G = dict((a['id'], a['irradiance']) for a in answers)
+
+        expected = irradiance_on_plane(np.array([0.2, 0, -1]), 100, dates,
+                                       lats)
+        assert_array_almost_equal([G[i] for i in range(dates.size)],
+                                  expected)
+
+        self.assertEqual(metrics['requests'], dates.size)
+        self.assertLess(metrics['batches'], dates.size)
+        self.assertEqual(metrics['errors'], 0)
+
+    def test_errors(self):
+        requests = [{'id': 0, 'date': '2019-06-21T12:00', 'lat': 91},
+                    {'id': 1, 'date': 'noon', 'lat': 0},
+                    {'id': 2, 'date': '2019-06-21T12:00', 'lat': 0}]
+
+        answers, metrics = self.query(requests, n_clients=1)
+        answers = dict((a['id'], a) for a in answers)
+
+        self.assertIn('error', answers[0])
+        self.assertIn('error', answers[1])
+        self.assertGreater(answers[2]['irradiance'], 0)
+        self.assertEqual(metrics['errors'], 2)
+
+    def test_non_finite(self):
+        # the answers are read as strict JSON (see query)
+        date = '2019-06-21T12:00'
+        requests = [{'id': 0, 'date': date, 'lat': 0, 'vnorm': [0, 0, 0]},
+                    {'id': 1, 'date': date, 'lat': 0,
+                     'vnorm': [float('nan'), 0, -1]},
+                    {'id': 2, 'date': date, 'lat': float('nan')},
+                    {'id': 3, 'date': date, 'lat': 0, 'h': float('inf')},
+                    {'id': 4, 'date': 'NaT', 'lat': 0},
+                    {'id': 5, 'date': date, 'lat': 0}]
+
+        answers, metrics = self.query(requests, n_clients=1)
+        answers = dict((a['id'], a) for a in answers)
+
+        for i in range(5):
+            self.assertIn('error', answers[i])
+        self.assertGreater(answers[5]['irradiance'], 0)
+        self.assertEqual(metrics['errors'], 5)
+
+    def test_slow_reader(self):
+        # the client only reads once all its requests are sent, while the
+        # server can have a few answers pending: it must stop reading the
+        # requests, not buffer the answers
+        n = 2000
+        requests = [{'id': i, 'date': '2019-06-21T12:00', 'lat': 40}
+                    for i in range(n)]
+
+        async def run():
+            server = IrradianceServer(window=0.001, max_batch=8)
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                               server.port)
+
+                async def send():
+                    for request in requests:
+                        writer.write((json.dumps(request) + '\n').encode())
+                        await writer.drain()
+
+                sender = asyncio.ensure_future(send())
+                await asyncio.sleep(0.1)
+                answers = [json.loads(await reader.readline())
+                           for _ in range(n)]
+                await sender
+                writer.close()
+            finally:
+                await server.stop()
+            return answers
+
+        answers = asyncio.run(run())
+        self.assertEqual(sorted(a['id'] for a in answers), list(range(n)))
+        self.assertTrue(all('irradiance' in a for a in answers))
+
+    def test_stop(self):
+        # requests still gathered when the server stops get an error
+        async def run():
+            server = IrradianceServer(window=10)
+            await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                           server.port)
+            for i in range(2):
+                writer.write((json.dumps({'id': i, 'date': '2019-06-21',
+                                          'lat': 0}) + '\n').encode())
+            await writer.drain()
+            await asyncio.sleep(0.05)
+            await server.stop()
+
+            # and the ones that arrive later
+            writer.write(b'{"id": 2, "date": "2019-06-21", "lat": 0}\n')
+            answers = [json.loads(await asyncio.wait_for(reader.readline(),
+                                                         2))
+                       for _ in range(3)]
+            writer.close()
+            return answers
+
+        answers = asyncio.run(run())
+        self.assertEqual(sorted(a['id'] for a in answers), [0, 1, 2])
+        self.assertTrue(all('stopped' in a['error'] for a in answers))
+
+    def test_event_loop(self):
+        # a slow batch does not block the metrics requests
+        def slow(points):
+            time.sleep(0.5)
+            return evaluate(points)
+
+        async def run():
+            irradiance_server = IrradianceServer(window=0.001)
+            await irradiance_server.start()
+            try:
+                reader, writer = await asyncio.open_connection(
+                    '127.0.0.1', irradiance_server.port)
+                writer.write(b'{"id": 0, "date": "2019-06-21", "lat": 0}\n')
+                await asyncio.sleep(0.05)
+                t0 = time.perf_counter()
+                writer.write(b'{"metrics": true}\n')
+                metrics = json.loads(await reader.readline())
+                elapsed = time.perf_counter() - t0
+                answer = json.loads(await reader.readline())
+                writer.close()
+            finally:
+                await irradiance_server.stop()
+            return metrics, elapsed, answer
+
+        evaluate, server._evaluate = server._evaluate, slow
+        try:
+            metrics, elapsed, answer = asyncio.run(run())
+        finally:
+            server._evaluate = evaluate
+
+        self.assertIn('requests', metrics)
+        self.assertLess(elapsed, 0.25)
+        self.assertEqual(answer['id'], 0)
+        self.assertIn('irradiance', answer)
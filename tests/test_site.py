@@ -0,0 +1,110 @@
+# coding: utf-8
+
+"""
+    Tests of the solar site class
+"""
+
+
+from solarpy import *
+import numpy as np
+from numpy import array
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+from datetime import datetime
+import unittest as ut
+
+try:
+    import zoneinfo
+except ImportError:  # python < 3.9
+    zoneinfo = None
+
+
+class Test_SolarSite(ut.TestCase):
+    """
+    Tests that the site methods match the module functions
+    """
+    def setUp(self):
+        self.dates = np.arange('2019-01-01', '2020-01-01', 37,
+                               dtype='datetime64[m]')
+
+    def test_site_constants(self):
+        site = SolarSite(43, -89.4, 1000)
+        assert_array_almost_equal(site.ecef, lla2ecef(43, -89.4, 1000))
+        self.assertAlmostEqual(site.prel, pressure(1000) / pressure(0))
+
+    def test_methods(self):
+        vnorm = array([0.3, -0.2, -1])
+
+        for lat, lng, h in [(43, -89.4, 0), (-70, 10, 3000), (90, 0, 20000)]:
+            site = SolarSite(lat, lng, h)
+
+            assert_array_almost_equal(site.zenith(self.dates),
+                                      theta_z(self.dates, lat))
+            assert_array_almost_equal(site.solar_vector_ned(self.dates),
+                                      solar_vector_ned(self.dates, lat))
+            assert_array_almost_equal(site.beam_irradiance(self.dates),
+                                      beam_irradiance(h, self.dates, lat))
+            assert_array_almost_equal(
+                site.irradiance_on_plane(vnorm, self.dates),
+                irradiance_on_plane(vnorm, h, self.dates, lat))
+
+    def test_scalar(self):
+        site = SolarSite(-23.5, 0, 0)
+        date = datetime(2019, 10, 17, 13, 1)
+        vnorm = array([0, 0, -1])
+        self.assertAlmostEqual(site.irradiance_on_plane(vnorm, date),
+                               irradiance_on_plane(vnorm, 0, date, -23.5))
+
+    @ut.skipIf(zoneinfo is None, 'zoneinfo needs python >= 3.9')
+    def test_solar_time(self):
+        site = SolarSite(40.4, -3.7, 650, tz='Europe/Madrid')
+        date = np.arange('2019-03-30', '2019-04-01', 13,
+                         dtype='datetime64[m]')
+        assert_array_equal(site.solar_time(date),
+                           civil2solar_time(date, -3.7, 'Europe/Madrid'))
+        assert_array_equal(SolarSite(40.4, -3.7, 650).solar_time(date),
+                           civil2solar_time(date, -3.7))
+
+    def test_exception(self):
+        self.assertRaises(ValueError, SolarSite, 91, 0, 0)
+        self.assertRaises(ValueError, SolarSite, 0, 181, 0)
+        self.assertRaises(ValueError, SolarSite, 0, 0, -1)
+        self.assertRaises(TypeError, SolarSite, '0', 0, 0)
+
+
+class Test_SunTable(ut.TestCase):
+    """
+    Tests that the sun table matches the site irradiance on every plane
+    """
+    def setUp(self):
+        self.site = SolarSite(37.4, -5.9, 10)
+        self.dates = np.arange('2019-01-01', '2020-01-01', 97,
+                               dtype='datetime64[m]')
+        self.table = self.site.sun_table(self.dates)
+
+        rng = np.random.RandomState(0)
+        self.vnorm = rng.normal(size=(20, 3))
+
+    def test_irradiance(self):
+        expected = self.site.irradiance_on_plane(
+            self.vnorm[:, np.newaxis, :], self.dates)
+        assert_array_almost_equal(self.table.irradiance(self.vnorm),
+                                  expected)
+        assert_array_almost_equal(self.table.irradiance(self.vnorm[0]),
+                                  expected[0])
+
+        out = np.empty(expected.shape)
+        self.assertIs(self.table.irradiance(self.vnorm, out=out), out)
+
+    def test_irradiation(self):
+        # every sample lasts 97 minutes
+        G = self.site.irradiance_on_plane(self.vnorm[:, np.newaxis, :],
+                                          self.dates)
+        expected = G.sum(axis=-1) * 97 / 60
+
+        assert_array_almost_equal(self.table.irradiation(self.vnorm) / 1e3,
+                                  expected / 1e3)
+        assert_array_almost_equal(
+            self.table.irradiation(self.vnorm, max_block_size=1000) / 1e3,
+            expected / 1e3)
+        self.assertAlmostEqual(self.table.irradiation(self.vnorm[3]) / 1e3,
+                               expected[3] / 1e3)
@@ -0,0 +1,89 @@
+# coding: utf-8
+
+"""
+    Tests of the streaming interface
+"""
+
+
+from solarpy import *
+import numpy as np
+from numpy import array
+from numpy.testing import assert_equal, assert_array_almost_equal
+from datetime import datetime, timedelta
+import time
+import unittest as ut
+
+
+class Test_streaming(ut.TestCase):
+    """
+    Tests that the streams match the batch calculations
+    """
+    def setUp(self):
+        self.site = SolarSite(40.4, -3.7, 650)
+        self.vnorm = array([0.3, -0.1, -1])
+        self.dates = np.arange('2019-06-01', '2019-06-03', 13,
+                               dtype='datetime64[m]')
+
+    def test_irradiance_chunks(self):
+        # chunks within a day and across days
+        chunks = [self.dates[:100], self.dates[100:110], self.dates[110:]]
+        stream = irradiance_stream(self.site, self.vnorm, iter(chunks))
+
+        for chunk, (date, G) in zip(chunks, stream):
+            assert_equal(date, chunk)
+            assert_equal(G, self.site.irradiance_on_plane(self.vnorm, chunk))
+
+    def test_single_timestamps(self):
+        dates = [datetime(2019, 6, 1) + timedelta(minutes=37 * i)
+                 for i in range(50)]
+        stream = list(irradiance_stream(self.site, self.vnorm, dates,
+                                        chunk_size=16))
+
+        self.assertEqual([date.size for date, G in stream], [16, 16, 16, 2])
+        assert_array_almost_equal(
+            np.concatenate([G for date, G in stream]),
+            irradiance_on_plane(self.vnorm, 650, dates, 40.4))
+
+    def test_partial_flush(self):
+        dates = [datetime(2019, 6, 1) + timedelta(minutes=37 * i)
+                 for i in range(6)]
+
+        # the source has nothing ready
+        flow = dates[:2] + [None] + dates[2:5] + [None, None] + dates[5:]
+        stream = list(irradiance_stream(self.site, self.vnorm, flow))
+        self.assertEqual([date.size for date, G in stream], [2, 3, 1])
+        assert_array_almost_equal(
+            np.concatenate([G for date, G in stream]),
+            irradiance_on_plane(self.vnorm, 650, dates, 40.4))
+
+        # a late timestamp flushes the ones that waited too long
+        def feed():
+            for i, date in enumerate(dates):
+                if i == 3:
+                    time.sleep(0.1)
+                yield date
+
+        stream = list(irradiance_stream(self.site, self.vnorm, feed(),
+                                        max_delay=0.05))
+        self.assertEqual([date.size for date, G in stream], [4, 2])
+
+        panel = solar_panel(2.1, 0.2)
+        panel.set_position(40.4, -3.7, 650)
+        panel.set_orientation(self.vnorm)
+        fleet = PanelFleet.from_panels([panel])
+        for p in (panel, fleet):
+            stream = list(power_stream(p, dates, max_delay=0))
+            self.assertEqual([date.size for date, P in stream], [1] * 6)
+
+    def test_power(self):
+        panel = solar_panel(2.1, 0.2)
+        panel.set_position(40.4, -3.7, 650)
+        panel.set_orientation(self.vnorm)
+
+        for date, P in power_stream(panel, [self.dates]):
+            assert_array_almost_equal(
+                P, irradiance_on_plane(self.vnorm, 650, date, 40.4) * 0.42)
+
+        fleet = PanelFleet.from_panels([panel, panel])
+        for date, P in power_stream(fleet, [self.dates]):
+            assert_equal(P, fleet.power(self.dates))
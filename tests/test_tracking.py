@@ -0,0 +1,100 @@
+# coding: utf-8
+
+"""
+    Tests of the sun-tracking panels
+"""
+
+
+from solarpy import *
+import numpy as np
+from numpy import array, deg2rad
+from numpy.testing import (assert_equal, assert_array_almost_equal,
+                           assert_allclose)
+import unittest as ut
+
+
+class Test_trackers(ut.TestCase):
+    """
+    Tests the orientation of single and dual-axis trackers
+    """
+    def setUp(self):
+        self.site = SolarSite(37.4, -5.9, 10)
+        self.dates = np.arange('2019-06-21', '2019-06-22', 10,
+                               dtype='datetime64[m]')
+        self.vsol = self.site.solar_vector_ned(self.dates)
+        self.day = np.linalg.norm(self.vsol, axis=-1) > 0
+
+    def test_dual_axis(self):
+        tracker = DualAxisTracker()
+        vnorm = tracker.normal(self.vsol)
+
+        assert_allclose(np.linalg.norm(vnorm, axis=-1), 1)
+        assert_equal(vnorm[~self.day], [[0, 0, -1]] * (~self.day).sum())
+
+        # normal incidence during the day
+        assert_allclose(tracker.irradiance(self.site, self.dates),
+                        self.site.beam_irradiance(self.dates))
+
+    def test_single_axis(self):
+        tracker = SingleAxisTracker()
+        R = tracker.rotation(self.vsol)
+        vnorm = tracker.normal(self.vsol)
+
+        # normal to the north-south axis, east in the morning
+        assert_allclose(vnorm @ array([1, 0, 0]), 0, atol=1e-12)
+        assert_allclose(np.linalg.norm(vnorm, axis=-1), 1)
+        self.assertTrue((R[self.day][:30] < 0).all())
+        self.assertTrue((R[self.day][-30:] > 0).all())
+        assert_equal(R[~self.day], 0)
+
+        # better than any other rotation, at least as good as a flat panel
+        cos_inc = (vnorm * self.vsol).sum(axis=-1)
+        for angle in np.linspace(-90, 90, 13):
+            other = tracker.n0 * np.cos(deg2rad(angle)) + \
+                    tracker.n90 * np.sin(deg2rad(angle))
+            self.assertTrue((cos_inc >= self.vsol @ other - 1e-12).all())
+
+        G = tracker.irradiance(self.site, self.dates)
+        assert_allclose(G, self.site.irradiance_on_plane(vnorm, self.dates))
+        self.assertTrue((G >= self.site.irradiance_on_plane([0, 0, -1],
+                                                            self.dates)).all())
+
+    def test_tilted_axis(self):
+        tracker = SingleAxisTracker(axis_tilt=30)
+
+        # at solar noon the panel is tilted as the axis, facing south
+        vsol = self.site.solar_vector_ned(np.datetime64('2019-06-21T12:00'))
+        self.assertAlmostEqual(tracker.rotation(vsol), 0)
+        assert_array_almost_equal(tracker.normal(vsol),
+                                  surface_normal_ned(30, 0))
+
+    def test_limits(self):
+        # sun at 15º over the horizon, due east
+        vsol = array([0, np.cos(deg2rad(15)), -np.sin(deg2rad(15))])
+
+        R = SingleAxisTracker().rotation(vsol)
+        self.assertAlmostEqual(R, -deg2rad(75))
+
+        R = SingleAxisTracker(max_angle=60).rotation(vsol)
+        self.assertAlmostEqual(R, -deg2rad(60))
+
+        # backtracking: the rows shadows just touch the next row,
+        # gcr * cos(R_ideal - R) = cos(R_ideal)
+        R = SingleAxisTracker(backtrack=True, gcr=0.4).rotation(vsol)
+        ideal = -deg2rad(75)
+        self.assertAlmostEqual(0.4 * np.cos(ideal - R), np.cos(ideal))
+        self.assertGreater(R, ideal)
+        self.assertLess(R, 0)
+
+        # no backtracking with the sun high enough
+        vsol = array([0, np.cos(deg2rad(70)), -np.sin(deg2rad(70))])
+        self.assertAlmostEqual(
+            SingleAxisTracker(backtrack=True, gcr=0.4).rotation(vsol),
+            -deg2rad(20))
+
+    def test_exception(self):
+        self.assertRaises(ValueError, SingleAxisTracker, axis_tilt=91)
+        self.assertRaises(ValueError, SingleAxisTracker, max_angle=-1)
+        self.assertRaises(ValueError, SingleAxisTracker, backtrack=True)
+        self.assertRaises(ValueError, SingleAxisTracker, backtrack=True,
+                          gcr=1.5)
@@ -0,0 +1,118 @@
+# coding: utf-8
+
+"""
+    Tests of the irradiance along vehicle trajectories
+"""
+
+
+from solarpy import *
+import numpy as np
+from numpy import array, sin, cos, deg2rad
+from numpy.testing import assert_allclose, assert_equal
+from solarpy.radiation import _solar_vector_ned, _beam_constants,\
+                              _beam_irradiance
+import unittest as ut
+
+
+class Test_attitude(ut.TestCase):
+    """
+    Tests the body to NED rotation matrices
+    """
+    def test_euler(self):
+        assert_allclose(euler2dcm(0, 0, 0), np.eye(3), atol=1e-15)
+
+        # heading east, nose up and right wing down
+        assert_allclose(body2ned([1, 0, 0], euler2dcm(90, 0, 0)), [0, 1, 0],
+                        atol=1e-15)
+        assert_allclose(body2ned([1, 0, 0], euler2dcm(0, 30, 0)),
+                        [cos(deg2rad(30)), 0, -sin(deg2rad(30))], atol=1e-15)
+        assert_allclose(body2ned([0, 1, 0], euler2dcm(0, 0, 90)), [0, 0, 1],
+                        atol=1e-15)
+
+    def test_quaternion(self):
+        rng = np.random.RandomState(0)
+        yaw, pitch, roll = rng.uniform(-180, 180, (3, 50))
+        Lbn = euler2dcm(yaw, pitch, roll)
+
+        # same rotations as quaternions
+        c_psi, s_psi = cos(deg2rad(yaw) / 2), sin(deg2rad(yaw) / 2)
+        c_tht, s_tht = cos(deg2rad(pitch) / 2), sin(deg2rad(pitch) / 2)
+        c_phi, s_phi = cos(deg2rad(roll) / 2), sin(deg2rad(roll) / 2)
+        q = np.stack([c_phi * c_tht * c_psi + s_phi * s_tht * s_psi,
+                      s_phi * c_tht * c_psi - c_phi * s_tht * s_psi,
+                      c_phi * s_tht * c_psi + s_phi * c_tht * s_psi,
+                      c_phi * c_tht * s_psi - s_phi * s_tht * c_psi], axis=-1)
+
+        assert_allclose(quat2dcm(3 * q), Lbn, atol=1e-12)
+        assert_allclose(Lbn @ np.swapaxes(Lbn, -1, -2),
+                        np.broadcast_to(np.eye(3), Lbn.shape), atol=1e-12)
+
+
+class Test_trajectory_irradiance(ut.TestCase):
+    """
+    Tests the irradiance on panels of a vehicle against the NED normals
+    """
+    def setUp(self):
+        rng = np.random.RandomState(1)
+        n = 500
+        self.dates = np.datetime64('2019-06-21T04:00') + \
+            np.arange(n) * np.timedelta64(2, 'm')
+        self.lat = np.linspace(40, 42, n)
+        self.lng = np.linspace(-3, -1, n)
+        self.h = np.linspace(0, 20000, n)
+        self.euler = rng.uniform(-30, 30, (n, 3))
+        self.vnorm = array([[0, 0, -1], [0, 0.3, -1], [1, 0, 0]])
+
+    def test_ned_normals(self):
+        G = trajectory_irradiance(self.vnorm, self.dates, self.lat,
+                                  self.lng, self.h, euler=self.euler,
+                                  model='psa')
+        self.assertEqual(G.shape, (3, self.dates.size))
+
+        # every normal rotated into NED, one by one
+        pos = solar_position_utc(self.dates, self.lat, self.lng, 'psa')
+        vsol = _solar_vector_ned(pos)
+        G_n = _beam_irradiance(pos.zenith, gon(self.dates), self.h,
+                               *_beam_constants(self.h))
+        Lbn = euler2dcm(*self.euler.T)
+        for k, vnorm in enumerate(self.vnorm):
+            v_ned = body2ned(vnorm / np.linalg.norm(vnorm), Lbn)
+            expected = G_n * np.maximum((v_ned * vsol).sum(axis=-1), 0)
+            assert_allclose(G[k], expected, atol=1e-9)
+
+        self.assertTrue((G > 0).any() and (G == 0).any())
+
+    def test_level_flight(self):
+        # body axes aligned with NED: horizontal panel
+        G = trajectory_irradiance([0, 0, -1], self.dates, 40, 0, 0,
+                                  euler=[0, 0, 0])
+        G_q = trajectory_irradiance([0, 0, -1], self.dates, 40, 0, 0,
+                                    quaternion=[1, 0, 0, 0])
+        assert_equal(G, G_q)
+
+        solar = civil2solar_time(self.dates, 0)
+        assert_allclose(G, irradiance_on_plane([0, 0, -1], 0, solar, 40),
+                        atol=10)
+
+    def test_monte_carlo(self):
+        runs = 20
+        lat = self.lat + np.random.RandomState(2).normal(0, 1, (runs, 1))
+        euler = np.broadcast_to(self.euler, (runs,) + self.euler.shape)
+
+        G = trajectory_irradiance(self.vnorm, self.dates, lat, self.lng,
+                                  self.h, euler=euler)
+        self.assertEqual(G.shape, (3, runs, self.dates.size))
+
+        G_0 = trajectory_irradiance(self.vnorm[1], self.dates, lat[0],
+                                    self.lng, self.h, euler=self.euler)
+        assert_allclose(G[1, 0], G_0)
+
+    def test_exception(self):
+        self.assertRaises(ValueError, trajectory_irradiance, [0, 0, -1],
+                          self.dates, self.lat, self.lng, self.h)
+        self.assertRaises(ValueError, trajectory_irradiance, [0, 0, -1],
+                          self.dates, self.lat, self.lng, self.h,
+                          euler=[0, 0, 0], quaternion=[1, 0, 0, 0])
+        self.assertRaises(ValueError, trajectory_irradiance, [0, 0, -1],
+                          self.dates, self.lat, self.lng, -1,
+                          euler=[0, 0, 0])
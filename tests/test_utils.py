@@ -6,8 +6,10 @@
 
 
 from solarpy.utils import *
+import numpy as np
 from numpy import array
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+import tracemalloc
 import unittest as ut
 
 
@@ -25,7 +27,57 @@ class Test_ranges(ut.TestCase):
 
     def test_altitude_range(self):
         self.assertRaises(ValueError, check_alt, -1)
-        self.assertRaises(ValueError, check_alt, 24001.0)
+        self.assertRaises(ValueError, check_alt, 86001.0)
+
+    def test_types(self):
+        self.assertRaises(TypeError, check_lat, '1')
+        self.assertRaises(TypeError, check_long, ['1', '2'])
+        self.assertRaises(TypeError, check_long, [1, [2, 3]])
+        self.assertRaises(TypeError, check_alt, array(['1']))
+        self.assertRaises(TypeError, check_lat, 1j)
+
+        # numpy scalars and arrays
+        check_lat(np.float32(45))
+        check_long(np.int64(-120))
+        check_alt(np.linspace(0, 86000, 10))
+        check_lat(array([], dtype=float))
+        self.assertRaises(ValueError, check_lat, np.int16(91))
+
+        # numeric lists and tuples
+        check_long([1, 2])
+        check_lat((-45.5, 45))
+        self.assertRaises(ValueError, check_lat, [0, 91])
+
+    def test_arrays(self):
+        lat = np.zeros(50)
+        lat[[3, 17]] = 95
+        with self.assertRaises(ValueError) as error:
+            check_lat(lat)
+        self.assertIn('offending indices: [3, 17]', str(error.exception))
+
+        h = np.zeros((2, 3))
+        h[1, 2] = -5
+        with self.assertRaises(ValueError) as error:
+            check_alt(h)
+        self.assertIn('offending indices: [(1, 2)]', str(error.exception))
+
+        lng = np.full(20, 190.)
+        with self.assertRaises(ValueError) as error:
+            check_long(lng)
+        self.assertIn('8, 9]...)', str(error.exception))
+
+    def test_trusted_inputs(self):
+        with trusted_inputs():
+            check_lat(91)
+            check_long(array([-181]))
+            check_alt(-1)
+
+            # nested blocks restore the trusted state on exit
+            with trusted_inputs():
+                pass
+            check_lat(91)
+
+        self.assertRaises(ValueError, check_lat, 91)
 
 
 class Test_day_of_the_year(ut.TestCase):
@@ -57,6 +109,34 @@ class Test_day_of_the_year(ut.TestCase):
         expected_value = 365  # December 31
         self.assertEqual(day_of_the_year(date), expected_value)
 
+    def test_arrays(self):
+        dates = [datetime(2019, 1, 1), datetime(2019, 2, 1, 13, 30),
+                 datetime(2019, 6, 20), datetime(2019, 12, 31, 23, 59)]
+        expected_value = array([1, 32, 171, 365])
+        assert_array_equal(day_of_the_year(dates), expected_value)
+
+        dates = np.array(['2019-01-01T00:00', '2019-02-01T13:30',
+                          '2019-06-20T00:00', '2019-12-31T23:59'],
+                         dtype='datetime64[m]')
+        assert_array_equal(day_of_the_year(dates), expected_value)
+
+
+class Test_to_datetime64(ut.TestCase):
+    """
+    Tests conversion of dates to numpy datetime64
+    """
+    def test_conversion(self):
+        date = datetime(2019, 2, 1, 13, 30)
+        expected_value = np.datetime64('2019-02-01T13:30')
+        self.assertEqual(to_datetime64(date), expected_value)
+        assert_array_equal(to_datetime64([date, date]),
+                           array([expected_value, expected_value]))
+
+    def test_type(self):
+        self.assertRaises(TypeError, to_datetime64, 1)
+        self.assertRaises(TypeError, to_datetime64, [1, 2])
+        self.assertRaises(TypeError, to_datetime64, 'a')
+
 
 class Test_exception(ut.TestCase):
     """
@@ -165,6 +245,54 @@ def test_ned2ecef():
     assert_array_almost_equal(ned2ecef(v_ned, lat, lng), expected_value)
 
 
+def test_batch_lla2ecef_ned2ecef():
+    """
+    Test transformation of arrays of points and vectors
+    """
+    rng = np.random.RandomState(0)
+    lat = rng.uniform(-90, 90, 100)
+    lng = rng.uniform(-180, 180, 100)
+    h = rng.uniform(0, 20000, 100)
+    v_ned = rng.normal(size=(100, 3))
+
+    expected_value = array([lla2ecef(lat[i], lng[i], h[i])
+                            for i in range(100)])
+    assert_array_almost_equal(lla2ecef(lat, lng, h), expected_value, 4)
+
+    expected_value = array([ned2ecef(v_ned[i], lat[i], lng[i])
+                            for i in range(100)])
+    assert_array_almost_equal(ned2ecef(v_ned, lat, lng), expected_value)
+
+    # the rotation of a single point applied to many vectors
+    expected_value = array([ned2ecef(v, lat[0], lng[0]) for v in v_ned])
+    assert_array_almost_equal(ned2ecef(v_ned, lat[0], lng[0]),
+                              expected_value)
+
+    # caller-supplied output buffers
+    out = np.empty((100, 3))
+    assert lla2ecef(lat, lng, h, out=out) is out
+    assert_array_almost_equal(out, lla2ecef(lat, lng, h))
+
+    assert ned2ecef(v_ned, lat, lng, out=out) is out
+    assert_array_almost_equal(out, ned2ecef(v_ned, lat, lng))
+
+    # and no temporaries larger than the output itself (i.e. a stack of
+    # rotation matrices)
+    n = 10**5
+    lat, lng = rng.uniform(-90, 90, n), rng.uniform(-180, 180, n)
+    h, v_ned = rng.uniform(0, 86000, n), rng.normal(size=(n, 3))
+    out = np.empty((n, 3))
+
+    for f, args in ((lla2ecef, (lat, lng, h)), (ned2ecef, (v_ned, lat, lng))):
+        tracemalloc.start()
+        try:
+            f(*args, out=out)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert peak < 1.5 * out.nbytes
+
+
 def test_pressure():
     """
     Test pressure function
@@ -176,3 +304,12 @@ def test_pressure():
     h = 20e3
     expected_value = 5529
     assert_array_almost_equal(pressure(h), expected_value)
+
+    # U.S. Standard Atmosphere 1976 beyond 24km
+    h = array([30e3, 50e3, 86e3])
+    expected_value = array([1197.0, 79.779, 0.3734])
+    assert_array_almost_equal(pressure(h) / expected_value, 1, 3)
+
+    # tables are built only once
+    assert pressure(1e3) == standard_atmosphere.pressure(1e3)
+    assert standard_atmosphere.pressure_ratio(0) == 1